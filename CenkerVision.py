@@ -13,22 +13,44 @@ import numpy as np
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
-from ultralytics import YOLO
 import threading
 import time
 import queue
-import torch  
+import argparse
 import yaml
 import platform
 from datetime import datetime
 from typing import Dict, Any
-from memory_bank import MemoryBank
+from zone_analytics import Zone, ZoneAnalyzer, load_zones, default_zones_path
+from detection_store import DetectionWriter, DetectionStore, Detections, default_store_path, STORE_SUFFIX
+from detection_engine import (DetectionEngine, AdaptiveResolution, DEFAULT_MODELS, PROCESS_HEIGHT,
+                              select_device, empty_device_cache)
+from annotations import render_detections, render_overlay, color_for_id, box_centers, DISPLAY_MODES, CLASS_COLORS
+from video_export import AnnotatedVideoExporter, FrameAnnotator, format_eta, run_export_cli
+from capture import LatestFrameGrabber, LatencyProbe
+from thumbnails import ThumbnailIndex
+from clip_cache import ClipCache, ClipCapture
+from occurrence_index import OccurrenceIndex, ALL_CLASSES
+from occupancy import MotionOverlay, read_track_buffer
+from stream_server import StreamServer, parse_address, STREAM_PORT
+from playback import PLAYBACK_SPEEDS, FrameHistory, InferenceStride, playback_step, format_speed
+from plugin_hooks import PluginManager, PLUGIN_DIR, PLUGIN_BUDGET_MS
+from crop_mining import CropMiner, default_mine_dir, parse_band, MINE_CONF_BAND, MINE_CLASS_RATE, MINE_FORMATS
+from video_decode import open_video, capture_backend, available_backends, DECODE_BACKENDS
+from autotune import AutoTuner, find_profile, save_profile, profile_key, run_autotune_cli
+from cascade import ModelCascade
+from batch_ingest import run_ingest_cli
+from model_eval import load_eval_table, format_eval_row, run_eval_cli
+from event_journal import EventJournal
+from tracing import TRACER, SamplingProfiler, PROFILE_WINDOW_SEC, timestamped_path
 
 # Sabit değişkenler
 DEBUG_MODE = False # Hata ayıklama modu
 SIMPLE_MODE = False # Basit mod - YOLO işlemini atlar sadece videoyu gösterir
 FORCE_CPU = False # M1 Mac'in GPU/MPS desteğini etkinleştir
 MAX_FRAME_RATE = 100 # Maksimum FPS değeri - CPU kullanımını optimize etmek için
+CLIP_CACHE_MAX_GB = 8 # Çözülmüş klip önbelleğinin toplam boyut sınırı (GB)
+UI_REFRESH_HZ = 60 # Arayüz güncellemelerinin üst sınırı (ekran yenileme hızı)
 
 # ByteTrack varsayılan ayarları
 BYTETRACK_CONFIG = {
@@ -43,8 +65,13 @@ BYTETRACK_CONFIG = {
     "max_track_per_frame": 50  # Maksimum takip edilen nesne sayısını sınırla
 }
 
+# Varsayılan kitlenme bölgesi (normalize koordinatlar) - zones.yaml yoksa kullanılır
+LOCK_ZONE = Zone("Kitlenme", [(0.25, 0.10), (0.75, 0.10), (0.75, 0.90), (0.25, 0.90)], color=(0, 0, 255))
+
 class CenkerVision:
-    def __init__(self, root):
+    def __init__(self, root, review_mode=False, journal=True, trace_path=None, profile=False,
+                 decoder="opencv", decode_scale=False, serve=None, plugins_dir=PLUGIN_DIR,
+                 plugin_budget_ms=PLUGIN_BUDGET_MS, mine=None, mine_options=None):
         self.root = root
         self.root.title("CenkerVision - YOLO Tabanlı Video Oynatıcı")
         self.root.geometry("1200x800")
@@ -66,14 +93,70 @@ class CenkerVision:
         self.display_mode = "normal"  # normal, confidence, boxes_only, censored
         self.frame_queue = queue.Queue(maxsize=5)  # Frame'leri saklamak için queue
         self.processing = False  # İşleme durumu
+        # Olay güdümlü UI: üretici kare hazır olduğunda UI thread'ini tek seferlik uyandırır
+        self.ui_wakeup_lock = threading.Lock()
+        self.ui_wakeup_pending = False
+        self.last_ui_refresh = 0.0
+        self.pending_ui_state = {}  # Birleştirilmiş slider/durum güncellemeleri (son değer kazanır)
+        # Son gösterilen karenin işlenmemiş hali ve tespitleri (kuyruk öğesi biçiminde:
+        # kare, tespitler, 0 tabanlı kare no, zaman; slider/POS değeri değil)
+        self.last_detections = None
+        # Duraklatılmışken eşik değişikliklerini işleyen arka plan thread'i (en yeni istek kazanır)
+        self.reprocess_cond = threading.Condition()
+        self.reprocess_pending = False
+        self.reprocess_generation = 0
+        self.reprocess_thread = None
+        self.inference_lock = threading.Lock()  # Model aynı anda tek thread'den çalıştırılır
+        self.cascade = None  # Kaskad modu: küçük model her karede, büyük model belirsiz bölgelerde
         self.seek_lock = threading.Lock()  # Video karelerini güvenli şekilde sıçratmak için kilit
         self.is_webcam = False # Webcam kullanılıp kullanılmadığını belirtir
+        self.frame_grabber = None  # Webcam için sadece en yeni kareyi tutan yakalayıcı thread
+        self.pipeline_latency = None  # Yakalamadan ekrana son gecikme (sn), sadece webcam
+        self.latency_probe = None  # Glass-to-glass ölçüm modu açıkken LatencyProbe
+        self.latency_window = None
+        self.video_fps = 0.0  # Kaynağın FPS değeri (kare zaman damgaları için)
+        # Video dosyaları için kod çözücü (opencv, pyav, ffmpeg) ve çözücüde küçültme
+        self.decode_backend = decoder
+        self.decode_scale = decode_scale
+        
+        # Bölge analitiği (çoklu poligon bölge, giriş/çıkış ve bekleme süreleri)
+        self.zone_analyzer = ZoneAnalyzer(self.load_default_zones())
+        
+        # Tespit kaydı (sütun bazlı akış yazıcısı, kayıt yokken None)
+        self.detection_writer = None
+        # Arka planda çalışan açıklamalı video dışa aktarma işi
+        self.exporter = None
+        # Önceden hesaplanmış tespit deposu - açıksa model yerine overlay buradan okunur
+        self.overlay_store = None
+        self.occurrences = None  # Açık deponun sınıf/ID zaman indeksi (arka planda hazırlanır)
+        self.occurrence_class_ids = {}  # Sınıf seçim kutusundaki etiket -> sınıf ID'si
+        self.review_mode = review_mode  # İnceleme modu: model ve torch yüklenmez
+        # İlerleme çubuğu önizlemesi (video başına küçük resim önbelleği)
+        self.thumbnail_index = None
+        self.preview_window = None
+        self.preview_thumb = -1  # Gösterilen küçük resmin indeksi
+        self.density_image = None
+        # Çözülmüş klip önbelleği (tekrarlanan analiz geçişleri için ham kareler)
+        self.clip_cache = ClipCache(max_bytes=CLIP_CACHE_MAX_GB * 1024 ** 3)
+        self.clip_job = None  # Arka planda klip çözme işi (thread)
+        self.clip_job_progress = (0, 0)
+        self.clip_job_cancel = threading.Event()
+        # Makine başına otomatik ayar işi
+        self.autotune_job = None
+        self.autotune_status = ""
         
         # Takip (tracking) değişkenleri
         self.enable_tracking = False  # Takip özelliği açık/kapalı
         self.tracker_config = BYTETRACK_CONFIG.copy()  # Varsayılan takip ayarları
         self.tracker_type = "bytetrack"  # tracker türü (bytetrack, botsort vb.)
         self.tracker_config_path = self.get_tracker_config_path()
+        # Isı haritası ve iz çizgileri (menüden açılır); iz uzunluğu tracker'ın track_buffer değeri
+        track_buffer = (read_track_buffer(self.tracker_config_path) if self.tracker_config_path
+                        else self.tracker_config["track_buffer"])
+        self.motion_overlay = MotionOverlay(heatmap=False, trails=False, track_buffer=track_buffer)
+        # Eklenti kancaları (son işleme/overlay) çıkarım thread'inde, kare bütçesiyle çalışır
+        self.plugins = PluginManager(plugin_budget_ms)
+        self.plugins.load_dir(plugins_dir)
         
         # Debug modu
         self.debug_mode = DEBUG_MODE
@@ -89,12 +172,16 @@ class CenkerVision:
         if self.force_cpu:
             mode_info.append("CPU MODU")
         
+        if self.review_mode:
+            mode_info.append("İNCELEME")
+        
         if mode_info:
             self.root.title(f"CenkerVision - YOLO Tabanlı Video Oynatıcı [{', '.join(mode_info)}]")
         
-        # Cihaz seçimi (CPU veya MPS/GPU)
-        self.device = self.get_device()
-        print(f"Kullanılacak cihaz: {self.device}")
+        # Cihaz seçimi (CPU veya MPS/GPU) - inceleme modunda model yüklenene kadar ertelenir
+        self.device = None if self.review_mode else self.get_device()
+        if self.device is not None:
+            print(f"Kullanılacak cihaz: {self.device}")
         
         # FPS sayacı için değişkenler
         self.fps = 0
@@ -102,6 +189,13 @@ class CenkerVision:
         self.fps_update_interval = 1.0  # FPS güncelleme aralığı (saniye)
         self.last_fps_update = time.time()
         
+        # Değişken hızlı oynatma: hız çarpanı, hızlıda çıkarım aralığı ve geri adım tamponu
+        self.playback_speed = 1.0
+        self.inference_stride = InferenceStride()
+        self.frame_history = FrameHistory()
+        self.shown_frame_idx = None  # Ekrandaki karenin 0 tabanlı numarası
+        self.capture_behind = False  # Tampondan geri adım atıldı; oynatmadan önce konum ayarlanmalı
+        
         # Basit mod UI kontrolü
         if self.simple_mode:
             print("BASİT MOD ETKİN: YOLO işlemi atlanacak ve sadece video gösterilecek")
@@ -109,7 +203,6 @@ class CenkerVision:
         # M1/Metal kullanım bilgisi
         if not self.force_cpu and self.device == "mps":
             print("⚡ M1/M2 Metal Performance Shaders (MPS) etkin - GPU hızlandırma kullanılıyor")
-            print("   MPS destekli PyTorch sürümü:", torch.__version__)
         
         # Özel modelleri saklamak için dizini kontrol et ve oluştur
         self.models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
@@ -119,6 +212,11 @@ class CenkerVision:
         # Mevcut özel modelleri yükle
         self.load_custom_models()
         
+        # Model yükleme ve çıkarım motoru (Tkinter'dan bağımsız)
+        self.engine = DetectionEngine(self.models_dir, device=self.device, force_cpu=self.force_cpu,
+                                      debug=self.debug_mode)
+        self.engine.tracker_config_path = self.tracker_config_path or "bytetrack.yaml"
+        
         # Ana çerçeve
         main_frame = ttk.Frame(root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -164,6 +262,37 @@ class CenkerVision:
         self.next_frame_btn = ttk.Button(btn_frame, text="10 Kare ▶", command=lambda: self.jump_frames(10))
         self.next_frame_btn.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
         
+        # Oynatma hızı ve tek kare adımları (geri adım son çözülen karelerin tamponundan)
+        speed_frame = ttk.Frame(control_frame)
+        speed_frame.pack(side=tk.TOP, padx=5, pady=5, fill=tk.X)
+        
+        ttk.Button(speed_frame, text="◀ 1", width=4, command=lambda: self.step_frame(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Label(speed_frame, text="Hız:").pack(side=tk.LEFT, padx=(6, 2))
+        self.speed_var = tk.StringVar(value=format_speed(1.0))
+        self.speed_combo = ttk.Combobox(speed_frame, textvariable=self.speed_var, width=6, state="readonly",
+                                        values=[format_speed(v) for v in PLAYBACK_SPEEDS])
+        self.speed_combo.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        self.speed_combo.bind("<<ComboboxSelected>>",
+                              lambda e: self.set_playback_speed(PLAYBACK_SPEEDS[self.speed_combo.current()]))
+        ttk.Button(speed_frame, text="1 ▶", width=4, command=lambda: self.step_frame(1)).pack(side=tk.LEFT, padx=2)
+        
+        # Sınıf veya takip ID'sinin sonraki/önceki görünümüne atlama (tespit deposunun zaman indeksi)
+        occurrence_frame = ttk.Frame(control_frame)
+        occurrence_frame.pack(side=tk.TOP, padx=5, pady=5, fill=tk.X)
+        
+        self.occurrence_class_var = tk.StringVar(value="Tümü")
+        self.occurrence_combo = ttk.Combobox(occurrence_frame, textvariable=self.occurrence_class_var,
+                                             values=["Tümü"], width=10, state="readonly")
+        self.occurrence_combo.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        self.occurrence_combo.bind("<<ComboboxSelected>>", lambda e: self.update_density_strip())
+        ttk.Label(occurrence_frame, text="ID:").pack(side=tk.LEFT)
+        self.occurrence_id_var = tk.StringVar()
+        ttk.Entry(occurrence_frame, textvariable=self.occurrence_id_var, width=5).pack(side=tk.LEFT, padx=2)
+        ttk.Button(occurrence_frame, text="◀", width=3,
+                   command=lambda: self.jump_occurrence(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(occurrence_frame, text="▶", width=3,
+                   command=lambda: self.jump_occurrence(1)).pack(side=tk.LEFT, padx=2)
+        
         # Orta panel - YOLO ayarları
         yolo_frame = ttk.LabelFrame(bottom_frame, text="YOLO Ayarları")
         yolo_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -174,8 +303,7 @@ class CenkerVision:
         
         ttk.Label(model_frame, text="YOLO Modeli:").pack(side=tk.LEFT, padx=5)
         
-        default_models = ["yolov8n.pt", "yolov8s.pt", "yolov8m.pt", "yolov8l.pt", "yolov8x.pt"]
-        all_models = default_models + self.custom_models
+        all_models = DEFAULT_MODELS + self.custom_models
         
         self.model_var = tk.StringVar(value="yolov8n.pt")
         self.model_combo = ttk.Combobox(model_frame, textvariable=self.model_var, values=all_models, width=30)
@@ -186,6 +314,19 @@ class CenkerVision:
         self.add_model_btn = ttk.Button(model_frame, text="Özel Model Ekle", command=self.add_custom_model)
         self.add_model_btn.pack(side=tk.RIGHT, padx=5)
         
+        # Model kaskadı: seçili model her karede, büyük model sadece belirsiz bölgelerde
+        cascade_frame = ttk.Frame(yolo_frame)
+        cascade_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=2)
+        
+        self.cascade_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cascade_frame, text="Kaskad - Büyük Model:", variable=self.cascade_var,
+                        command=self.toggle_cascade).pack(side=tk.LEFT, padx=5)
+        self.cascade_model_var = tk.StringVar(value="yolov8l.pt")
+        self.cascade_combo = ttk.Combobox(cascade_frame, textvariable=self.cascade_model_var,
+                                          values=all_models, width=30)
+        self.cascade_combo.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.cascade_combo.bind("<<ComboboxSelected>>", lambda e: self.toggle_cascade())
+        
         # Nesne tespiti onay kutusu
         detect_frame = ttk.Frame(yolo_frame)
         detect_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
@@ -201,6 +342,12 @@ class CenkerVision:
                                            variable=self.track_var, command=self.toggle_tracking)
         self.track_checkbox.pack(side=tk.LEFT, padx=5)
         
+        # Gecikme bütçesine göre çıkarım çözünürlüğünü (imgsz) ayarlayan kontrolcü
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.adaptive_checkbox = ttk.Checkbutton(detect_frame, text="Uyarlamalı Çözünürlük",
+                                              variable=self.adaptive_var, command=self.toggle_adaptive_resolution)
+        self.adaptive_checkbox.pack(side=tk.LEFT, padx=5)
+        
         # Eşik değerleri ve görüntüleme modları
         threshold_frame = ttk.Frame(yolo_frame)
         threshold_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
@@ -264,6 +411,12 @@ class CenkerVision:
                                       orient=tk.HORIZONTAL, command=self.slider_changed)
         self.progress_slider.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         self.progress_slider.bind("<ButtonRelease-1>", self.slider_released)
+        self.progress_slider.bind("<Motion>", self.slider_hover)
+        self.progress_slider.bind("<Leave>", lambda e: self.hide_seek_preview())
+        self.progress_slider.bind("<Configure>", lambda e: self.update_density_strip())
+        
+        # Tespit yoğunluğu şeridi (tespit deposu açıkken çubuğun hemen altında)
+        self.density_canvas = tk.Canvas(slider_frame, height=4, highlightthickness=0, bd=0)
         
         self.time_label_end = ttk.Label(slider_frame, text="0:00")
         self.time_label_end.pack(side=tk.LEFT, padx=5)
@@ -272,29 +425,1132 @@ class CenkerVision:
         self.status_label = ttk.Label(main_frame, text="Hazır", relief=tk.SUNKEN, anchor=tk.W)
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
         
-        # UI güncelleme zamanlayıcısını başlat
-        self.check_queue()
+        # Menü çubuğu
+        self.build_menu()
+        
+        # Kısayollar: n/p seçili sınıfın (veya ID'nin) sonraki/önceki görünümü
+        self.root.bind("<KeyPress-n>", lambda e: self.occurrence_hotkey(e, 1))
+        self.root.bind("<KeyPress-p>", lambda e: self.occurrence_hotkey(e, -1))
+        # [ / ] oynatma hızı, , / . tek kare geri/ileri
+        self.root.bind("<KeyPress-bracketleft>", lambda e: self.change_playback_speed(e, -1))
+        self.root.bind("<KeyPress-bracketright>", lambda e: self.change_playback_speed(e, 1))
+        self.root.bind("<KeyPress-comma>", lambda e: None if self.typing(e) else self.step_frame(-1))
+        self.root.bind("<KeyPress-period>", lambda e: None if self.typing(e) else self.step_frame(1))
         
         # Pencere kapatıldığında
         self.root.protocol("WM_DELETE_WINDOW", self.close_app)
         
-        # Arayüz oluşturulduktan sonra modeli yükle
-        self.root.after(100, lambda: self.load_yolo_model("yolov8n.pt"))
+        # Arayüz oluşturulduktan sonra modeli yükle (inceleme modunda model yüklenmez)
+        if not self.review_mode:
+            self.root.after(100, lambda: self.load_yolo_model("yolov8n.pt"))
+        
+        # Olay günlüğü: Memory Bank başlatma ve yazmaları arka plan thread'inde yapılır
+        self.journal = EventJournal(enabled=journal, setup=self._initialize_memory_bank)
+        
+        # Zaman çizelgesi izleme (--trace) ve örnekleyici profil (--profile)
+        self.trace_path = trace_path  # Verilmişse iz kapanışta bu dosyaya yazılır
+        self.profiler = None
+        if trace_path:
+            TRACER.start()
+        if profile:
+            self.profiler = SamplingProfiler()
+            self.profiler.start()
+        
+        # Yerel ağa MJPEG/HTTP yayını (--serve veya Analiz menüsü)
+        self.stream_server = None
+        if serve is not None:
+            self.start_stream_server(serve)
+        
+        # Belirsiz tespitlerden örnek toplama (--mine veya Analiz menüsü); yazma arka planda
+        self.miner = None
+        self.mine_dir = mine or None  # Boşsa kaynağın yanındaki <video>_mined klasörü
+        self.mine_options = mine_options or {}
+        if mine is not None:
+            self.start_crop_miner()
+        
+        self.locked_object_show_text = "Obje yok"  # Ekrana yazılacak bölge metni
+    
+    def build_menu(self):
+        """Menü çubuğunu oluştur"""
+        menubar = tk.Menu(self.root)
+        
+        self.analysis_menu = tk.Menu(menubar, tearoff=0)
+        self.analysis_menu.add_command(label="Bölge Dosyası Yükle...", command=self.load_zones_file)
+        self.analysis_menu.add_command(label="Bölge Olaylarını Dışa Aktar...", command=self.export_zone_events)
+        self.analysis_menu.add_command(label="Bölge İstatistiklerini Sıfırla", command=self.reset_zone_analytics)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="Tespit Kaydını Başlat...", command=self.start_detection_recording)
+        self.analysis_menu.add_command(label="Tespit Kaydını Durdur", command=self.stop_detection_recording)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="Tespit Dosyası Aç (Overlay)...", command=self.browse_detection_store)
+        self.analysis_menu.add_command(label="Tespit Dosyasını Kapat", command=self.close_detection_store)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="Açıklamalı Video Dışa Aktar...", command=self.show_export_dialog)
+        self.analysis_menu.add_command(label="Dışa Aktarmayı İptal Et", command=self.cancel_export)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="Gecikme Ölçümü (Webcam)", command=self.toggle_latency_probe)
+        self.stream_var = tk.BooleanVar(value=False)
+        self.analysis_menu.add_checkbutton(label=f"Yayın Sunucusu (MJPEG, :{STREAM_PORT})", variable=self.stream_var,
+                                           command=self.toggle_stream_server)
+        self.mine_var = tk.BooleanVar(value=False)
+        self.analysis_menu.add_checkbutton(label="Örnek Toplama (Belirsiz Tespitler)", variable=self.mine_var,
+                                           command=self.toggle_crop_miner)
+        plugin_menu = tk.Menu(self.analysis_menu, tearoff=0)
+        self.plugin_vars = {}
+        for plugin in self.plugins.plugins:
+            var = tk.BooleanVar(value=self.plugins.is_enabled(plugin.name))
+            self.plugin_vars[plugin.name] = var
+            plugin_menu.add_checkbutton(label=plugin.name, variable=var,
+                                        command=lambda n=plugin.name, v=var: self.plugins.set_enabled(n, v.get()))
+        if self.plugins.plugins:
+            plugin_menu.add_separator()
+        plugin_menu.add_command(label="Eklenti İstatistikleri...", command=self.show_plugin_stats)
+        self.analysis_menu.add_cascade(label="Eklentiler", menu=plugin_menu)
+        self.analysis_menu.add_separator()
+        self.heatmap_var = tk.BooleanVar(value=False)
+        self.trails_var = tk.BooleanVar(value=False)
+        self.analysis_menu.add_checkbutton(label="Isı Haritası", variable=self.heatmap_var,
+                                           command=self.toggle_motion_overlay)
+        self.analysis_menu.add_checkbutton(label="İz Çizgileri (Takip)", variable=self.trails_var,
+                                           command=self.toggle_motion_overlay)
+        self.analysis_menu.add_command(label="Isı Haritası ve İzleri Kaydet...", command=self.save_motion_overlay)
+        self.analysis_menu.add_command(label="Isı Haritasını ve İzleri Sıfırla", command=self.reset_motion_overlay)
+        self.analysis_menu.add_separator()
+        self.decoder_var = tk.StringVar(value=self.decode_backend)
+        self.decode_scale_var = tk.BooleanVar(value=self.decode_scale)
+        decoder_menu = tk.Menu(self.analysis_menu, tearoff=0)
+        available = available_backends()
+        for backend in DECODE_BACKENDS:
+            decoder_menu.add_radiobutton(label=backend, value=backend, variable=self.decoder_var,
+                                         command=self.on_decoder_change,
+                                         state=tk.NORMAL if backend in available else tk.DISABLED)
+        decoder_menu.add_separator()
+        decoder_menu.add_checkbutton(label=f"Çözücüde Küçült ({PROCESS_HEIGHT}p)", variable=self.decode_scale_var,
+                                     command=self.on_decoder_change)
+        self.analysis_menu.add_cascade(label="Kod Çözücü", menu=decoder_menu)
+        self.analysis_menu.add_command(label="Klibi Önbelleğe Al...", command=self.show_clip_cache_dialog)
+        self.analysis_menu.add_command(label="Klip Önbelleğini Temizle", command=self.clear_clip_cache)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="Otomatik Ayar (Bu Makine)...", command=self.start_autotune)
+        self.analysis_menu.add_command(label="Model Karşılaştırma Tablosu...", command=self.show_eval_table)
+        self.analysis_menu.add_separator()
+        self.analysis_menu.add_command(label="İz Kaydını Başlat", command=self.start_trace)
+        self.analysis_menu.add_command(label="İz Kaydını Durdur ve Kaydet...", command=self.stop_trace)
+        self.analysis_menu.add_command(label="Örnekleyici Profil Aç/Kapat", command=self.toggle_profiler)
+        self.analysis_menu.add_command(label=f"Flamegraph Kaydet (Son {PROFILE_WINDOW_SEC:.0f} sn)...",
+                                       command=self.save_flamegraph)
+        menubar.add_cascade(label="Analiz", menu=self.analysis_menu)
+        
+        self.root.config(menu=menubar)
+    
+    def load_default_zones(self):
+        """zones.yaml varsa bölgeleri oradan, yoksa varsayılan kitlenme bölgesini yükle"""
+        path = default_zones_path()
+        if os.path.exists(path):
+            try:
+                zones = load_zones(path)
+                print(f"Bölgeler yüklendi: {path} ({len(zones)} bölge)")
+                return zones
+            except Exception as e:
+                print(f"Bölge dosyası okuma hatası: {e}")
+        return [LOCK_ZONE]
+    
+    def load_zones_file(self):
+        """Kullanıcının seçtiği bölge dosyasını yükle"""
+        path = filedialog.askopenfilename(
+            title="Bölge Dosyası Seç",
+            filetypes=[("Bölge Dosyası", "*.yaml *.yml *.json"), ("Tüm Dosyalar", "*")]
+        )
+        if not path:
+            return
+        try:
+            zones = load_zones(path)
+            self.zone_analyzer.set_zones(zones)
+            self.status_label.config(text=f"{len(zones)} bölge yüklendi: {os.path.basename(path)}")
+        except Exception as e:
+            messagebox.showerror("Bölge Hatası", f"Bölge dosyası yüklenemedi: {e}")
+    
+    def export_zone_events(self):
+        """Bölge giriş/çıkış olaylarını dosyaya kaydet"""
+        path = filedialog.asksaveasfilename(
+            title="Bölge Olaylarını Kaydet",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        try:
+            count = self.zone_analyzer.export_events(path)
+            self.status_label.config(text=f"{count} bölge olayı kaydedildi: {os.path.basename(path)}")
+        except Exception as e:
+            messagebox.showerror("Dışa Aktarma Hatası", f"Olaylar kaydedilemedi: {e}")
+    
+    def toggle_motion_overlay(self):
+        """Isı haritası / iz çizgisi katmanlarını aç-kapat"""
+        overlay = self.motion_overlay
+        overlay.show_heatmap = self.heatmap_var.get()
+        overlay.show_trails = self.trails_var.get()
+        if overlay.show_trails and not self.enable_tracking:
+            self.status_label.config(text="İz çizgileri için takibi (ByteTrack) etkinleştirin")
+        self.rerender_paused_frame()
+    
+    def reset_motion_overlay(self):
+        """Isı haritası birikimini ve iz tamponlarını temizle"""
+        self.motion_overlay.reset()
+        self.rerender_paused_frame()
+    
+    def save_motion_overlay(self):
+        """Isı haritasını (.png görüntü + .npy ızgara) ve izleri (.npz) kaydet"""
+        if not self.motion_overlay.enabled:
+            messagebox.showinfo("Bilgi", "Önce Analiz menüsünden ısı haritasını veya iz çizgilerini açın.")
+            return
+        initial = os.path.splitext(os.path.basename(self.video_path))[0] if self.video_path and not self.is_webcam else "cenkervision"
+        path = filedialog.asksaveasfilename(
+            title="Isı Haritası ve İzleri Kaydet",
+            initialfile=initial,
+            defaultextension=".png",
+            filetypes=[("PNG + NumPy", "*.png"), ("Tüm Dosyalar", "*")]
+        )
+        if not path:
+            return
+        try:
+            written = self.motion_overlay.save(path)
+        except Exception as e:
+            messagebox.showerror("Kayıt Hatası", f"Isı haritası kaydedilemedi: {e}")
+            return
+        if written:
+            print("Kaydedildi: " + ", ".join(written))
+            self.status_label.config(text=f"Kaydedildi: {len(written)} dosya ({os.path.dirname(path)})")
+        else:
+            self.status_label.config(text="Kaydedilecek birikim yok (henüz tespit görülmedi)")
+    
+    def reset_zone_analytics(self):
+        """Bölge durumlarını, istatistiklerini ve olay geçmişini temizle"""
+        self.zone_analyzer.reset()
+        self.zone_analyzer.events.clear()
+        self.locked_object_show_text = "Obje yok"
+        self.status_label.config(text="Bölge istatistikleri sıfırlandı")
+    
+    def start_detection_recording(self):
+        """Oynatma sırasında üretilen tespitleri sütun bazlı depoya kaydetmeye başla"""
+        if self.cap is None:
+            messagebox.showinfo("Tespit Kaydı", "Önce bir video veya webcam kaynağı seçin.")
+            return
+        initial = default_store_path(self.video_path) if not self.is_webcam else f"{self.video_path}{STORE_SUFFIX}"
+        path = filedialog.asksaveasfilename(
+            title="Tespit Deposu Kaydet",
+            initialdir=os.path.dirname(initial) or None,
+            initialfile=os.path.basename(initial),
+            filetypes=[("CenkerVision Tespit Deposu", f"*{STORE_SUFFIX}")]
+        )
+        if not path:
+            return
+        
+        self.stop_detection_recording()
+        if getattr(self.cap, "scaled", False):
+            # Kayıt kaynak çözünürlüğünde yapılır
+            self.reopen_capture(scale=False)
+        meta = {
+            "source": str(self.video_path),
+            "fps": self.video_fps,
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "model": self.model_var.get(),
+            "names": dict(self.model.names) if self.model is not None else {},
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "tracked": bool(self.enable_tracking),
+        }
+        try:
+            self.detection_writer = DetectionWriter(path, meta)
+            self.status_label.config(text=f"Tespit kaydı başladı: {os.path.basename(path)}")
+        except Exception as e:
+            messagebox.showerror("Tespit Kaydı Hatası", f"Kayıt başlatılamadı: {e}")
+    
+    def stop_detection_recording(self):
+        """Tespit kaydını sonlandır ve kuyruğu diske boşalt"""
+        writer, self.detection_writer = self.detection_writer, None
+        if writer is None:
+            return
+        try:
+            writer.close()
+            print(f"Tespit kaydı kapatıldı: {writer.path} ({writer.frames_written} kare, {writer.rows_written} tespit)")
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Tespit kaydı kaydedildi: {writer.rows_written} tespit")
+        except Exception as e:
+            print(f"Tespit kaydı kapatma hatası: {e}")
+            return
+        # Zaman indeksini şimdiden üret; depo overlay olarak açıldığında hazır olur
+        threading.Thread(target=self.index_detection_store, args=(writer.path,),
+                         name="OccurrenceIndex", daemon=True).start()
+    
+    def index_detection_store(self, path):
+        """Kaydı biten deponun sınıf/ID zaman indeksini üretip kaydet (arka plan thread'i)"""
+        try:
+            store = DetectionStore(path)
+            try:
+                OccurrenceIndex.for_store(store)
+            finally:
+                store.close()
+        except Exception as e:
+            print(f"Zaman indeksi üretilemedi: {e}")
+    
+    def browse_detection_store(self):
+        """Overlay olarak oynatılacak tespit deposunu seç"""
+        initial = default_store_path(self.video_path) if self.video_path and not self.is_webcam else ""
+        path = filedialog.askdirectory(
+            title="Tespit Deposu Seç (.cvdet)",
+            initialdir=os.path.dirname(initial) or None
+        )
+        if path:
+            self.open_detection_store(path)
+    
+    def open_detection_store(self, path):
+        """Tespit deposunu aç; açık olduğu sürece model çalıştırılmaz, overlay depodan çizilir"""
+        try:
+            store = DetectionStore(path)
+        except Exception as e:
+            messagebox.showerror("Tespit Dosyası Hatası", f"Tespit deposu açılamadı: {e}")
+            return False
+        
+        self.close_detection_store()
+        self.overlay_store = store
+        if getattr(self.cap, "scaled", False):
+            self.reopen_capture()  # Overlay kaynak çözünürlüğündeki karelere çizilir
+        print(f"Tespit deposu açıldı: {path} ({store.rows} tespit, {store.frame_count} kare)")
+        self.status_label.config(text=f"Overlay: {os.path.basename(path)} ({store.rows} tespit)")
+        self.update_density_strip()
+        self.start_occurrence_index(store)
+        
+        # Duraklatılmış karede overlay'i hemen göster
+        if self.cap is not None and not self.is_playing and hasattr(self, 'current_processed_frame'):
+            self.display_frame(self.current_processed_frame)
+        return True
+    
+    def close_detection_store(self):
+        """Overlay deposunu kapat, canlı tespite geri dön"""
+        store, self.overlay_store = self.overlay_store, None
+        if store is not None:
+            store.close()
+            self.status_label.config(text="Tespit deposu kapatıldı")
+        self.occurrences = None
+        self.update_occurrence_classes()
+        self.update_density_strip()
+    
+    def start_occurrence_index(self, store):
+        """Deponun sınıf/ID zaman indeksini arka planda yükle (yoksa veya eskiyse üretip depoya kaydet)"""
+        def load():
+            try:
+                index = OccurrenceIndex.for_store(store)
+            except Exception as e:
+                print(f"Zaman indeksi hazırlanamadı: {e}")
+                return
+            self.root.after(0, lambda: self.set_occurrence_index(store, index))
+        
+        threading.Thread(target=load, name="OccurrenceIndex", daemon=True).start()
+    
+    def set_occurrence_index(self, store, index):
+        """UI thread'i: hazır indeksi bağla (bu arada depo değiştiyse at)"""
+        if store is not self.overlay_store:
+            return
+        self.occurrences = index
+        self.update_occurrence_classes()
+        self.update_density_strip()
+        print(f"Zaman indeksi hazır: {len(index.classes) - 1} sınıf, {len(index.track_ids)} takip ID'si")
+    
+    def update_occurrence_classes(self):
+        """Sınıf seçim kutusunu indeksteki sınıflarla doldur"""
+        self.occurrence_class_ids = {"Tümü": ALL_CLASSES}
+        if self.occurrences is not None:
+            names = self.overlay_store.names
+            for cls_id in self.occurrences.classes:
+                if cls_id != ALL_CLASSES:
+                    self.occurrence_class_ids[str(names.get(int(cls_id), int(cls_id)))] = int(cls_id)
+        self.occurrence_combo.config(values=list(self.occurrence_class_ids))
+        if self.occurrence_class_var.get() not in self.occurrence_class_ids:
+            self.occurrence_class_var.set("Tümü")
+    
+    def typing(self, event):
+        """Kısayol bir yazı alanında mı basıldı? (o zaman kısayol olarak işlenmez)"""
+        return isinstance(event.widget, (tk.Entry, ttk.Entry))
+    
+    def occurrence_hotkey(self, event, direction):
+        """n/p kısayolu (yazı alanlarında yazarken tetiklenmez)"""
+        if self.typing(event):
+            return
+        self.jump_occurrence(direction)
+    
+    def jump_occurrence(self, direction):
+        """
+        Seçili sınıfın bir sonraki (direction > 0) veya önceki görünümünün ilk karesine atla.
+        ID alanı doluysa o takip ID'sinin ilk/son karesine atlanır. Sorgular zaman indeksinden
+        ikili aramayla yapılır; model çalıştırılmaz.
+        """
+        if self.cap is None or self.is_webcam:
+            return
+        if self.occurrences is None:
+            self.status_label.config(text="Görünüme atlamak için bir tespit deposu açın (indeks hazırlanıyor olabilir)")
+            return
+        ref = self.current_frame
+        id_text = self.occurrence_id_var.get().strip()
+        if id_text:
+            try:
+                track_id = int(id_text)
+            except ValueError:
+                self.status_label.config(text=f"Geçersiz takip ID'si: {id_text}")
+                return
+            span = self.occurrences.track_span(track_id)
+            if span is None:
+                self.status_label.config(text=f"ID {track_id} depoda yok")
+                return
+            first, last, cls_id = span
+            label = f"ID {track_id} ({self.overlay_store.names.get(cls_id, cls_id)})"
+            candidates = (first, last) if direction > 0 else (last, first)
+            target = next((f for f in candidates if (f > ref if direction > 0 else f < ref)), None)
+            text = f"{label}: {'ilk' if target == first else 'son'} kare {target} (kare {first}-{last})"
+        else:
+            label = self.occurrence_class_var.get()
+            cls_id = self.occurrence_class_ids.get(label, ALL_CLASSES)
+            query = self.occurrences.next_start if direction > 0 else self.occurrences.prev_start
+            found = query(ref, cls_id)
+            target = found[0] if found is not None else None
+            text = f"{label}: kare {target} ({found[1]}/{found[2]})" if found is not None else ""
+        
+        if target is None:
+            self.status_label.config(text=f"{label}: {'sonraki' if direction > 0 else 'önceki'} görünüm yok")
+            return
+        if self.seek_to_frame(target):
+            self.status_label.config(text=text)
+    
+    def seek_to_frame(self, target_frame):
+        """Belirli bir kareye git ve göster (oynatma sürüyorsa o kareden devam eder)"""
+        was_playing = self.is_playing
+        if was_playing:
+            self.stop_play_thread()
+        success = self.safe_set_frame_position(target_frame)
+        if success:
+            self.progress_slider.set(self.current_frame)
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            if fps > 0:
+                self.time_label_start.config(text=self.format_time(self.current_frame / fps))
+        if was_playing:
+            self.root.after(100, self.toggle_play)
+        return success
+    
+    def start_thumbnail_index(self, video_path):
+        """Video için küçük resim önbelleğini aç ve eksik kısmı arka planda oluştur"""
+        self.stop_thumbnail_index()
+        try:
+            self.thumbnail_index = ThumbnailIndex(video_path).start()
+        except Exception as e:
+            print(f"Küçük resim indeksi oluşturulamadı: {e}")
+            self.thumbnail_index = None
+        self.update_density_strip()
+    
+    def stop_thumbnail_index(self):
+        """Küçük resim oluşturmayı durdur ve önizlemeyi kapat"""
+        self.hide_seek_preview()
+        if self.thumbnail_index is not None:
+            self.thumbnail_index.stop()
+            self.thumbnail_index = None
+    
+    def slider_hover(self, event):
+        """Fare çubuğun üzerindeyken imlecin karşılık geldiği karenin önizlemesini göster"""
+        if str(self.progress_slider.cget("state")) == tk.DISABLED:
+            return
+        width = max(1, self.progress_slider.winfo_width())
+        frame_idx = min(max(0.0, event.x / width), 1.0) * self.frame_count
+        self.show_seek_preview(frame_idx, event.x)
+    
+    def show_seek_preview(self, frame_idx, x=None):
+        """Çubuğun üzerinde küçük resim ve zaman bilgisini gösteren açılır pencere"""
+        index = self.thumbnail_index
+        if index is None or self.is_webcam:
+            return
+        thumb = index.get(frame_idx)
+        if thumb is None:
+            return
+        
+        if self.preview_window is None:
+            self.preview_window = tk.Toplevel(self.root)
+            self.preview_window.overrideredirect(True)
+            self.preview_window.attributes("-topmost", True)
+            self.preview_label = tk.Label(self.preview_window, compound=tk.TOP, bg="black", fg="white",
+                                          font=("TkDefaultFont", 9))
+            self.preview_label.pack()
+        
+        # Aynı küçük resim zaten gösteriliyorsa sadece konumu/zamanı güncelle
+        thumb_idx = index.index_for_frame(frame_idx)
+        if thumb_idx != self.preview_thumb:
+            image = Image.fromarray(cv2.cvtColor(np.asarray(thumb), cv2.COLOR_BGR2RGB))
+            self.preview_photo = ImageTk.PhotoImage(image=image)
+            self.preview_label.config(image=self.preview_photo)
+            self.preview_thumb = thumb_idx
+        fps = self.video_fps if self.video_fps > 0 else 30.0
+        self.preview_label.config(text=self.format_time(frame_idx / fps))
+        
+        if x is None:
+            # Sürükleme sırasında: imleç konumunu değerden hesapla
+            x = frame_idx / max(1, self.frame_count) * self.progress_slider.winfo_width()
+        w = index.width + 4
+        h = index.height + 22
+        px = int(self.progress_slider.winfo_rootx() + x - w / 2)
+        py = int(self.progress_slider.winfo_rooty() - h - 6)
+        self.preview_window.geometry(f"{w}x{h}+{px}+{py}")
+        self.preview_window.deiconify()
+    
+    def hide_seek_preview(self):
+        if self.preview_window is not None:
+            self.preview_window.withdraw()
+    
+    def update_density_strip(self):
+        """
+        Tespit deposundaki kare başına tespit sayılarını çubuğun altında renk şeridi olarak çiz.
+        Zaman indeksinde bir sınıf seçiliyse şerit o sınıfın görüldüğü aralıkları gösterir.
+        """
+        canvas = self.density_canvas
+        cls_id = self.occurrence_class_ids.get(self.occurrence_class_var.get(), ALL_CLASSES)
+        show_class = self.occurrences is not None and cls_id != ALL_CLASSES
+        if self.overlay_store is None or self.is_webcam or (self.thumbnail_index is None and not show_class):
+            canvas.place_forget()
+            return
+        width = self.progress_slider.winfo_width()
+        if width <= 1:
+            return
+        
+        if show_class:
+            present = self.occurrences.presence(cls_id, width, max(self.frame_count, self.overlay_store.frame_count))
+            strip = np.zeros((4, width, 3), dtype=np.uint8)
+            strip[:, present] = CLASS_COLORS[cls_id % len(CLASS_COLORS)]
+        else:
+            counts = self.thumbnail_index.density(self.overlay_store).astype(np.float32)
+            peak = counts.max() if len(counts) else 0
+            levels = (counts * (255.0 / peak)).astype(np.uint8) if peak > 0 else np.zeros(len(counts), np.uint8)
+            strip = cv2.applyColorMap(levels.reshape(1, -1), cv2.COLORMAP_INFERNO)
+            strip = cv2.resize(strip, (width, 4), interpolation=cv2.INTER_NEAREST)
+        self.density_image = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(strip, cv2.COLOR_BGR2RGB)))
+        
+        canvas.delete("all")
+        canvas.create_image(0, 0, image=self.density_image, anchor=tk.NW)
+        canvas.place(in_=self.progress_slider, relx=0, rely=1.0, relwidth=1.0, height=4, anchor=tk.NW)
+    
+    def show_export_dialog(self):
+        """Dışa aktarma aralığını ve kodlayıcıyı seçtiren diyalog"""
+        if self.cap is None or self.is_webcam:
+            messagebox.showinfo("Dışa Aktarma", "Dışa aktarma için bir video dosyası açın.")
+            return
+        if self.exporter is not None and self.exporter.is_alive():
+            messagebox.showinfo("Dışa Aktarma", "Devam eden bir dışa aktarma var.")
+            return
+        
+        start_var = tk.StringVar(value="0")
+        end_var = tk.StringVar(value=str(self.frame_count))
+        ffmpeg_var = tk.BooleanVar(value=False)
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Açıklamalı Video Dışa Aktar")
+        dialog.geometry("320x170")
+        ttk.Label(dialog, text="Başlangıç karesi:").pack(pady=2)
+        ttk.Entry(dialog, textvariable=start_var).pack(pady=2)
+        ttk.Label(dialog, text="Bitiş karesi:").pack(pady=2)
+        ttk.Entry(dialog, textvariable=end_var).pack(pady=2)
+        ttk.Checkbutton(dialog, text="ffmpeg (H.264) ile kodla", variable=ffmpeg_var).pack(pady=2)
+        
+        def on_ok():
+            try:
+                start, end = int(start_var.get()), int(end_var.get())
+            except ValueError:
+                messagebox.showerror("Hata", "Lütfen geçerli kare numaraları girin.")
+                return
+            dialog.destroy()
+            self.start_export(start, end, ffmpeg_var.get())
+        
+        ttk.Button(dialog, text="Dışa Aktar", command=on_ok).pack(pady=5)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.root.wait_window(dialog)
+    
+    def start_export(self, start_frame, end_frame, use_ffmpeg=False):
+        """Geçerli ayarlarla (mod, eşikler, takip, bölgeler) arka planda dışa aktarmayı başlat"""
+        initial = os.path.splitext(os.path.basename(self.video_path))[0] + "_annotated.mp4"
+        output = filedialog.asksaveasfilename(
+            title="Açıklamalı Videoyu Kaydet",
+            initialdir=os.path.dirname(self.video_path),
+            initialfile=initial,
+            defaultextension=".mp4",
+            filetypes=[("MP4", "*.mp4"), ("AVI", "*.avi"), ("Tüm Dosyalar", "*")]
+        )
+        if not output:
+            return
+        
+        # Oynatıcının takip durumu bozulmasın diye dışa aktarma kendi motorunu kullanır
+        engine = None
+        prepare = None
+        if self.overlay_store is None and self.detect_var.get():
+            engine = DetectionEngine(self.models_dir, device=self.device, force_cpu=self.force_cpu)
+            engine.tracker_config_path = self.engine.tracker_config_path
+            model_name = self.model_var.get()
+            large_name = self.cascade.large.model_name if self.cascade is not None else None
+            
+            def load_models():
+                engine.load_model(model_name)
+                if large_name is not None:
+                    # Kaskad da oynatıcıdan bağımsız kendi motorlarıyla çalışır
+                    large = DetectionEngine(self.models_dir, device=engine.device, force_cpu=self.force_cpu)
+                    large.load_model(large_name)
+                    annotator.cascade = ModelCascade(engine, large)
+            
+            prepare = load_models
+        
+        annotator = FrameAnnotator(
+            engine=engine, store=self.overlay_store, conf=self.conf_threshold, iou=self.iou_threshold,
+            track=self.enable_tracking, display_mode=self.display_mode,
+            zones=self.zone_analyzer.zones, fps=self.video_fps,
+            plugins=self.plugins.clone() if self.plugins.active else None,
+            miner=self.miner.clone(self.video_path) if self.miner is not None else None,
+            motion=MotionOverlay(self.heatmap_var.get(), self.trails_var.get(), self.motion_overlay.trails.length)
+            if self.motion_overlay.enabled else None, motion_output=output)
+        self.exporter = AnnotatedVideoExporter(
+            self.video_path, output, annotator, start_frame=start_frame, end_frame=end_frame,
+            use_ffmpeg=use_ffmpeg, prepare=prepare, decoder=self.decode_backend)
+        self.exporter.start()
+        self.status_label.config(text=f"Dışa aktarma başladı: {os.path.basename(output)}")
+        self.root.after(500, self.poll_export)
+    
+    def poll_export(self):
+        """Dışa aktarma ilerlemesini ve kalan süreyi durum çubuğunda göster"""
+        exporter = self.exporter
+        if exporter is None:
+            return
+        if not exporter.finished:
+            if exporter.total:
+                self.status_label.config(text="Dışa aktarılıyor: {:.1f}% ({}/{}) - {:.1f} FPS - Kalan: {}".format(
+                    exporter.progress * 100, exporter.done, exporter.total, exporter.fps, format_eta(exporter.eta)))
+            self.root.after(500, self.poll_export)
+            return
+        
+        if exporter.error is not None:
+            messagebox.showerror("Dışa Aktarma Hatası", f"Dışa aktarma başarısız: {exporter.error}")
+            self.status_label.config(text="Dışa aktarma hatası!")
+        elif exporter.cancelled:
+            self.status_label.config(text=f"Dışa aktarma iptal edildi ({exporter.done} kare yazıldı)")
+        else:
+            self.status_label.config(text=f"Dışa aktarma tamamlandı: {os.path.basename(exporter.output)} ({exporter.done} kare)")
+        self.exporter = None
+    
+    def cancel_export(self):
+        """Devam eden dışa aktarmayı iptal et"""
+        if self.exporter is not None and self.exporter.is_alive():
+            self.exporter.cancel()
+            self.status_label.config(text="Dışa aktarma iptal ediliyor...")
+    
+    def open_capture(self, video_path):
+        """Video için okuyucu aç: önbellekte çözülmüş klip varsa memmap'ten okuyan ClipCapture"""
+        clip = self.clip_cache.find(video_path)
+        if clip is not None:
+            print(f"Çözülmüş klip kullanılıyor: kare {clip.start}-{clip.end}")
+            return ClipCapture(video_path, clip)
+        return self.open_decoder(video_path)
+    
+    def open_decoder(self, video_path, scale=None):
+        """Seçili kod çözücüyle okuyucu aç (açılamazsa OpenCV)"""
+        if scale is None:
+            # Tespit deposu kaynak çözünürlüğünde koordinatlar tutar; kayıt/overlay varken küçültme yapılmaz
+            scale = self.decode_scale and self.detection_writer is None and self.overlay_store is None
+        return open_video(video_path, self.decode_backend, max_height=PROCESS_HEIGHT if scale else None)
+    
+    def on_decoder_change(self):
+        """Kod çözücü menüsü: açık video dosyasını aynı konumda yeni ayarlarla yeniden aç"""
+        self.decode_backend = self.decoder_var.get()
+        self.decode_scale = self.decode_scale_var.get()
+        self.reopen_capture()
+    
+    def reopen_capture(self, scale=None):
+        """Açık video dosyasının okuyucusunu aynı konumda yeniden aç (oynatma sürüyorsa devam eder)"""
+        if self.cap is None or self.is_webcam or isinstance(self.cap, ClipCapture):
+            return
+        was_playing = self.is_playing
+        if was_playing:
+            self.stop_play_thread()
+        with self.seek_lock:
+            position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            self.cap.release()
+            self.cap = self.open_decoder(self.video_path, scale)
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        self.status_label.config(text=f"Kod çözücü: {capture_backend(self.cap)} "
+                                      f"({int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+                                      f"{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))})")
+        if was_playing:
+            self.root.after(100, self.toggle_play)
+    
+    def show_eval_table(self):
+        """Hız/doğruluk değerlendirme tablosunu göster; çift tıklanan model seçilir"""
+        table = load_eval_table()
+        if not table:
+            messagebox.showinfo("Model Karşılaştırma",
+                                "Değerlendirme sonucu yok. Önce şunu çalıştırın:\n"
+                                "python CenkerVision.py --evaluate <etiketli klip klasörü>")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Model Karşılaştırma (* Pareto: daha hızlı ve daha doğru rakibi yok)")
+        window.geometry("900x320")
+        columns = ("device", "fps", "p50", "p95", "p99", "map50", "map50_95", "recall", "pareto")
+        headings = ("Cihaz", "FPS", "p50 ms", "p95 ms", "p99 ms", "mAP50", "mAP50-95", "Recall", "Pareto")
+        tree = ttk.Treeview(window, columns=columns, show="tree headings")
+        tree.heading("#0", text="Model")
+        tree.column("#0", width=220)
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=70, anchor=tk.E)
+        tree.tag_configure("pareto", background="#e0f0e0")
+        for name, row in sorted(table.items(), key=lambda item: -item[1]["fps"]):
+            tree.insert("", tk.END, iid=name, text=name, tags=("pareto",) if row.get("pareto") else (), values=(
+                row["device"], f"{row['fps']:.1f}", f"{row['p50_ms']:.1f}", f"{row['p95_ms']:.1f}",
+                f"{row['p99_ms']:.1f}", f"{row['map50']:.3f}", f"{row['map50_95']:.3f}",
+                f"{row['recall']:.2f}", "*" if row.get("pareto") else ""))
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        def on_select(event=None):
+            name = tree.focus()
+            if name in self.model_combo['values']:
+                self.model_var.set(name)
+                self.on_model_change()
+        
+        tree.bind("<Double-1>", on_select)
+    
+    def show_clip_cache_dialog(self):
+        """Önbelleğe alınacak klip aralığını (saniye) seçtiren diyalog"""
+        if self.cap is None or self.is_webcam:
+            messagebox.showinfo("Klip Önbelleği", "Klip önbelleği için bir video dosyası açın.")
+            return
+        if self.clip_job is not None and self.clip_job.is_alive():
+            messagebox.showinfo("Klip Önbelleği", "Devam eden bir klip çözme işi var.")
+            return
+        
+        fps = self.video_fps if self.video_fps > 0 else 30.0
+        start_sec = self.current_frame / fps
+        start_var = tk.StringVar(value=f"{start_sec:.1f}")
+        end_var = tk.StringVar(value=f"{min(start_sec + 60.0, self.frame_count / fps):.1f}")
         
-        # Memory Bank'ı başlat
-        self.memory_bank = MemoryBank()
-        self._initialize_memory_bank()
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Klibi Önbelleğe Al")
+        dialog.geometry("320x150")
+        ttk.Label(dialog, text="Başlangıç (sn):").pack(pady=2)
+        ttk.Entry(dialog, textvariable=start_var).pack(pady=2)
+        ttk.Label(dialog, text="Bitiş (sn):").pack(pady=2)
+        ttk.Entry(dialog, textvariable=end_var).pack(pady=2)
         
-        self.locked_object_timer = 0.0  # Kitlenme dörtgeni içindeki süre (saniye)
-        self.locked_object_last_time = None  # Son frame zamanı
-        self.locked_object_present = False  # Dörtgende obje var mı?
-        self.locked_object_show_text = "Obje yok"  # Ekrana yazılacak metin
+        def on_ok():
+            try:
+                start, end = float(start_var.get()), float(end_var.get())
+            except ValueError:
+                messagebox.showerror("Hata", "Lütfen geçerli süreler girin.")
+                return
+            dialog.destroy()
+            self.start_clip_cache(int(start * fps), int(end * fps))
+        
+        ttk.Button(dialog, text="Önbelleğe Al", command=on_ok).pack(pady=5)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.root.wait_window(dialog)
     
-    def _initialize_memory_bank(self):
-        """Memory Bank'ı başlatır ve proje dokümantasyonunu oluşturur."""
+    def start_clip_cache(self, start_frame, end_frame):
+        """Kare aralığını arka planda bir kez çözüp önbelleğe yaz"""
+        video_path = self.video_path
+        self.clip_job_cancel.clear()
+        self.clip_job_progress = (0, max(0, end_frame - start_frame))
+        
+        def run():
+            try:
+                self.clip_job.result = self.clip_cache.build(
+                    video_path, start_frame, end_frame,
+                    progress=lambda done, total: setattr(self, 'clip_job_progress', (done, total)),
+                    cancel=self.clip_job_cancel.is_set)
+            except Exception as e:
+                self.clip_job.error = e
+                print(f"Klip önbelleği hatası: {e}")
+        
+        self.clip_job = threading.Thread(target=run, name="ClipCache", daemon=True)
+        self.clip_job.result = None
+        self.clip_job.error = None
+        self.clip_job.video_path = video_path
+        self.clip_job.start()
+        self.root.after(500, self.poll_clip_cache)
+    
+    def poll_clip_cache(self):
+        """Klip çözme ilerlemesini göster; bitince okuyucuyu önbellekteki klibe geçir"""
+        job = self.clip_job
+        if job is None:
+            return
+        if job.is_alive():
+            done, total = self.clip_job_progress
+            if total:
+                self.status_label.config(text=f"Klip önbelleğe alınıyor: {done}/{total} kare")
+            self.root.after(500, self.poll_clip_cache)
+            return
+        
+        self.clip_job = None
+        if job.error is not None:
+            messagebox.showerror("Klip Önbelleği Hatası", f"Klip önbelleğe alınamadı: {job.error}")
+            self.status_label.config(text="Klip önbelleği hatası!")
+            return
+        clip = job.result
+        if clip is None:
+            self.status_label.config(text="Klip önbelleği iptal edildi")
+            return
+        self.status_label.config(text=f"Klip önbelleğe alındı: kare {clip.start}-{clip.end} "
+                                      f"({clip.nbytes / 1024**2:.0f} MB)")
+        
+        # Aynı video hâlâ açıksa okuyucuyu aynı konumda klip okuyucusuyla değiştir
+        if self.cap is None or self.is_webcam or self.video_path != job.video_path:
+            return
+        was_playing = self.is_playing
+        if was_playing:
+            self.stop_play_thread()
+        with self.seek_lock:
+            position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            self.cap.release()
+            self.cap = ClipCapture(self.video_path, clip)
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        if was_playing:
+            self.root.after(100, self.toggle_play)
+    
+    def clear_clip_cache(self):
+        """Devam eden işi iptal et ve önbellekteki tüm klipleri sil"""
+        self.clip_job_cancel.set()
+        if isinstance(self.cap, ClipCapture):
+            # Açık klip silinmeden önce okuyucuyu kaynak videoya geri döndür
+            was_playing = self.is_playing
+            if was_playing:
+                self.stop_play_thread()
+            with self.seek_lock:
+                position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+                self.cap.release()
+                self.cap = self.open_decoder(self.video_path)
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+            if was_playing:
+                self.root.after(100, self.toggle_play)
+        self.clip_cache.clear()
+        self.status_label.config(text="Klip önbelleği temizlendi")
+    
+    def apply_tuning_profile(self):
+        """Yüklü model ve açık kaynağın çözünürlüğü için kayıtlı profili uygula (yoksa varsayılanlar)"""
+        if self.engine.model is None or self.cap is None:
+            return
+        resolution = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        profile = find_profile(self.engine.model_name, resolution)
+        try:
+            with self.inference_lock:
+                self.engine.apply_profile(profile or {"imgsz": None, "batch": 1, "process_height": PROCESS_HEIGHT})
+                self.model = self.engine.model
+        except Exception as e:
+            print(f"Ayar profili uygulanamadı: {e}")
+            return
+        if profile is not None:
+            print(f"Ayar profili uygulandı ({profile_key(self.engine.model_name, resolution)}): "
+                  f"{profile['backend']}, thread={profile['threads']}, imgsz={profile['imgsz']}")
+    
+    def start_autotune(self):
+        """Seçili model için bu makinede ayar kombinasyonlarını arka planda ölç"""
+        if self.autotune_job is not None and self.autotune_job.is_alive():
+            messagebox.showinfo("Otomatik Ayar", "Devam eden bir otomatik ayar işi var.")
+            return
+        if self.is_playing:
+            # Ölçüm torch thread sayısını süreç genelinde değiştirir; oynatma ölçümü ve kendini bozar
+            messagebox.showinfo("Otomatik Ayar", "Otomatik ayar için önce videoyu duraklatın.")
+            return
+        video_path = self.video_path if self.cap is not None and not self.is_webcam else None
+        if video_path is None:
+            video_path = filedialog.askopenfilename(
+                title="Örnek Video Seç",
+                filetypes=[("Video Dosyaları", "*.mp4 *.avi *.mkv *.mov"), ("Tüm Dosyalar", "*")]
+            )
+            if not video_path:
+                return
+        
+        # Oynatıcının modeli ve takip durumu etkilenmesin diye ayrı motor kullanılır
+        model_name = self.model_var.get()
+        engine = DetectionEngine(self.models_dir, device=self.device, force_cpu=self.force_cpu)
+        
+        def run():
+            try:
+                engine.load_model(model_name)
+                tuner = AutoTuner(engine, video_path,
+                                  progress=lambda text: setattr(self, 'autotune_status', text))
+                job.profile = tuner.run()
+                job.resolution = tuner.resolution
+                save_profile(model_name, tuner.resolution, job.profile)
+            except Exception as e:
+                job.error = e
+                print(f"Otomatik ayar hatası: {e}")
+        
+        job = threading.Thread(target=run, name="AutoTune", daemon=True)
+        job.profile = None
+        job.error = None
+        job.model_name = model_name
+        self.autotune_job = job
+        self.autotune_status = "Model yükleniyor..."
+        job.start()
+        self.root.after(500, self.poll_autotune)
+    
+    def poll_autotune(self):
+        """Otomatik ayar ilerlemesini göster; bitince profili uygula"""
+        job = self.autotune_job
+        if job is None:
+            return
+        if job.is_alive():
+            self.status_label.config(text=f"Otomatik ayar: {self.autotune_status}")
+            self.root.after(500, self.poll_autotune)
+            return
+        
+        self.autotune_job = None
+        if job.error is not None:
+            messagebox.showerror("Otomatik Ayar Hatası", f"Otomatik ayar başarısız: {job.error}")
+            self.status_label.config(text="Otomatik ayar hatası!")
+            return
+        profile = job.profile
+        self.status_label.config(text=f"Otomatik ayar tamamlandı: {profile['backend']}, thread={profile['threads']}, "
+                                      f"batch={profile['batch']}, imgsz={profile['imgsz']} - {profile['fps']:.1f} FPS")
+        if job.model_name == self.engine.model_name:
+            self.apply_tuning_profile()
+    
+    def start_trace(self):
+        """Boru hattı aşamalarının süre aralıklarını kaydetmeye başla (önceki iz silinir)"""
+        TRACER.start()
+        self.status_label.config(text="İz kaydı başladı (Analiz > İz Kaydını Durdur ve Kaydet)")
+    
+    def stop_trace(self):
+        """İz kaydını durdur ve Chrome/Perfetto iz dosyası olarak kaydet"""
+        if not TRACER.enabled and not TRACER.events:
+            messagebox.showinfo("İz Kaydı", "Kayıtlı iz yok. Önce \"İz Kaydını Başlat\" seçin.")
+            return
+        TRACER.stop()
+        path = filedialog.asksaveasfilename(
+            title="İz Dosyası Kaydet",
+            initialfile=os.path.basename(timestamped_path("cenkervision_trace", ".json")),
+            defaultextension=".json",
+            filetypes=[("Chrome/Perfetto İzi", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            count = TRACER.save(path)
+            self.status_label.config(text=f"İz kaydedildi: {os.path.basename(path)} ({count} olay) - ui.perfetto.dev ile açın")
+        except Exception as e:
+            messagebox.showerror("İz Kaydı Hatası", f"İz kaydedilemedi: {e}")
+    
+    def toggle_profiler(self):
+        """Örnekleyici profili aç/kapat"""
+        if self.profiler is not None and self.profiler.running:
+            self.profiler.stop()
+            self.status_label.config(text="Örnekleyici profil kapatıldı")
+            return
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+        self.profiler.start()
+        self.status_label.config(text=f"Örnekleyici profil açık (son {PROFILE_WINDOW_SEC:.0f} sn tutulur)")
+    
+    def save_flamegraph(self):
+        """Son örnekleri katlanmış yığın (flamegraph girdisi) olarak kaydet"""
+        if self.profiler is None or not self.profiler.samples:
+            messagebox.showinfo("Flamegraph", "Örnek yok. Önce \"Örnekleyici Profil Aç/Kapat\" ile profili açın.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Flamegraph Kaydet",
+            initialfile=os.path.basename(timestamped_path("cenkervision_profile", ".folded")),
+            defaultextension=".folded",
+            filetypes=[("Katlanmış Yığınlar", "*.folded"), ("Tüm Dosyalar", "*")]
+        )
+        if not path:
+            return
+        count = self.profiler.dump_folded(path)
+        self.status_label.config(text=f"Flamegraph kaydedildi: {os.path.basename(path)} ({count} örnek) - speedscope.app ile açın")
+    
+    def show_plugin_stats(self):
+        """Kanca başına ortalama/p95 süre, atlanan kare ve hata sayıları"""
+        if not self.plugins.plugins:
+            messagebox.showinfo("Eklentiler", f"Yüklü eklenti yok.\nEklenti klasörü: {self.plugins.directory}")
+            return
+        # Hata yüzünden kapanan kancalar menüde de kapalı görünsün
+        for name, var in self.plugin_vars.items():
+            var.set(self.plugins.is_enabled(name))
+        lines = self.plugins.stats_lines()
+        lines.append(f"\nSon kare: {self.plugins.last_cost*1000:.2f} ms (bütçe {self.plugins.budget*1000:.1f} ms)")
+        messagebox.showinfo("Eklenti İstatistikleri", "\n".join(lines))
+    
+    def start_stream_server(self, address=""):
+        """Açıklamalı görüntüyü HTTP üzerinden yayınlamaya başla ([HOST:]PORT, boşsa varsayılan)"""
+        try:
+            host, port = parse_address(address)
+            self.stream_server = StreamServer(host, port)
+        except (OSError, ValueError) as e:
+            print(f"Yayın sunucusu başlatılamadı: {e}")
+            self.stream_var.set(False)
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Yayın sunucusu başlatılamadı: {e}")
+            return False
+        self.stream_var.set(True)
+        print(f"Yayın sunucusu: {self.stream_server.url} (stream.mjpg, snapshot.jpg, detections.json)")
+        self.status_label.config(text=f"Yayın: {self.stream_server.url}")
+        self.rerender_paused_frame()  # Duraklatılmışken de ilk kare hemen görünsün
+        return True
+    
+    def stop_stream_server(self):
+        server, self.stream_server = self.stream_server, None
+        if server is not None:
+            server.stop()
+            print("Yayın sunucusu kapatıldı")
+    
+    def toggle_stream_server(self):
+        """Analiz menüsünden yayın sunucusunu aç/kapat"""
+        if self.stream_var.get():
+            self.start_stream_server()
+        else:
+            self.stop_stream_server()
+            self.status_label.config(text="Yayın sunucusu kapatıldı")
+    
+    def start_crop_miner(self):
+        """Belirsiz tespitlerin kare ve kesitlerini YOLO veri seti olarak toplamaya başla"""
+        source = self.video_path if self.video_path and not self.is_webcam else None
+        directory = self.mine_dir or default_mine_dir(source)
+        try:
+            self.miner = CropMiner(directory, source=source, **self.mine_options)
+        except (OSError, ValueError) as e:
+            print(f"Örnek toplama başlatılamadı: {e}")
+            self.mine_var.set(False)
+            self.status_label.config(text=f"Örnek toplama başlatılamadı: {e}")
+            return False
+        self.mine_var.set(True)
+        print(f"Örnek toplama: {self.miner.directory} (güven {self.miner.band[0]:.2f}-{self.miner.band[1]:.2f})")
+        self.status_label.config(text=f"Örnek toplama: {self.miner.directory}")
+        return True
+    
+    def stop_crop_miner(self, wait=False):
+        """Örnek toplamayı durdur; kuyruktaki kareler arka planda (wait=True ise hemen) yazılır"""
+        miner, self.miner = self.miner, None
+        if miner is None:
+            return
+        
+        def close():
+            miner.close()
+            print(f"Örnek toplama durdu ({miner.directory}): {miner.summary()}")
+        
+        if wait:
+            close()
+        else:
+            threading.Thread(target=close, name="CropMinerClose", daemon=True).start()
+            self.status_label.config(text=f"Örnek toplama durdu: {miner.summary()}")
+    
+    def toggle_crop_miner(self):
+        """Analiz menüsünden örnek toplamayı aç/kapat"""
+        if self.mine_var.get():
+            self.start_crop_miner()
+        else:
+            self.stop_crop_miner()
+    
+    def toggle_latency_probe(self):
+        """Glass-to-glass gecikme ölçüm penceresini aç/kapat"""
+        if self.latency_probe is not None:
+            self.latency_probe = None
+            if self.latency_window is not None:
+                self.latency_window.destroy()
+                self.latency_window = None
+            self.status_label.config(text="Gecikme ölçümü kapatıldı")
+            return
+        
+        self.latency_probe = LatencyProbe()
+        self.latency_window = tk.Toplevel(self.root)
+        self.latency_window.title("Gecikme Ölçümü - Kamerayı bu desene tutun")
+        self.latency_window.geometry("500x400")
+        self.latency_window.protocol("WM_DELETE_WINDOW", self.toggle_latency_probe)
+        canvas = tk.Canvas(self.latency_window, bg="black", highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        self.status_label.config(text="Gecikme ölçümü: kamerayı desen penceresine tutun (desen kadrajı doldurmalı)")
+        
+        def refresh():
+            if self.latency_probe is None or self.latency_window is None:
+                return
+            w, h = max(2, canvas.winfo_width()), max(2, canvas.winfo_height())
+            pattern = self.latency_probe.render(w, h)
+            self.latency_photo = ImageTk.PhotoImage(image=Image.fromarray(pattern))
+            canvas.delete("all")
+            canvas.create_image(0, 0, anchor=tk.NW, image=self.latency_photo)
+            self.latency_window.after(5, refresh)
+        refresh()
+    
+    def queue_latest(self, item):
+        """Canlı kaynakta kuyruğu boşaltıp sadece en yeni kareyi bırak (bayat kare birikmesin)"""
+        with self.frame_queue.mutex:
+            self.frame_queue.queue.clear()
+        self.frame_queue.put_nowait(item)
+        self.notify_ui()
+    
+    def queue_frame(self, item):
+        """Kareyi sıraya ekle (kuyruk doluysa en fazla 1 sn bekler) ve UI'yi uyandır"""
+        with TRACER.span("queue_put", "playback"):
+            self.frame_queue.put(item, block=True, timeout=1)
+        self.notify_ui()
+    
+    def notify_ui(self):
+        """
+        Üretici thread'lerden çağrılır: bekleyen bir uyandırma yoksa UI thread'inde
+        check_queue'yu bir kez planlar. Böylece Tk olay kuyruğu kare başına dolmaz,
+        oynatma durduğunda hiç zamanlayıcı çalışmaz.
+        """
+        with self.ui_wakeup_lock:
+            if self.ui_wakeup_pending:
+                return
+            self.ui_wakeup_pending = True
+        try:
+            self.root.after(0, self.check_queue)
+        except RuntimeError:
+            pass  # Ana döngü kapanmış
+    
+    def set_ui_state(self, **state):
+        """Slider/durum güncellemesini biriktir; bir sonraki UI yenilemesinde uygulanır"""
+        self.pending_ui_state.update(state)
+        self.notify_ui()
+    
+    def apply_ui_state(self):
+        """Biriken slider/durum değerlerini (sadece değiştiyse) widget'lara uygula"""
+        state, self.pending_ui_state = self.pending_ui_state, {}
+        if "slider" in state and int(self.progress_slider.get()) != state["slider"]:
+            self.progress_slider.set(state["slider"])
+        if "status" in state and self.status_label.cget("text") != state["status"]:
+            self.status_label.config(text=state["status"])
+    
+    def record_detections(self, frame_idx, timestamp, detections):
+        """Oynatma thread'inden çağrılır: tespit kaydını yazıcı kuyruğuna ekler"""
+        writer = self.detection_writer
+        if writer is None or detections is None:
+            return
+        if self.enable_tracking and not writer.meta.get("tracked"):
+            # Takip kayıt sırasında açıldı: meta.json bir sonraki yazımda güncellenir
+            writer.meta["tracked"] = True
+        try:
+            with TRACER.span("record", "playback"):
+                writer.append(frame_idx, timestamp, *detections.arrays())
+        except Exception as e:
+            print(f"Tespit kaydı hatası: {e}")
+            if self.detection_writer is writer:
+                self.detection_writer = None
+            # Yazılan kısım okunabilsin: thread durdurulur, index.bin/meta.json son kez yazılır
+            try:
+                writer.close()
+            except Exception as close_error:
+                print(f"Tespit kaydı kapatma hatası: {close_error}")
+    
+    def frame_timestamp(self, frame_idx):
+        """Kare numarasından video zamanını (sn) hesapla"""
+        if self.video_fps > 0:
+            return frame_idx / self.video_fps
+        return frame_idx / 30.0  # FPS bilinmiyorsa ~30fps varsay
+    
+    def _initialize_memory_bank(self, memory_bank):
+        """Memory Bank'ı başlatır ve proje dokümantasyonunu oluşturur (günlük thread'inde)."""
         try:
             # Memory Bank'ı başlat
-            result = self.memory_bank.initialize(
+            result = memory_bank.initialize(
                 goal="CenkerVision: Gelişmiş nesne takip ve analiz sistemi"
             )
             
@@ -303,7 +1559,7 @@ class CenkerVision:
                 return
             
             # Proje özetini güncelle
-            self.memory_bank.update_document(
+            memory_bank.update_document(
                 "projectbrief",
                 f"""# CenkerVision Projesi
 
@@ -324,7 +1580,7 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             )
             
             # Teknik bağlamı güncelle
-            self.memory_bank.update_document(
+            memory_bank.update_document(
                 "techContext",
                 f"""# Teknik Bağlam
 
@@ -345,55 +1601,79 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             print(f"Error initializing Memory Bank: {e}")
     
     def update_memory_bank(self, event_type: str, details: str):
-        """Memory Bank'ı günceller."""
-        try:
-            # Aktif bağlamı güncelle
-            self.memory_bank.update_document(
-                "activeContext",
-                f"""# Aktif Bağlam
-
-## Son Olay
-- Tip: {event_type}
-- Detaylar: {details}
-- Zaman: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-            )
-        except Exception as e:
-            print(f"Error updating Memory Bank: {e}")
+        """Olayı günlüğe ekler (beklemez; activeContext belgesi arka planda periyodik yazılır)."""
+        self.journal.log(event_type, details)
     
     def search_memory_bank(self, query: str) -> Dict[str, Any]:
         """Memory Bank'ta arama yapar."""
         try:
-            return self.memory_bank.query(query)
+            return self.journal.query(query)
         except Exception as e:
             print(f"Error searching Memory Bank: {e}")
             return {"error": str(e)}
     
     def check_queue(self):
-        """Frame queue'yu kontrol et ve görüntüle"""
-        print("DEBUG: check_queue called") # DEBUG
+        """
+        Frame queue'daki kareleri göster (UI thread'inde, notify_ui ile uyandırılır).
+        En fazla UI_REFRESH_HZ hızında çalışır; arada biriken karelerin sadece sonuncusu
+        çizilir, öncekiler yalnızca bölge analitiğine işlenir.
+        """
+        with self.ui_wakeup_lock:
+            self.ui_wakeup_pending = False
+        
+        # Yenileme hızı sınırı: erken uyandırıldıysak kalan süre kadar ertele
+        wait = self.last_ui_refresh + 1.0 / UI_REFRESH_HZ - time.monotonic()
+        if wait > 0:
+            with self.ui_wakeup_lock:
+                if self.ui_wakeup_pending:
+                    return
+                self.ui_wakeup_pending = True
+            self.root.after(max(1, int(wait * 1000)), self.check_queue)
+            return
+        self.last_ui_refresh = time.monotonic()
+        
         try:
-            if not self.frame_queue.empty():
-                # Değişiklik: Kuyruktan (frame, results, scale_ratios, current_frame) al
-                original_frame, results, scale_ratios, current_frame = self.frame_queue.get_nowait()
-                print(f"DEBUG: Got from queue. Type: {type(original_frame)}, Results: {'Yes' if results else 'No'}, CF: {current_frame}") # DEBUG
-                
-                if original_frame is not None and len(original_frame.shape) == 3:  # Geçerli bir frame mi?
-                    # Çizim işlemini burada, ana thread'de yap
-                    h, w = original_frame.shape[:2]
-                    annotated_frame = self.draw_annotations(original_frame, results, scale_ratios, h, w)
-                    self.update_ui(annotated_frame, current_frame)
-                else:
+            items = []
+            while True:
+                try:
+                    items.append(self.frame_queue.get_nowait())
+                    self.frame_queue.task_done()
+                except queue.Empty:
+                    break
+            
+            # Kuyruktan (frame, detections, frame_idx, timestamp, analytics) al; frame_idx 0 tabanlıdır.
+            # analytics=False: bu karede çıkarım yapılmadı (eski tespitler), sadece çizilir
+            for i, (original_frame, detections, frame_idx, timestamp, analytics) in enumerate(items):
+                if original_frame is None or len(original_frame.shape) != 3:  # Geçerli bir frame mi?
                     print("Geçersiz frame alındı, atlanıyor")
+                    continue
+                h, w = original_frame.shape[:2]
+                if i < len(items) - 1:
+                    # Gösterilmeyecek kare: sadece bölge analitiğini güncelle
+                    if not analytics:
+                        continue
+                    with TRACER.span("zones", "ui", frame=frame_idx):
+                        self.update_zones(detections or Detections.empty(), h, w, frame_idx, timestamp)
+                    continue
                 
-                self.frame_queue.task_done()
-        except queue.Empty:
-            pass
+                if self.is_webcam:
+                    self.pipeline_latency = time.monotonic() - timestamp
+                    if self.latency_probe is not None:
+                        self.latency_probe.measure(original_frame)
+                # Çizim işlemini burada, ana thread'de yap
+                self.last_detections = (original_frame, detections, frame_idx, timestamp)
+                if not self.is_webcam:
+                    self.shown_frame_idx = frame_idx
+                with TRACER.span("draw", "ui", frame=frame_idx):
+                    annotated_frame = self.draw_annotations(original_frame, detections, h, w,
+                                                            frame_idx=frame_idx, timestamp=timestamp,
+                                                            analytics=analytics)
+                with TRACER.span("display", "ui", frame=frame_idx):
+                    self.update_ui(annotated_frame, frame_idx)
         except Exception as e:
             print(f"Queue işleme hatası: {str(e)}")
-        finally:
-            # 10ms sonra tekrar kontrol et
-            self.root.after(10, self.check_queue)
+        
+        self.apply_ui_state()
     
     def load_custom_models(self):
         """Özel modelleri yükle"""
@@ -433,7 +1713,7 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 self.custom_models.append(file_name)
             
             # Combobox'ı güncelle
-            all_models = ["yolov8n.pt", "yolov8s.pt", "yolov8m.pt", "yolov8l.pt", "yolov8x.pt"] + self.custom_models
+            all_models = DEFAULT_MODELS + self.custom_models
             self.model_combo['values'] = all_models
             
             # Yeni eklenen modeli seç
@@ -456,12 +1736,8 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         print(f"Confidence threshold değeri güncellendi: {self.conf_threshold:.2f}")
         
         # Eğer video durdurulmuşsa ve mevcut bir kare varsa, güncellenmiş değerlerle yeniden işle
-        if self.cap is not None and not self.is_playing and hasattr(self, 'current_processed_frame'):
+        if self.request_reprocess():
             self.status_label.config(text=f"Confidence threshold: {self.conf_threshold:.2f}, yeniden işleniyor...")
-            self.root.update()
-            processed_frame = self.process_frame(self.current_processed_frame)
-            self.update_ui(processed_frame, self.current_frame)
-            self.status_label.config(text=f"Confidence: {self.conf_threshold:.2f}, IOU: {self.iou_threshold:.2f}")
     
     def update_iou_threshold(self, value):
         """IOU threshold değerini güncelle"""
@@ -473,74 +1749,98 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         print(f"IOU threshold değeri güncellendi: {self.iou_threshold:.2f}")
         
         # Eğer video durdurulmuşsa ve mevcut bir kare varsa, güncellenmiş değerlerle yeniden işle
-        if self.cap is not None and not self.is_playing and hasattr(self, 'current_processed_frame'):
+        if self.request_reprocess():
             self.status_label.config(text=f"IOU threshold: {self.iou_threshold:.2f}, yeniden işleniyor...")
-            self.root.update()
-            processed_frame = self.process_frame(self.current_processed_frame)
-            self.update_ui(processed_frame, self.current_frame)
-            self.status_label.config(text=f"Confidence: {self.conf_threshold:.2f}, IOU: {self.iou_threshold:.2f}")
     
     def update_display_mode(self):
-        """Görüntüleme modunu güncelle"""
+        """Görüntüleme modunu güncelle; duraklatılmışsa kare önbellekteki sonuçlarla hemen yeniden çizilir"""
         self.display_mode = self.display_mode_var.get()
+        if not self.is_playing:
+            self.rerender_paused_frame()
     
-    def get_device(self):
-        """Kullanılacak cihazı belirle (MPS, CUDA veya CPU)"""
-        if self.force_cpu:
-            print("CPU kullanımı manuel olarak zorlandı.")
-            return "cpu"
+    def rerender_paused_frame(self):
+        """Son gösterilen kareyi modeli çalıştırmadan, önbellekteki tespitlerle yeniden çiz"""
+        if self.last_detections is None or self.simple_mode:
+            return
+        original_frame, detections, frame_idx, timestamp = self.last_detections
+        h, w = original_frame.shape[:2]
+        # Tampondan geri adımlanmış karede bölge analitiği geriye işletilmez
+        annotated_frame = self.draw_annotations(original_frame, detections, h, w,
+                                                frame_idx=frame_idx, timestamp=timestamp,
+                                                analytics=not self.capture_behind)
+        self.update_ui(annotated_frame, frame_idx)
+    
+    def request_reprocess(self):
+        """
+        Duraklatılmış kareyi güncel eşiklerle yeniden işleme isteği. Çıkarım arka plan
+        thread'inde yapılır; iş sürerken gelen istekler birleştirilir ve eskimiş sonuçlar
+        gösterilmeden atılır. İstek kabul edildiyse True döner.
+        """
+        if self.cap is None or self.is_playing or self.simple_mode or self.last_detections is None:
+            return False
+        with self.reprocess_cond:
+            self.reprocess_generation += 1
+            self.reprocess_pending = True
+            self.reprocess_cond.notify()
+        if self.reprocess_thread is None:
+            self.reprocess_thread = threading.Thread(target=self.reprocess_worker, name="Reprocess", daemon=True)
+            self.reprocess_thread.start()
+        return True
+    
+    def reprocess_worker(self):
+        """Sadece en yeni yeniden işleme isteğini çalıştırır"""
+        while True:
+            with self.reprocess_cond:
+                self.reprocess_cond.wait_for(lambda: self.reprocess_pending)
+                self.reprocess_pending = False
+                generation = self.reprocess_generation
+                frame, _, frame_idx, timestamp = self.last_detections
             
-        if torch.backends.mps.is_available():
             try:
-                # MPS kullanılabilirliğini daha detaylı kontrol et
-                test_tensor = torch.zeros(1).to("mps")
-                device = "mps"
-                print("Apple Silicon MPS (Metal Performance Shaders) kullanılıyor")
-                print("MPS cihazı hazır:", torch.backends.mps.is_built())
-                return "mps"
+                original_frame, detections = self.process_frame(frame, frame_idx)
             except Exception as e:
-                print(f"MPS kullanılabilir ancak bir hata oluştu: {e}")
-                print("CPU'ya düşüyor...")
-                return "cpu"
-        elif torch.cuda.is_available():
-            device = "cuda"
-            print("NVIDIA CUDA GPU kullanılıyor")
-            return "cuda"
-        else:
-            device = "cpu"
-            print("CPU kullanılıyor")
-            return "cpu"
+                print(f"Yeniden işleme hatası: {e}")
+                continue
+            
+            # Bu sırada daha yeni bir istek geldiyse veya oynatma başladıysa sonucu at
+            if generation != self.reprocess_generation or self.is_playing:
+                continue
+            item = (original_frame, detections, frame_idx, timestamp)
+            self.root.after(0, lambda item=item, g=generation: self.show_reprocessed(item, g))
+    
+    def show_reprocessed(self, item, generation):
+        """Yeniden işlenen kareyi göster (UI thread'i)"""
+        if generation != self.reprocess_generation or self.is_playing:
+            return
+        self.last_detections = item
+        self.rerender_paused_frame()
+        self.status_label.config(text=f"Confidence: {self.conf_threshold:.2f}, IOU: {self.iou_threshold:.2f}")
+    
+    def get_device(self):
+        """Kullanılacak cihazı belirle (MPS, CUDA veya CPU)"""
+        return select_device(self.force_cpu)
     
     def load_yolo_model(self, model_path):
         try:
             # status_label kullanılabilirliğini kontrol et
             if hasattr(self, 'status_label'):
-                self.status_label.config(text=f"Model yükleniyor: {model_path} ({self.device})")
+                self.status_label.config(text=f"Model yükleniyor: {model_path} ({self.device or 'otomatik'})")
                 self.root.update()  # UI'yi hemen güncelle
             
-            # Özel model yolunu kontrol et
-            if model_path in self.custom_models:
-                model_path = os.path.join(self.models_dir, model_path)
-                self.model = YOLO(model_path)
-            else:
-                self.model = YOLO(model_path)
-                
-            # Modeli seçilen cihaza taşı
-            if self.device != "cpu":
-                try:
-                    print(f"Model {self.device} cihazına taşınıyor...")
-                    self.model.to(self.device)
-                    # Model başarıyla GPU'ya taşındı
-                    print(f"Model başarıyla {self.device} cihazına taşındı!")
-                except Exception as e:
-                    print(f"Model {self.device} cihazına taşınırken hata: {e}")
-                    print("Güvenli mod: Model CPU'da kalacak")
-                    self.device = "cpu" # Cihazı CPU'ya çevir
+            # Özel modeller models dizininden, diğerleri ultralytics'ten yüklenir
+            self.model = self.engine.load_model(model_path)
+            self.device = self.engine.device
+            self.apply_tuning_profile()
                 
             print(f"{model_path} modeli başarıyla yüklendi. (Cihaz: {self.device})")
             
             if hasattr(self, 'status_label'):
-                self.status_label.config(text=f"{model_path} modeli başarıyla yüklendi. (Cihaz: {self.device})")
+                # Değerlendirme tablosunda ölçümü varsa hız/doğruluk özetini göster
+                row = load_eval_table().get(model_path)
+                if row is not None:
+                    self.status_label.config(text=format_eval_row(model_path, row))
+                else:
+                    self.status_label.config(text=f"{model_path} modeli başarıyla yüklendi. (Cihaz: {self.device})")
                 
             # Model yüklendiğinde Memory Bank'ı güncelle
             self.update_memory_bank(
@@ -558,6 +1858,39 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
     def on_model_change(self, event=None):
         """Model değiştiğinde"""
         self.load_yolo_model(self.model_var.get())
+        if self.cascade is not None:
+            self.toggle_cascade()  # Sınıf eşlemesi yeni küçük modele göre yeniden kurulur
+    
+    def toggle_cascade(self):
+        """Kaskad modunu aç/kapat; açıkken büyük modeli (yeniden) yükle"""
+        if not self.cascade_var.get():
+            self.cascade = None
+            self.status_label.config(text="Kaskad: Devre Dışı ✗")
+            return
+        if self.engine.model is None:
+            self.cascade_var.set(False)
+            messagebox.showinfo("Kaskad", "Önce bir model yükleyin.")
+            return
+        
+        large_name = self.cascade_model_var.get()
+        self.status_label.config(text=f"Kaskad büyük modeli yükleniyor: {large_name}")
+        self.root.update()
+        try:
+            large = self.cascade.large if self.cascade is not None and self.cascade.large.model_name == large_name \
+                else DetectionEngine(self.models_dir, device=self.device, force_cpu=self.force_cpu)
+            if large.model is None:
+                large.load_model(large_name)
+            with self.inference_lock:
+                self.cascade = ModelCascade(self.engine, large)
+        except Exception as e:
+            print(f"Kaskad modeli yüklenemedi: {e}")
+            messagebox.showerror("Kaskad Hatası", f"Büyük model yüklenemedi: {e}")
+            self.cascade_var.set(False)
+            self.cascade = None
+            return
+        self.status_label.config(text=f"Kaskad: {self.engine.model_name} → {large_name} ✓")
+        if not self.is_playing:
+            self.request_reprocess()
     
     def browse_video(self):
         """Video dosyası seçme diyalogu"""
@@ -567,9 +1900,13 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         )
         
         if video_path:
-            self.video_path = video_path
-            self.is_webcam = False # Dosya seçildiğinde webcam olmadığını belirt
-            self.load_video(video_path)
+            self.open_video_file(video_path)
+    
+    def open_video_file(self, video_path):
+        """Video dosyasını aç (dosya diyalogu veya komut satırından)"""
+        self.video_path = video_path
+        self.is_webcam = False # Dosya seçildiğinde webcam olmadığını belirt
+        self.load_video(video_path)
     
     def select_webcam_source(self):
         """Webcam kaynağı seçme"""
@@ -604,24 +1941,43 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         if self.cap is not None:
             self.stop_play_thread()
             self.cap.release()
+        self.stop_detection_recording()
+        self.stop_thumbnail_index()
+        self.motion_overlay.reset()
+        if self.miner is not None:
+            self.miner.set_source(source)
+        self.frame_history.clear()
+        self.shown_frame_idx = None
+        self.capture_behind = False
         
         self.status_label.config(text="Kaynak yükleniyor...")
         self.root.update()
         
-        self.cap = cv2.VideoCapture(source)
+        self.cap = cv2.VideoCapture(source) if self.is_webcam else self.open_capture(source)
         if not self.cap.isOpened():
             if self.is_webcam:
                 messagebox.showerror("Webcam Hatası", f"Webcam ID {source} açılamadı!")
                 self.status_label.config(text="Webcam açma hatası!")
-                print(f"DEBUG: Failed to open webcam ID {source}") # DEBUG
             else:
                 messagebox.showerror("Video Hatası", "Video dosyası açılamadı!")
                 self.status_label.config(text="Video yükleme hatası!")
             self.cap = None # Hata durumunda cap'i None yap
             return
         
+        self.video_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.apply_tuning_profile()  # Profil kaynak çözünürlüğüne bağlı
+        if self.engine.adaptive is not None:
+            self.engine.adaptive.budget = self.frame_budget()
+        self.zone_analyzer.reset()  # Yeni kaynakta açık bölge ziyaretleri taşınmamalı
+        
+        # Önceki videonun tespit deposu bu kaynağa ait değil
+        self.close_detection_store()
+        if self.review_mode and not self.is_webcam:
+            store_path = default_store_path(source)
+            if os.path.isdir(store_path):
+                self.open_detection_store(store_path)
+        
         if self.is_webcam:
-            print(f"DEBUG: Webcam ID {source} opened successfully: {self.cap.isOpened()}") # DEBUG
             self.frame_count = float('inf') # Webcam için sonsuz frame
             self.progress_slider.config(to=100, state=tk.DISABLED) # Slider'ı devre dışı bırak
             self.time_label_start.config(text="Canlı")
@@ -647,28 +2003,25 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             else:
                 self.time_label_end.config(text="N/A")
             video_name = os.path.basename(source)
-            self.status_label.config(text="Video hazır: {} ({} kare)".format(video_name, self.frame_count))
+            self.status_label.config(text="Video hazır: {} ({} kare, {})".format(
+                video_name, self.frame_count, capture_backend(self.cap)))
+            self.start_thumbnail_index(source)
 
         self.current_frame = 0
         
         # İlk kareyi göster (hem video hem webcam için)
         ret, frame = self.cap.read()
         if ret:
-            if self.is_webcam:
-                print(f"DEBUG: Initial webcam frame read success. Shape: {frame.shape}") # DEBUG
             self.display_frame(frame)
-        else:
-            if self.is_webcam:
-                print("DEBUG: Failed to read initial frame from webcam.") # DEBUG
+        elif self.is_webcam:
+            print("Webcam'den ilk kare okunamadı")
         
         self.play_btn.config(text="Oynat")
         self.is_playing = False
     
     def toggle_play(self):
         """Video oynatmayı başlat/durdur"""
-        print("DEBUG: toggle_play called") # DEBUG
         if self.cap is None:
-            print("DEBUG: toggle_play - self.cap is None, returning") # DEBUG
             return
         
         if self.is_playing:
@@ -676,42 +2029,50 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             self.play_btn.config(text="Oynat")
             self.is_playing = False
             self.status_label.config(text="Durduruldu")
-            print("DEBUG: toggle_play - Video stopped") # DEBUG
         else:
             self.is_playing = True
             self.play_btn.config(text="Duraklat")
             self.status_label.config(text="Oynatılıyor...")
-            print("DEBUG: toggle_play - Video playing") # DEBUG
+            
+            # Tampondan geri adım atıldıysa okuma konumunu gösterilen karenin ardına getir
+            if self.capture_behind and not self.is_webcam:
+                with self.seek_lock:
+                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame)
+                self.capture_behind = False
+            self.inference_stride.reset()
             
             # Frame queue'yu temizle
             with self.frame_queue.mutex:
                 self.frame_queue.queue.clear()
             
+            # Webcam için en yeni kareyi tutan yakalayıcıyı başlat
+            if self.is_webcam:
+                self.frame_grabber = LatestFrameGrabber(self.cap, stamp=True).start()
+            
             # Yeni bir thread oluştur
             self.stop_thread = False
-            self.play_thread = threading.Thread(target=self.play_video)
+            self.play_thread = threading.Thread(target=self.play_video, name="PlayVideo")
             self.play_thread.daemon = True
-            print("DEBUG: toggle_play - Starting play_thread") # DEBUG
             self.play_thread.start()
     
     def play_video(self):
-        """Videoyu ayrı bir thread'de oynat"""
-        print("DEBUG: play_video thread started") # DEBUG
+        """
+        Videoyu ayrı bir thread'de oynat. 1× üstü hızlarda gösterilen kareler arasındaki
+        kaynak kareler grab() ile geçilir (retrieve/renk dönüşümü yok) ve çıkarım, ölçülen
+        süresi kare bütçesine sığacak aralıkla yapılır; aradaki kareler son tespitlerle çizilir.
+        """
         fps = self.cap.get(cv2.CAP_PROP_FPS)
-        frame_time = 1.0 / fps if fps > 0 else 0.033  # Varsayılan ~30fps
         
         # Maksimum frame rate ile sınırlandır
         if MAX_FRAME_RATE > 0 and fps > MAX_FRAME_RATE:
-            target_frame_time = 1.0 / MAX_FRAME_RATE
             print(f"FPS {fps} -> {MAX_FRAME_RATE} olarak sınırlandırıldı (performans optimizasyonu)")
-        else:
-            target_frame_time = frame_time
+        stale_detections = None  # Çıkarım atlanan karelerde çizilecek son tespitler
+        status_counter = 0  # Durum satırı güncelleme sayacı
             
         frame_counter = 0  # Hata ayıklama için sayaç
         last_debug_time = time.time()  # Hata ayıklama için zaman
         
         while self.is_playing and not self.stop_thread:
-            print("DEBUG: play_video loop iteration") # DEBUG
             start_time = time.time()
             frame_counter += 1
             
@@ -721,14 +2082,22 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 last_debug_time = time.time()
                 frame_counter = 0  # Sayacı sıfırla
             
+            speed = 1.0 if self.is_webcam else self.playback_speed
+            step, target_frame_time = playback_step(fps, speed, MAX_FRAME_RATE)
+            
             try:
                 # Kilit kullanarak güvenli okuma
                 with self.seek_lock:
-                    ret, frame = self.cap.read()
-                    if self.is_webcam: # Debugging for webcam
-                        print(f"DEBUG: play_video cap.read() ret: {ret}") # DEBUG
-                        if ret:
-                            print(f"DEBUG: play_video webcam frame shape: {frame.shape}") # DEBUG
+                    with TRACER.span("decode", "playback"):
+                        if self.frame_grabber is not None:
+                            # Webcam: yakalayıcı thread'in tuttuğu en yeni kare (bayat tampon yok)
+                            ret, frame = self.frame_grabber.read(timeout=1.0)
+                        else:
+                            # Hızlı oynatma: atlanan kareler sadece çözülür, BGR'ye çevrilmez
+                            for _ in range(step - 1):
+                                if not self.cap.grab():
+                                    break
+                            ret, frame = self.cap.read()
 
                     if not ret:
                         if self.is_webcam:
@@ -747,42 +2116,69 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                     
                     if not self.is_webcam: # Webcam için POS_FRAMES güncellenmeyebilir/anlamsız olabilir
                         self.current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+                        frame_idx = self.current_frame - 1  # Okunan karenin 0 tabanlı numarası
+                        # PyAV/ffmpeg okuyucuları gerçek sunum zamanını (PTS) verir
+                        timestamp = getattr(self.cap, "last_pts", None)
+                        if timestamp is None:
+                            timestamp = self.frame_timestamp(frame_idx)
                     else:
                         # Webcam için frame sayısını kendimiz artıralım (gösterim amaçlı)
                         self.current_frame +=1 
+                        frame_idx = self.current_frame
+                        # Canlı kaynakta video zamanı yakalama anıdır
+                        timestamp = self.frame_grabber.last_timestamp if self.frame_grabber is not None else None
+                        if timestamp is None:
+                            timestamp = time.monotonic()
                 
                 # Basit modda direkt frame'i queue'ya ekle (YOLO işlemesini atla)
                 if self.simple_mode:
                     try:
-                        print("DEBUG: play_video - Simple mode: Attempting to put frame on queue") # DEBUG
                         frame_to_queue = frame.copy()  # Savunma amaçlı kopya
-                        # Değişiklik: (frame, None, None, current_frame) olarak ekle
-                        self.frame_queue.put((frame_to_queue, None, None, self.current_frame), block=True, timeout=1)
-                        print("DEBUG: play_video - Simple mode: Frame put on queue SUCCESS") # DEBUG
+                        if not self.is_webcam:
+                            # Basit modda da geri adım tampondan yapılabilsin
+                            self.frame_history.push(frame_idx, frame_to_queue, None, timestamp)
+                        item = (frame_to_queue, None, frame_idx, timestamp, True)
+                        if self.is_webcam:
+                            self.queue_latest(item)
+                        else:
+                            self.queue_frame(item)
                     except queue.Full:
-                        print("DEBUG: play_video - Simple mode: Frame queue FULL, frame dropped") # DEBUG
+                        TRACER.instant("frame_dropped", frame=self.current_frame)
                 else:
                     # Frame'i işle ve queue'ya ekle
                     try:
-                        print(f"DEBUG: play_video - YOLO mode: Processing frame {self.current_frame}") # DEBUG
-                        # Değişiklik: process_frame artık (original_frame, results, scale_ratios) döndürüyor
-                        original_frame, results, scale_ratios = self.process_frame(frame)
-                        print(f"DEBUG: play_video - YOLO mode: Frame {self.current_frame} processed. Attempting to put on queue") # DEBUG
-                        # Değişiklik: Kuyruğa (original_frame, results, scale_ratios, current_frame) ekle
-                        self.frame_queue.put((original_frame, results, scale_ratios, self.current_frame), block=True, timeout=1)
-                        print(f"DEBUG: play_video - YOLO mode: Processed frame {self.current_frame} put on queue SUCCESS") # DEBUG
+                        inferred = speed <= 1.0 or self.inference_stride.due()
+                        if inferred:
+                            # process_frame (original_frame, detections) döndürür; Results kuyruğa girmez
+                            infer_start = time.perf_counter()
+                            with TRACER.span("process_frame", "playback", frame=frame_idx):
+                                original_frame, detections = self.process_frame(frame, frame_idx)
+                            if speed > 1.0:
+                                self.inference_stride.observe(time.perf_counter() - infer_start, target_frame_time)
+                            self.record_detections(frame_idx, timestamp, detections)
+                            stale_detections = detections
+                        else:
+                            # Bütçe yetmiyor: bu karede çıkarım yok, son tespitler çizilir (kayda yazılmaz)
+                            self.inference_stride.skip()
+                            original_frame, detections = frame, stale_detections
+                        if not self.is_webcam:
+                            self.frame_history.push(frame_idx, original_frame, detections, timestamp)
+                        # Çıkarım yapılmayan karede bölge/ısı haritası/iz analitiği güncellenmez
+                        item = (original_frame, detections, frame_idx, timestamp, inferred)
+                        if self.is_webcam:
+                            self.queue_latest(item)
+                        else:
+                            self.queue_frame(item)
                     except queue.Full:
-                        print(f"DEBUG: play_video - YOLO mode: Frame queue FULL for frame {self.current_frame}, frame dropped") # DEBUG
+                        TRACER.instant("frame_dropped", frame=self.current_frame)
                     except Exception as e:
                         if str(e):  # Sadece boş olmayan hataları yazdır
                             print(f"Frame işleme hatası (in play_video): {str(e)}")
                         try:
-                            print(f"DEBUG: play_video - YOLO mode: Error processing, attempting to put ORIGINAL frame {self.current_frame} on queue") # DEBUG
-                            # Değişiklik: Hata durumunda da (frame, None, None, current_frame) ekle
-                            self.frame_queue.put((frame.copy(), None, None, self.current_frame), block=True, timeout=1)
-                            print(f"DEBUG: play_video - YOLO mode: Original frame {self.current_frame} put on queue after error SUCCESS") # DEBUG
+                            # Hata durumunda da kareyi tespitsiz ekle (analitiğe işlenmez)
+                            self.queue_frame((frame.copy(), None, frame_idx, timestamp, False))
                         except queue.Full:
-                            print(f"DEBUG: play_video - YOLO mode: Frame queue FULL for original frame {self.current_frame} after error, frame dropped") # DEBUG
+                            TRACER.instant("frame_dropped", frame=self.current_frame)
                 
                 # FPS hesaplama
                 frame_time = time.time() - start_time
@@ -797,14 +2193,21 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                     self.frame_times = []
                     self.last_fps_update = current_time
                 
-                # Slider konumunu güncelle (UI thread'indeki düşük öncelikli işlem)
+                # Slider konumunu güncelle (bir sonraki UI yenilemesinde birleştirilerek uygulanır)
                 # Sadece video dosyası için slider'ı güncelle
                 if not self.is_webcam:
-                    self.root.after_idle(lambda cf=self.current_frame: self.progress_slider.set(cf))
+                    self.set_ui_state(slider=self.current_frame)
                 
-                # İlerleme bilgisini güncelle
-                if self.current_frame % 10 == 0:  # Her 10 karede bir güncelle
+                # İlerleme bilgisini güncelle (gösterilen kare sayısına göre; hızlı oynatmada
+                # current_frame adım adım ilerlediğinden kare numarasına bağlanmaz)
+                status_counter += 1
+                if status_counter % 10 == 0:  # Her 10 karede bir güncelle
                     mode_text = "[BASİT MOD]" if self.simple_mode else ""
+                    if speed != 1.0:
+                        mode_text += f" [{format_speed(speed)}"
+                        if speed > 1.0 and self.inference_stride.stride > 1:
+                            mode_text += f", çıkarım 1/{self.inference_stride.stride}"
+                        mode_text += "]"
                     if self.is_webcam:
                         status_text = f"Oynatılıyor: Webcam - Kare: {self.current_frame} - FPS: {self.fps:.1f} {mode_text}"
                     elif fps > 0: # fps sıfır değilse
@@ -813,13 +2216,15 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                         status_text = f"Oynatılıyor: {self.format_time(current_time_val)}/{self.format_time(total_duration_val)} ({self.current_frame}) - FPS: {self.fps:.1f} {mode_text}"
                     else: # fps sıfırsa (bazı video formatları için)
                         status_text = f"Oynatılıyor: Kare: {self.current_frame} - FPS: {self.fps:.1f} {mode_text}"
-                    self.root.after_idle(lambda t=status_text: self.status_label.config(text=t))
+                    self.set_ui_state(status=status_text)
                 
                 # Kare hızını kontrol et ve sınırlandır (CPU kullanımını azaltmak için)
-                elapsed = time.time() - start_time
-                sleep_time = max(0.001, target_frame_time - elapsed)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # Webcam'de bekleme yok: yakalayıcı yeni kare gelene kadar zaten bloklar
+                if self.frame_grabber is None:
+                    elapsed = time.time() - start_time
+                    sleep_time = max(0.001, target_frame_time - elapsed)
+                    if sleep_time > 0:
+                        time.sleep(sleep_time)
                 
             except Exception as e:
                 if str(e):  # Sadece boş olmayan hataları yazdır
@@ -827,256 +2232,148 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 # Hata durumunda kısa bir süre bekleyip devam et
                 time.sleep(0.1)
     
-    def draw_annotations(self, frame, results, scale_ratios, original_h, original_w):
+    def draw_annotations(self, frame, detections, original_h, original_w, frame_idx=None, timestamp=None,
+                         analytics=True):
         """
-        Verilen bir frame üzerine YOLO sonuçlarını (kutular, etiketler) çizer.
-        Ayrıca kitlenme dörtgenini ve sayacını da yönetir.
+        Verilen bir frame üzerine tespitleri (kutular, etiketler) çizer.
+        detections bir Detections kaydıdır (orijinal kare koordinatlarında) veya None.
+        Ayrıca bölgeleri (kitlenme dörtgeni dahil) çizer ve bölge analitiğini
+        kare zaman damgasıyla günceller. analytics=False ise (tampondan geri adım)
+        bölge analitiği ve ısı haritası/iz birikimi güncellenmez, sadece çizilir.
         Bu fonksiyon ana UI thread'inde çalıştırılmalıdır.
         """
         annotated_frame = frame.copy()
-        scale_ratio_w, scale_ratio_h = (1.0, 1.0) if scale_ratios is None else scale_ratios
-
-        # YOLO sonuçlarını işle ve çiz
-        if results and results[0].boxes is not None:
-            box_count = len(results[0].boxes)
-            
-            # Görüntüleme moduna göre işlem yap
-            if self.display_mode == "normal":
-                try:
-                    boxes = results[0].boxes.xyxy.cpu().numpy()
-                    classes = results[0].boxes.cls.cpu().numpy().astype(int)
-                    conf_values = results[0].boxes.conf.cpu().numpy()
-                    color_palette = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
-                    class_names = results[0].names if hasattr(results[0], 'names') else {}
-
-                    for i, box in enumerate(boxes):
-                        x1, y1, x2, y2 = int(box[0] * scale_ratio_w), int(box[1] * scale_ratio_h), int(box[2] * scale_ratio_w), int(box[3] * scale_ratio_h)
-                        cls_id, conf = classes[i], conf_values[i]
-                        label = f"{class_names.get(cls_id, f'Class:{cls_id}')} {conf:.2f}"
-                        color = color_palette[cls_id % len(color_palette)]
-                        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-                        text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-                        cv2.rectangle(annotated_frame, (x1, y1-text_size[1]-5), (x1+text_size[0], y1), color, -1)
-                        cv2.putText(annotated_frame, label, (x1, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
-
-                        if self.enable_tracking and hasattr(results[0].boxes, 'id') and results[0].boxes.id is not None:
-                            track_ids = results[0].boxes.id.cpu().numpy().astype(int)
-                            id_text = f"ID:{track_ids[i]}"
-                            cv2.putText(annotated_frame, id_text, (x2-50, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
-                except Exception as plot_error:
-                    print(f"Plot hatası: {plot_error}")
-
-            elif self.display_mode in ("boxes_only", "confidence"):
-                try:
-                    boxes = results[0].boxes.xyxy.cpu().numpy()
-                    if scale_ratio_w != 1.0 or scale_ratio_h != 1.0:
-                        boxes[:, [0, 2]] *= scale_ratio_w
-                        boxes[:, [1, 3]] *= scale_ratio_h
-                    
-                    track_ids = results[0].boxes.id.cpu().numpy().astype(int) if self.enable_tracking and hasattr(results[0].boxes, 'id') and results[0].boxes.id is not None else None
-                    conf_values = results[0].boxes.conf.cpu().numpy() if self.display_mode == "confidence" else None
-
-                    for i, box in enumerate(boxes):
-                        x1, y1, x2, y2 = box.astype(int)
-                        color = self.get_color_for_id(track_ids[i]) if track_ids is not None else (0, 255, 0)
-                        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-                        label = ""
-                        if track_ids is not None:
-                            label += f"ID:{track_ids[i]} "
-                        if conf_values is not None:
-                            label += f"{conf_values[i]:.2f}"
-                        if label:
-                            cv2.putText(annotated_frame, label.strip(), (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-                except Exception as e:
-                    print(f"Kutu/Conf çizim hatası: {e}")
-
-            elif self.display_mode == "censored":
-                try:
-                    boxes = results[0].boxes.xyxy.cpu().numpy()
-                    if scale_ratio_w != 1.0 or scale_ratio_h != 1.0:
-                        boxes[:, [0, 2]] *= scale_ratio_w
-                        boxes[:, [1, 3]] *= scale_ratio_h
-                    
-                    for box in boxes:
-                        x1, y1, x2, y2 = box.astype(int)
-                        x1, y1 = max(0, x1), max(0, y1)
-                        x2, y2 = min(annotated_frame.shape[1]-1, x2), min(annotated_frame.shape[0]-1, y2)
-                        if x1 >= x2 or y1 >= y2: continue
-                        roi = annotated_frame[y1:y2, x1:x2]
-                        if roi.size > 0:
-                            blurred_roi = cv2.GaussianBlur(roi, (51, 51), 0)
-                            annotated_frame[y1:y2, x1:x2] = blurred_roi
-                except Exception as blur_error:
-                    print(f"Bulanıklaştırma hatası: {blur_error}")
-        
-        # Kitlenme dörtgeni mantığı
-        lock_left, lock_top = int(original_w * 0.25), int(original_h * 0.10)
-        lock_right, lock_bottom = int(original_w * 0.75), int(original_h * 0.90)
-        cv2.rectangle(annotated_frame, (lock_left, lock_top), (lock_right, lock_bottom), (0, 0, 255), 2)
-        
-        object_in_lock = False
-        if results and results[0].boxes is not None:
-            boxes = results[0].boxes.xyxy.cpu().numpy()
-            if scale_ratio_w != 1.0 or scale_ratio_h != 1.0:
-                boxes[:, [0, 2]] *= scale_ratio_w
-                boxes[:, [1, 3]] *= scale_ratio_h
-            for box in boxes:
-                cx, cy = (box[0] + box[2]) // 2, (box[1] + box[3]) // 2
-                if lock_left <= cx <= lock_right and lock_top <= cy <= lock_bottom:
-                    object_in_lock = True
-                    break
         
-        now = time.time()
-        if object_in_lock:
-            if self.locked_object_last_time is not None:
-                self.locked_object_timer += now - self.locked_object_last_time
-            self.locked_object_present = True
-            self.locked_object_show_text = f"Süre: {self.locked_object_timer:.1f} sn"
-        else:
-            self.locked_object_timer = 0.0
-            self.locked_object_present = False
-            self.locked_object_show_text = "Obje yok"
-        self.locked_object_last_time = now
+        d = detections if detections is not None else Detections.empty()
+        
+        # Isı haritası ve izler kutuların altında kalır; aynı kare ikinci kez biriktirilmez
+        if self.motion_overlay.enabled:
+            if analytics:
+                self.motion_overlay.update(d, frame.shape, self.current_frame if frame_idx is None else frame_idx,
+                                           self.tracking_active())
+            self.motion_overlay.render(annotated_frame)
+        
+        # Görüntüleme moduna göre kutuları, etiketleri veya bulanıklaştırmayı çiz
+        render_detections(annotated_frame, d.xyxy, d.cls, d.conf, d.track_id, d.names, self.display_mode,
+                          masks=d.masks, keypoints=d.keypoints)
+        if d.overlay:
+            # Eklentilerin çıkarım thread'inde hazırladığı çizim komutları
+            render_overlay(annotated_frame, d.overlay)
+        
+        # Bölge analitiği: tüm kutu merkezleri tüm bölgelere karşı tek seferde test edilir
+        self.zone_analyzer.draw(annotated_frame)
+        if analytics:
+            self.update_zones(d, original_h, original_w, frame_idx, timestamp)
 
         return annotated_frame
 
-    def process_frame(self, frame):
-        """Frame işleme: Sadece modeli çalıştırır, sonuçları ve orijinal kareyi döndürür. Çizim yapmaz."""
+    def tracking_active(self):
+        """Takip ID'leri geçerli mi (tespit deposu açıkken deponun takipli kaydedilip kaydedilmediği)"""
+        if self.overlay_store is not None:
+            return self.overlay_store.tracked
+        return self.enable_tracking
+
+    def update_zones(self, detections, original_h, original_w, frame_idx=None, timestamp=None):
+        """Bölge analitiğini karenin tespitleriyle güncelle (çizim yapmaz)"""
+        if frame_idx is None:
+            frame_idx = self.current_frame
+        if timestamp is None:
+            timestamp = self.frame_timestamp(frame_idx)
+        
+        centers = box_centers(detections.xyxy, original_w, original_h)
+        # Takip açıkken boş karede de ID dizisi (boş) verilir; ziyaretler sadece takip kapanınca topluca kapanır
+        self.zone_analyzer.update(centers, detections.track_id if self.tracking_active() else None, timestamp, frame_idx)
+        lines = self.zone_analyzer.status_lines()
+        self.locked_object_show_text = "\n".join(lines) if lines else "Obje yok"
+
+    def process_frame(self, frame, frame_idx=None):
+        """
+        Frame işleme: Sadece modeli çalıştırır, (orijinal kare, Detections) döndürür. Çizim yapmaz.
+        Ultralytics sonucu burada, çıkarım thread'inde kompakt kayda çevrilir; kuyruğa ve
+        önbelleklere sadece bu kayıt girer. Tespit kapalıysa kayıt yerine None döner.
+        Tespit deposu açıksa model yerine kare numarasıyla depodan O(1) okuma yapılır.
+        """
         # İşlenmemiş kareyi sakla, threshold değiştiğinde kullanmak için
         try:
             original_frame_for_display = frame.copy() # Görüntüleme için orijinal kareyi sakla
             self.current_processed_frame = frame.copy() # Yeniden işleme için orijinal kareyi sakla
             
-            # Ölçekleme oranlarını başlangıçta 1.0 olarak ayarla (ölçekleme yapılmadığında)
-            scale_ratio_w, scale_ratio_h = 1.0, 1.0
-            original_h, original_w = frame.shape[:2]
-            results = None
+            store = self.overlay_store
+            if store is not None:
+                idx = self.current_frame if frame_idx is None else frame_idx
+                with TRACER.span("store_lookup", "playback"):
+                    detections = store.frame(idx)
+                detections = self.run_plugins(original_frame_for_display, detections, idx)
+                self.mine_frame(original_frame_for_display, detections, idx)
+                return original_frame_for_display, detections
+            
+            detections = None
 
             if self.detect_var.get() and self.model is not None:
                 try:
                     # Hata ayıklama için
                     if self.debug_mode:
                         print(f"Frame boyutu: {frame.shape}")
+                        print(f"YOLO çalıştırılıyor - Model: {self.model_var.get()}, Conf: {self.conf_threshold:.2f}, IOU: {self.iou_threshold:.2f}, Cihaz: {self.device}")
                     
-                    # Kareyi 720p'ye yeniden boyutlandır (yüksek çözünürlüklü videolar için performans artışı)
-                    h, w = frame.shape[:2]
-                    target_h = 720
-                    if h > target_h:
-                        ratio = target_h / h
-                        target_w = int(w * ratio)
-                        # Hız için INTER_LINEAR kullan
-                        resized_frame = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
-                        if self.debug_mode:
-                            print(f"Frame boyutlandırıldı: {w}x{h} -> {target_w}x{target_h}")
-                        # Boyutlandırılmış kareyi kullan
-                        process_frame = resized_frame
-                        
-                        # Ölçekleme oranlarını hesapla (orijinal'den işlenen frame'e)
-                        scale_ratio_w = original_w / target_w
-                        scale_ratio_h = original_h / target_h
-                        
-                        if self.debug_mode:
-                            print(f"Ölçekleme oranları: W={scale_ratio_w:.2f}, H={scale_ratio_h:.2f}")
-                    else:
-                        # Zaten küçük boyuttaysa orijinal kareyi kullan
-                        process_frame = frame
-                    
-                    # MPS ile ilgili hataları yakalamak için önce CPU'da deneyelim
-                    if self.debug_mode:
-                        print(f"İşlem öncesi model cihazı: {self.device}")
-                    
-                    # YOLO ile nesne tespiti / takibi işlemini gerçekleştir
-                    t_start = time.time()
-                    
-                    # Model çalıştırma işlemini try/except bloğuna al
-                    try:
-                        # Eşik değerleri kullanım bilgisini yazdır
-                        if self.debug_mode:
-                            print(f"YOLO çalıştırılıyor - Model: {self.model_var.get()}, Conf: {self.conf_threshold:.2f}, IOU: {self.iou_threshold:.2f}, Cihaz: {self.device}")
-                        
-                        # Takip modu etkinse track() metodunu kullan, değilse predict() metodunu kullan
-                        if self.enable_tracking:
-                            # ByteTrack ile nesne takibi
-                            tracker_path = self.tracker_config_path if self.tracker_config_path else "bytetrack.yaml"
-                            try:
-                                # Güvenli tensor dönüşümleri için try-except bloğu ekle
-                                results = self.model.track(
-                                    process_frame, 
-                                    persist=True,  # Takip ID'lerini sonraki frameler için sakla
-                                    conf=self.conf_threshold, 
-                                    iou=self.iou_threshold,
-                                    tracker=tracker_path  # ByteTrack yapılandırması
-                                )
-                                if self.debug_mode:
-                                    print(f"ByteTrack kullanılıyor: {tracker_path}")
-                            except Exception as track_error:
-                                # ByteTrack hatası durumunda normal predict() metodunu kullan
-                                error_str = str(track_error)
-                                if error_str:
-                                    print(f"ByteTrack hatası, normal tespit kullanılıyor: {error_str}")
-                                else:
-                                    print("ByteTrack hatası, normal tespit kullanılıyor")
-                                
-                                # Hata durumunda takibi devre dışı bırak
-                                self.enable_tracking = False
-                                self.track_var.set(False)
-                                
-                                # Takip olmadan normal predict kullan
-                                results = self.model(process_frame, conf=self.conf_threshold, iou=self.iou_threshold)
+                    # Motor kareyi 720p'ye küçültür, takip/cihaz hatalarında normal tespite ve CPU'ya düşer
+                    with self.inference_lock:
+                        if self.cascade is not None:
+                            # Kaskad sonucu zaten orijinal koordinatlarda bir tespit kaydıdır
+                            with TRACER.span("cascade", "engine"):
+                                detections = self.cascade.infer(
+                                    frame, self.conf_threshold, self.iou_threshold, track=self.enable_tracking)
                         else:
-                            # Standart nesne tespiti (takip olmadan)
-                            results = self.model(process_frame, conf=self.conf_threshold, iou=self.iou_threshold)
-                        
-                        inference_time = time.time() - t_start
-                        
-                        if self.debug_mode:
-                            print(f"YOLO çıkarım süresi: {inference_time*1000:.1f} ms")
-                    except Exception as e:
-                        # Ana hata yakalama
-                        print(f"Model çalıştırma hatası: {str(e)}")
-                        # Hata durumunda CPU'ya geç
-                        self.device = 'cpu'
-                        if self.debug_mode:
-                            print("Model CPU'ya taşındı")
-                        
-                        # CPU'da tekrar dene
-                        try:
-                            t_start = time.time()
-                            # Takibi devre dışı bırak ve sadece tespit kullan
-                            self.enable_tracking = False
-                            self.track_var.set(False)
-                            
-                            # CPU'da model çalıştır
-                            results = self.model(process_frame, conf=self.conf_threshold, iou=self.iou_threshold)
-                            inference_time = time.time() - t_start
-                            
-                            if self.debug_mode:
-                                print(f"CPU'da YOLO çıkarım süresi: {inference_time*1000:.1f} ms")
-                        except Exception as cpu_error:
-                            print(f"CPU'da da hata oluştu: {str(cpu_error)}")
-                            # Bu durumda nesne tespitini devre dışı bırak
-                            self.detect_var.set(False)
-                            # returns original frame below
+                            results, scale_ratios = self.engine.infer(
+                                frame, self.conf_threshold, self.iou_threshold, track=self.enable_tracking)
+                    self.device = self.engine.device
+                    
+                    if self.enable_tracking and self.engine.tracking_failed:
+                        # Hata durumunda takibi devre dışı bırak
+                        self.enable_tracking = False
+                        self.track_var.set(False)
+                    if detections is None:
+                        # Tensörler tek seferde kopyalanır; Results nesnesi burada bırakılır
+                        with TRACER.span("postprocess", "engine"):
+                            detections = Detections.from_results(results, scale_ratios, track=self.enable_tracking)
                 
                 except Exception as e:
                     if str(e):  # Boş hata mesajlarını gösterme
-                        print(f"Genel bir hata oluştu: {str(e)}")
+                        print(f"CPU'da da hata oluştu: {str(e)}")
                     # Eğer sürekli hata alınıyorsa nesne tespitini kapat
                     if hasattr(self, 'detect_var'):
                         print("Nesne tespiti geçici olarak devre dışı bırakılıyor...")
                         self.detect_var.set(False)
             
-            return original_frame_for_display, results, (scale_ratio_w, scale_ratio_h)
+            detections = self.run_plugins(original_frame_for_display, detections, frame_idx)
+            self.mine_frame(original_frame_for_display, detections, frame_idx)
+            return original_frame_for_display, detections
             
         except Exception as e:
             # En son çare - herhangi bir hata durumunda orijinal frame'i ve boş sonuçları döndür
             print(f"Process frame'de kritik hata: {str(e)}")
-            return frame, None, (1.0, 1.0)
+            return frame, None
     
-    def update_ui(self, frame, current_frame):
-        """UI elemanlarını güncelle"""
+    def run_plugins(self, frame, detections, frame_idx=None):
+        """Eklenti kancalarını bu thread'de (çıkarım aşamasında) çalıştır; eklenti yoksa maliyetsiz"""
+        if not self.plugins.active:
+            return detections
+        idx = self.current_frame if frame_idx is None else frame_idx
+        with TRACER.span("plugins", "engine", frame=idx):
+            return self.plugins.run(frame, detections, idx, self.frame_timestamp(idx))
+    
+    def mine_frame(self, frame, detections, frame_idx=None):
+        """Örnek toplama açıksa karenin belirsiz tespitlerini yazma kuyruğuna at (beklemez)"""
+        miner = self.miner
+        if miner is None or detections is None:
+            return
+        idx = self.current_frame if frame_idx is None else frame_idx
+        with TRACER.span("mine", "engine", frame=idx):
+            miner.submit(frame, detections, idx, self.frame_timestamp(idx))
+    
+    def update_ui(self, frame, frame_idx):
+        """UI elemanlarını güncelle (frame_idx: gösterilen karenin 0 tabanlı numarası)"""
         try:
-            print(f"DEBUG: update_ui called. Frame shape: {frame.shape if frame is not None else 'None'}, Current Frame No: {current_frame}") # DEBUG
             # Null kontrol
             if frame is None:
                 print("Boş frame, UI güncelleme atlanıyor")
@@ -1087,6 +2384,12 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 print(f"Geçersiz frame boyutu: {frame.shape}")
                 return
                 
+            # Yayın: kare bir kez JPEG'e çevrilip tüm istemcilerle paylaşılır (burada beklenmez)
+            if self.stream_server is not None:
+                last = self.last_detections
+                detections = last[1] if last is not None and last[2] == frame_idx else None
+                self.stream_server.publish(frame, detections, frame_idx, self.frame_timestamp(frame_idx))
+            
             # OpenCV BGR formatını RGB'ye çevir
             rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             
@@ -1125,11 +2428,25 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 fps_text += " [BASİT MOD]"
             if self.force_cpu:
                 fps_text += " [CPU]"
+            if self.engine.adaptive is not None and not self.simple_mode:
+                fps_text += f" - imgsz: {self.engine.adaptive.imgsz}"
+            if self.cascade is not None and not self.simple_mode:
+                fps_text += f" - Kaskad: %{self.cascade.escalation_rate*100:.0f}"
+            if self.plugins.active and not self.simple_mode:
+                fps_text += f" - Eklentiler: {self.plugins.last_cost*1000:.1f} ms"
+            if self.miner is not None and not self.simple_mode:
+                fps_text += f" - Örnek: {self.miner.saved_crops}"
+            if self.is_webcam and self.pipeline_latency is not None:
+                fps_text += f" - Gecikme: {self.pipeline_latency*1000:.0f} ms"
+            if self.latency_probe is not None:
+                probe_stats = self.latency_probe.stats()
+                if probe_stats is not None:
+                    fps_text += f" - G2G: {probe_stats[0]:.0f} ms (p95 {probe_stats[1]:.0f})"
                 
             self.canvas.create_text(10, 10, text=fps_text, fill="white", 
                                 font=('Arial', 12, 'bold'), anchor=tk.NW)
             
-            # --- Kitlenme dörtgeni sayaç/metin ekle ---
+            # --- Bölge bekleme süreleri ---
             lock_text = getattr(self, 'locked_object_show_text', "Obje yok")
             self.canvas.create_text(10, 40, text=lock_text, fill="yellow", font=('Arial', 16, 'bold'), anchor=tk.NW)
             # --- ---
@@ -1139,11 +2456,12 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             y_position = (canvas_height - new_height) // 2
             self.canvas.create_image(x_position, y_position, anchor=tk.NW, image=self.photo)
             
-            # Zaman etiketini güncelle
+            # Zaman etiketini güncelle (metin değişmediyse widget'a dokunma)
             if self.cap is not None:
                 fps = self.cap.get(cv2.CAP_PROP_FPS)
-                current_time = current_frame / fps
-                self.time_label_start.config(text=self.format_time(current_time))
+                time_text = self.format_time(frame_idx / fps)
+                if self.time_label_start.cget("text") != time_text:
+                    self.time_label_start.config(text=time_text)
                 
         except Exception as e:
             print(f"UI güncelleme hatası: {str(e)}")
@@ -1163,6 +2481,11 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             # Frame queue'yu temizle
             with self.frame_queue.mutex:
                 self.frame_queue.queue.clear()
+        
+        # Webcam yakalayıcısını durdur (duraklatılmışken kamera boşuna okunmasın)
+        if self.frame_grabber is not None:
+            self.frame_grabber.stop()
+            self.frame_grabber = None
     
     def display_frame(self, frame):
         """Tek bir frame gösterme (oynatma dışındaki durumlar için)"""
@@ -1171,9 +2494,14 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             self.update_ui(frame, self.current_frame)
         else:
             # Değişiklik: Yeni akışa göre (işle, çiz, göster)
-            original_frame, results, scale_ratios = self.process_frame(frame)
+            original_frame, detections = self.process_frame(frame)
+            with self.reprocess_cond:
+                self.reprocess_generation += 1  # Önceki kare için süren yeniden işleme sonucu atılsın
+            self.last_detections = (original_frame, detections, self.current_frame, None)
+            self.shown_frame_idx = self.current_frame
             h, w = original_frame.shape[:2]
-            annotated_frame = self.draw_annotations(original_frame, results, scale_ratios, h, w)
+            annotated_frame = self.draw_annotations(original_frame, detections, h, w,
+                                                    frame_idx=self.current_frame)
             self.update_ui(annotated_frame, self.current_frame)
         
         # Eşik değerlerini durum çubuğunda göster
@@ -1262,9 +2590,13 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 self.time_label_start.config(text=self.format_time(current_time))
             else:
                  self.time_label_start.config(text=f"Kare: {int(value)}")
+            # Sürüklerken önizleme (çubuk odakta ve sol tuş basılıyken)
+            if self.preview_window is not None and self.preview_window.winfo_viewable():
+                self.show_seek_preview(value)
     
     def slider_released(self, event):
         """İlerleme çubuğu bırakıldığında"""
+        self.hide_seek_preview()
         if self.cap is None or self.is_webcam: # Webcam için bu fonksiyonu atla
             return
             
@@ -1283,7 +2615,7 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 # Video dosyasını kapat ve yeniden aç
                 video_path = self.video_path
                 self.cap.release()
-                self.cap = cv2.VideoCapture(video_path)
+                self.cap = self.open_capture(video_path)
                 
                 # Pozisyonu ayarla
                 self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
@@ -1324,9 +2656,10 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         video_path = self.video_path
         with self.seek_lock:
             self.cap.release()
-            self.cap = cv2.VideoCapture(video_path)
+            self.cap = self.open_capture(video_path)
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
             self.current_frame = position
+            self.capture_behind = False
             
             # Güncel kareyi oku
             ret, frame = self.cap.read()
@@ -1356,6 +2689,7 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             with self.seek_lock:
                 self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
                 self.current_frame = target_frame
+                self.capture_behind = False
                 ret, frame = self.cap.read()
                 success = False
                 if ret:
@@ -1379,6 +2713,54 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
         if was_playing:
             self.root.after(100, self.toggle_play)
     
+    def set_playback_speed(self, speed):
+        """Oynatma hızını ayarla; oynatma sürüyorsa bir sonraki karede geçerli olur"""
+        self.playback_speed = speed
+        self.speed_var.set(format_speed(speed))
+        self.inference_stride.reset()
+        text = f"Oynatma hızı: {format_speed(speed)}"
+        if speed > 1.0:
+            text += " (atlanan kareler sadece çözülür, çıkarım bütçeye göre seyreltilir)"
+        self.status_label.config(text=text)
+    
+    def change_playback_speed(self, event, direction):
+        """[ / ] kısayolu: bir önceki/sonraki hız basamağı"""
+        if self.typing(event):
+            return
+        speeds = PLAYBACK_SPEEDS
+        current = min(range(len(speeds)), key=lambda i: abs(speeds[i] - self.playback_speed))
+        self.set_playback_speed(speeds[min(max(0, current + direction), len(speeds) - 1)])
+    
+    def step_frame(self, direction):
+        """
+        Tek kare geri/ileri. Son çözülen kareler tampondaysa video yeniden açılmadan ve model
+        çalıştırılmadan tampondan gösterilir (hızlı oynatmada atlanmış kareler tamponda yoktur,
+        en yakın tamponlanmış kareye gidilir). Tampon dışında normal atlamaya düşülür.
+        """
+        if self.cap is None or self.is_webcam:
+            return
+        if self.is_playing:
+            self.toggle_play()  # Adımlar duraklatılmış videoda yapılır
+        
+        ref = self.shown_frame_idx if self.shown_frame_idx is not None else self.current_frame
+        item = self.frame_history.before(ref) if direction < 0 else self.frame_history.after(ref)
+        if item is None:
+            # ref gösterilen karedir; current_frame (POS) zaten bir sonrasını gösterebilir
+            self.seek_to_frame(max(0, ref - 1) if direction < 0 else ref + 1)
+            return
+        
+        frame_idx, frame, detections, timestamp = item
+        h, w = frame.shape[:2]
+        self.last_detections = (frame, detections, frame_idx, timestamp)
+        self.shown_frame_idx = frame_idx
+        self.current_frame = frame_idx + 1  # Oynatma gösterilen karenin ardından sürer
+        self.capture_behind = True
+        annotated_frame = self.draw_annotations(frame, detections, h, w, frame_idx=frame_idx,
+                                                timestamp=timestamp, analytics=False)
+        self.update_ui(annotated_frame, frame_idx)
+        self.progress_slider.set(self.current_frame)
+        self.status_label.config(text=f"Kare {frame_idx} (tampondan, {len(self.frame_history)} kare)")
+    
     def format_time(self, seconds):
         """Saniye değerini MM:SS formatına çevir"""
         if seconds == float('inf') or seconds < 0:
@@ -1390,6 +2772,24 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
     def close_app(self):
         """Uygulama kapatılırken temizlik"""
         self.stop_play_thread()
+        if self.exporter is not None and self.exporter.is_alive():
+            self.exporter.cancel()
+            self.exporter.join(5.0)
+        self.stop_detection_recording()
+        self.stop_thumbnail_index()
+        self.stop_stream_server()
+        self.stop_crop_miner(wait=True)
+        self.plugins.close()
+        self.clip_job_cancel.set()
+        self.journal.close()
+        if self.trace_path and TRACER.enabled:
+            TRACER.stop()
+            print(f"İz kaydedildi: {self.trace_path} ({TRACER.save(self.trace_path)} olay)")
+        if self.profiler is not None and self.profiler.running:
+            self.profiler.stop()
+            if self.trace_path:
+                folded = os.path.splitext(self.trace_path)[0] + ".folded"
+                print(f"Profil kaydedildi: {folded} ({self.profiler.dump_folded(folded)} örnek)")
         if self.cap is not None:
             self.cap.release()
             self.cap = None # cap'i None olarak ayarla
@@ -1412,6 +2812,22 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             # Dosya bulunamadıysa None döndür, varsayılan ayarlar kullanılacak
             return None
             
+    def frame_budget(self):
+        """Kare başına çıkarım bütçesi (sn): kaynak FPS'i, MAX_FRAME_RATE ile sınırlı"""
+        fps = self.video_fps if self.video_fps and self.video_fps > 0 else 30.0
+        if MAX_FRAME_RATE > 0:
+            fps = min(fps, MAX_FRAME_RATE)
+        return 1.0 / fps
+    
+    def toggle_adaptive_resolution(self):
+        """Uyarlamalı çözünürlüğü aç/kapat (başlangıç basamağı mevcut imgsz)"""
+        if self.adaptive_var.get():
+            self.engine.adaptive = AdaptiveResolution(self.frame_budget(), start=self.engine.imgsz or 640)
+            self.status_label.config(text=f"Uyarlamalı çözünürlük: Etkin ✓ (bütçe {self.frame_budget()*1000:.0f} ms)")
+        else:
+            self.engine.adaptive = None
+            self.status_label.config(text="Uyarlamalı çözünürlük: Devre Dışı ✗")
+    
     def toggle_tracking(self):
         """Nesne takip özelliğini aç/kapat"""
         # Takibi etkinleştir veya devre dışı bırak
@@ -1425,17 +2841,12 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
                 self.toggle_detection()
                 
             # Takip özelliği için bellek optimizasyonu
-            if torch.cuda.is_available():
-                # CUDA belleğini temizle
-                torch.cuda.empty_cache()
-            elif hasattr(torch, 'mps') and torch.backends.mps.is_available():
-                # MPS optimizasyonu için belleği serbest bırak
-                import gc
-                gc.collect()
+            empty_device_cache()
                 
             # Takip yapılandırmasını zorla yeniden yükle
             try:
                 self.tracker_config_path = self.get_tracker_config_path()
+                self.engine.tracker_config_path = self.tracker_config_path or "bytetrack.yaml"
                 if self.tracker_config_path and os.path.exists(self.tracker_config_path):
                     print(f"ByteTrack yapılandırması yüklendi: {self.tracker_config_path}")
                     # Yapılandırma dosyasını oku
@@ -1451,10 +2862,7 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
             
             # Takip devre dışı bırakıldığında belleği temizle
             try:
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                empty_device_cache()
             except Exception:
                 pass
         
@@ -1464,27 +2872,122 @@ CenkerVision, gelişmiş nesne takip ve analiz yeteneklerine sahip bir bilgisaya
 
     def get_color_for_id(self, track_id):
         """Takip ID'si için renkli bir renk döndür"""
-        # Her ID için farklı bir renk döndür (basit hash fonksiyonu ile)
-        colors = [
-            (0, 255, 0),    # Yeşil
-            (255, 0, 0),    # Mavi
-            (0, 0, 255),    # Kırmızı
-            (255, 255, 0),  # Camgöbeği
-            (255, 0, 255),  # Mor
-            (0, 255, 255),  # Sarı
-            (128, 0, 0),    # Koyu mavi
-            (0, 128, 0),    # Koyu yeşil
-            (0, 0, 128),    # Koyu kırmızı
-            (128, 128, 0),  # Koyu camgöbeği
-            (128, 0, 128),  # Koyu mor
-            (0, 128, 128)   # Koyu sarı
-        ]
-        return colors[track_id % len(colors)]
+        return color_for_id(track_id)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="CenkerVision - YOLO tabanlı video oynatıcı")
+    parser.add_argument("video", nargs="?", help="Açılışta yüklenecek video dosyası")
+    parser.add_argument("--detections", help="Overlay olarak oynatılacak tespit deposu (.cvdet)")
+    parser.add_argument("--review", action="store_true",
+                        help="İnceleme modu: model/torch yüklenmez, tespitler depodan çizilir")
+    
+    export_group = parser.add_argument_group("başsız dışa aktarma")
+    export_group.add_argument("--export", metavar="ÇIKTI", help="Açıklamalı videoyu arayüz açmadan bu dosyaya yaz")
+    export_group.add_argument("--model", default="yolov8n.pt", help="YOLO modeli (varsayılan: yolov8n.pt)")
+    export_group.add_argument("--cascade", metavar="BÜYÜK_MODEL",
+                              help="Kaskad: --model her karede, bu model sadece belirsiz bölgelerde çalışır")
+    export_group.add_argument("--conf", type=float, default=0.25, help="Confidence threshold (0-1)")
+    export_group.add_argument("--iou", type=float, default=0.45, help="IOU threshold (0-1)")
+    export_group.add_argument("--track", action="store_true", help="ByteTrack takibini etkinleştir")
+    export_group.add_argument("--mode", choices=DISPLAY_MODES, default="normal", help="Görüntüleme modu")
+    export_group.add_argument("--start", type=int, default=0, help="Başlangıç karesi")
+    export_group.add_argument("--end", type=int, default=None, help="Bitiş karesi (hariç)")
+    export_group.add_argument("--ffmpeg", action="store_true", help="Yerel ffmpeg ile H.264 kodla")
+    export_group.add_argument("--heatmap", action="store_true",
+                              help="Isı haritası overlay'i çiz, sonda <ÇIKTI>_heatmap.png/.npy yaz")
+    export_group.add_argument("--trails", action="store_true",
+                              help="Takip izlerini çiz (--track ile), sonda <ÇIKTI>_trails.npz yaz")
+    export_group.add_argument("--cpu", action="store_true", help="CPU kullanımını zorla")
+    ingest_group = parser.add_argument_group("toplu işleme (--model, --conf, --iou, --track, --mode, --ffmpeg, --cpu kullanılır)")
+    ingest_group.add_argument("--ingest", metavar="KLASÖR", help="Klasördeki videoları süreç havuzuyla toplu işle")
+    ingest_group.add_argument("--output", metavar="KLASÖR", help="Çıktı klasörü (varsayılan: <KLASÖR>/cenkervision)")
+    ingest_group.add_argument("--watch", action="store_true", help="Klasörü izle, yeni gelen videoları da işle")
+    ingest_group.add_argument("--workers", type=int, default=2, help="Süreç sayısı (varsayılan: 2)")
+    ingest_group.add_argument("--threads-per-worker", type=int, default=None,
+                              help="Süreç başına torch thread sınırı (varsayılan: çekirdek / süreç)")
+    ingest_group.add_argument("--batch", type=int, default=None, help="Toplu çıkarım boyutu (takipsiz)")
+    ingest_group.add_argument("--export-videos", action="store_true", help="Her video için açıklamalı video da yaz")
+    eval_group = parser.add_argument_group("hız/doğruluk değerlendirmesi")
+    eval_group.add_argument("--evaluate", metavar="KLASÖR",
+                            help="Modelleri etiketli klipler üzerinde ölç ve Pareto tablosunu kaydet")
+    eval_group.add_argument("--eval-models", metavar="MODELLER",
+                            help="Virgülle ayrılmış model listesi (varsayılan: tüm yerleşik ve özel modeller)")
+    parser.add_argument("--autotune", action="store_true",
+                        help="--model için bu makinede en iyi ayarları videoyla ölç ve profili kaydet")
+    decode_group = parser.add_argument_group("kod çözme")
+    decode_group.add_argument("--decoder", choices=DECODE_BACKENDS + ("auto",), default="opencv",
+                              help="Video dosyaları için kod çözücü (varsayılan: opencv, açılamazsa opencv)")
+    decode_group.add_argument("--decode-scale", action="store_true",
+                              help=f"Kareleri çözücüde {PROCESS_HEIGHT}p'ye küçült (pyav/ffmpeg)")
+    parser.add_argument("--trace", nargs="?", const="", metavar="DOSYA",
+                        help="Boru hattı izini kaydet; kapanışta Chrome/Perfetto JSON olarak yazılır")
+    parser.add_argument("--profile", action="store_true",
+                        help="Örnekleyici profili başlat (--trace ile kapanışta .folded flamegraph da yazılır)")
+    parser.add_argument("--serve", nargs="?", const="", metavar="[HOST:]PORT",
+                        help=f"Açıklamalı görüntüyü MJPEG/HTTP olarak yayınla (varsayılan 0.0.0.0:{STREAM_PORT}; "
+                             "--export ile dışa aktarılan kareler yayınlanır)")
+    parser.add_argument("--plugins", default=PLUGIN_DIR, metavar="KLASÖR",
+                        help="Eklenti klasörü (varsayılan: plugins/)")
+    parser.add_argument("--plugin-budget", type=float, default=PLUGIN_BUDGET_MS, metavar="MS",
+                        help=f"Kare başına eklenti süre bütçesi (varsayılan: {PLUGIN_BUDGET_MS:g} ms)")
+    mine_group = parser.add_argument_group("örnek toplama (veri seti)")
+    mine_group.add_argument("--mine", nargs="?", const="", metavar="KLASÖR",
+                            help="Belirsiz tespitlerin kare/kesitlerini YOLO etiketleriyle kaydet "
+                                 "(varsayılan: <video>_mined; --export ile dışa aktarırken toplanır)")
+    mine_group.add_argument("--mine-band", type=parse_band, default=MINE_CONF_BAND, metavar="ALT:ÜST",
+                            help="Örneklenecek güven aralığı (varsayılan: 0.25:0.6)")
+    mine_group.add_argument("--mine-classes", type=lambda text: text.split(","), metavar="SINIFLAR",
+                            help="Sadece bu sınıflar (virgülle ayrılmış ad veya numara)")
+    mine_group.add_argument("--mine-rate", type=float, default=MINE_CLASS_RATE, metavar="N",
+                            help=f"Sınıf başına saniyede en fazla kesit, video zamanı (varsayılan: {MINE_CLASS_RATE:g})")
+    mine_group.add_argument("--mine-format", choices=MINE_FORMATS, default="jpg", help="Görüntü biçimi")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Olay günlüğünü ve Memory Bank yazmalarını kapat (CENKERVISION_NO_JOURNAL=1 ile de)")
+    args = parser.parse_args()
+    
+    if args.autotune:
+        if not args.video:
+            parser.error("--autotune için örnek bir video dosyası gerekli")
+        models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+        sys.exit(run_autotune_cli(args, models_dir))
+    
+    if args.evaluate:
+        models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+        sys.exit(run_eval_cli(args, models_dir))
+    
+    if args.ingest:
+        models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+        sys.exit(run_ingest_cli(args, models_dir))
+    
+    if args.export:
+        if not args.video:
+            parser.error("--export için bir video dosyası gerekli")
+        models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+        zones = None
+        if os.path.exists(default_zones_path()):
+            zones = load_zones(default_zones_path())
+        sys.exit(run_export_cli(args, models_dir, zones))
+    
     root = tk.Tk()
-    app = CenkerVision(root)
+    trace_path = args.trace
+    if trace_path == "":
+        trace_path = timestamped_path("cenkervision_trace", ".json")
+    app = CenkerVision(root, review_mode=args.review, journal=not args.no_journal,
+                       trace_path=trace_path, profile=args.profile,
+                       decoder=args.decoder, decode_scale=args.decode_scale, serve=args.serve,
+                       plugins_dir=args.plugins, plugin_budget_ms=args.plugin_budget,
+                       mine=default_mine_dir(args.video) if args.mine == "" and args.video else args.mine,
+                       mine_options=dict(band=args.mine_band, classes=args.mine_classes, rate=args.mine_rate,
+                                         image_format=args.mine_format))
+    
+    if args.video:
+        def open_sources():
+            app.open_video_file(args.video)
+            if args.detections:
+                app.open_detection_store(args.detections)
+        root.after(200, open_sources)
+    
     root.mainloop()
 
 
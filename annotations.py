@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Tespit çizimi
+Görüntüleme modlarına göre kutu, etiket ve bulanıklaştırma çizimi; segmentasyon
+maskeleri ve poz iskeletleri nesne başına döngü olmadan, vektörel olarak çizilir.
+UI'dan bağımsızdır; oynatıcı, dışa aktarma ve diğer başsız (headless) işler
+aynı fonksiyonları kullanır.
+"""
+
+import cv2
+import numpy as np
+
+DISPLAY_MODES = ("normal", "boxes_only", "confidence", "censored")
+
+# Sınıf başına renkler (normal mod)
+CLASS_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
+
+# Takip ID'si başına renkler
+ID_COLORS = [
+    (0, 255, 0),    # Yeşil
+    (255, 0, 0),    # Mavi
+    (0, 0, 255),    # Kırmızı
+    (255, 255, 0),  # Camgöbeği
+    (255, 0, 255),  # Mor
+    (0, 255, 255),  # Sarı
+    (128, 0, 0),    # Koyu mavi
+    (0, 128, 0),    # Koyu yeşil
+    (0, 0, 128),    # Koyu kırmızı
+    (128, 128, 0),  # Koyu camgöbeği
+    (128, 0, 128),  # Koyu mor
+    (0, 128, 128)   # Koyu sarı
+]
+
+MASK_ALPHA = 0.45  # Maske renginin saydamlığı
+KEYPOINT_CONF = 0.5  # Bu güvenin altındaki poz noktaları çizilmez
+CENSOR_KERNEL = (51, 51)  # Sansürlü mod bulanıklaştırma çekirdeği
+
+# COCO 17 noktalı iskelet: (renk, uzuvlar) - her grup tek çizim çağrısıyla çizilir
+SKELETON_GROUPS = (
+    ((255, 128, 0), ((5, 7), (7, 9), (6, 8), (8, 10))),  # Kollar
+    ((51, 153, 255), ((11, 13), (13, 15), (12, 14), (14, 16))),  # Bacaklar
+    ((0, 255, 0), ((5, 6), (5, 11), (6, 12), (11, 12), (0, 1), (0, 2), (1, 3), (2, 4), (3, 5), (4, 6))),  # Gövde, baş
+)
+KEYPOINT_COLOR = (0, 0, 255)
+
+
+def color_for_id(track_id):
+    """Takip ID'si için renkli bir renk döndür"""
+    return ID_COLORS[track_id % len(ID_COLORS)]
+
+
+def mask_labels(masks, boxes, frame_shape, order=None):
+    """
+    Örnek maskelerini kutuların birleşim bölgesinde tek bir düşük çözünürlüklü etiket haritasına
+    indirger: her piksel onu kaplayan son örneğin (order sırasına göre) 1 tabanlı sırasını alır
+    (0: arka plan). (etiketler, karedeki (x1, y1, x2, y2) bölgesi) veya (None, None) döndürür.
+    """
+    h, w = frame_shape[:2]
+    mh, mw = masks.shape[1:]
+    x1, y1 = max(0, int(boxes[:, 0].min())), max(0, int(boxes[:, 1].min()))
+    x2, y2 = min(w, int(np.ceil(boxes[:, 2].max()))), min(h, int(np.ceil(boxes[:, 3].max())))
+    sx, sy = mw / w, mh / h
+    mx1, my1 = int(x1 * sx), int(y1 * sy)
+    mx2, my2 = min(mw, int(np.ceil(x2 * sx))), min(mh, int(np.ceil(y2 * sy)))
+    # Maske hücreleri kare piksellerine tam oturmayabilir; hücrelerin kapladığı bölge döner
+    fx1, fy1 = int(mx1 / sx), int(my1 / sy)
+    fx2, fy2 = min(w, int(round(mx2 / sx))), min(h, int(round(my2 / sy)))
+    if mx1 >= mx2 or my1 >= my2 or fx1 >= fx2 or fy1 >= fy2:
+        return None, None
+
+    # Sıra * maske'nin maksimumu = son kaplayan örnek (tek geçiş, uint8; en fazla 255 örnek)
+    rank = np.zeros(len(masks), dtype=np.uint8)
+    order = np.arange(len(masks)) if order is None else np.asarray(order)
+    order = order[-255:]
+    rank[order] = np.arange(1, len(order) + 1, dtype=np.uint8)
+    labels = np.multiply(masks[:, my1:my2, mx1:mx2], rank[:, None, None]).max(axis=0)
+    return labels, (fx1, fy1, fx2, fy2)
+
+
+def render_masks(frame, masks, boxes, colors, order=None, alpha=MASK_ALPHA):
+    """
+    Tüm örnek maskelerini renk tablosuyla tek geçişte renklendirip kareyle harmanla (yerinde).
+    Renklendirme maske çözünürlüğünde yapılır; kare çözünürlüğüne sadece renkli harita ve
+    etiketler birer kez büyütülür. colors: (N, 3) örnek renkleri; order verilirse sonraki
+    örnekler öncekilerin üstüne çizilir.
+    """
+    labels, roi = mask_labels(masks, boxes, frame.shape, order)
+    if labels is None:
+        return frame
+    order = np.arange(len(masks)) if order is None else np.asarray(order)[-255:]
+    lut = np.zeros((len(order) + 1, 3), dtype=np.uint8)
+    lut[1:] = np.asarray(colors, dtype=np.uint8)[order]
+    x1, y1, x2, y2 = roi
+    size = (x2 - x1, y2 - y1)
+    overlay = cv2.resize(np.take(lut, labels, axis=0), size, interpolation=cv2.INTER_NEAREST)
+    labels = cv2.resize(labels, size, interpolation=cv2.INTER_NEAREST)
+    region = frame[y1:y2, x1:x2]
+    blended = cv2.addWeighted(region, 1.0 - alpha, overlay, alpha, 0)
+    region[...] = cv2.copyTo(blended, labels, region)
+    return frame
+
+
+def censor_masks(frame, masks, boxes):
+    """
+    Maskelerin kapladığı pikselleri bulanıklaştır. Birleşim bölgesi tek seferde, 1/4 ölçekte
+    bulanıklaştırılıp büyütülür (tam çözünürlükte 51x51 çekirdekle aynı görünüm, çok daha ucuz).
+    """
+    labels, roi = mask_labels(masks, boxes, frame.shape)
+    if labels is None:
+        return frame
+    x1, y1, x2, y2 = roi
+    size = (x2 - x1, y2 - y1)
+    labels = cv2.resize(labels, size, interpolation=cv2.INTER_NEAREST)
+    region = frame[y1:y2, x1:x2]
+    small = cv2.resize(region, (max(1, size[0] // 4), max(1, size[1] // 4)), interpolation=cv2.INTER_AREA)
+    small = cv2.GaussianBlur(small, (CENSOR_KERNEL[0] // 4 | 1, CENSOR_KERNEL[1] // 4 | 1), 0)
+    blurred = cv2.resize(small, size, interpolation=cv2.INTER_LINEAR)
+    region[...] = cv2.copyTo(blurred, labels, region)
+    return frame
+
+
+def render_keypoints(frame, keypoints, min_conf=KEYPOINT_CONF, radius=3):
+    """
+    Poz noktalarını ve (COCO 17 noktalı modellerde) iskeleti çiz. Tüm nesnelerin uzuvları
+    renk grubu başına tek polylines çağrısıyla, noktalar da tek çağrıyla çizilir.
+    """
+    xy = np.round(keypoints[..., :2]).astype(np.int32)
+    visible = keypoints[..., 2] >= min_conf
+    if keypoints.shape[1] == 17:
+        for color, limbs in SKELETON_GROUPS:
+            a, b = np.asarray(limbs).T
+            valid = visible[:, a] & visible[:, b]
+            if valid.any():
+                segments = np.stack([xy[:, a][valid], xy[:, b][valid]], axis=1)
+                cv2.polylines(frame, list(segments), False, color, 2, cv2.LINE_AA)
+    points = xy[visible]
+    if len(points):
+        # Sıfır uzunluklu kalın çizgiler yuvarlak nokta olarak çizilir
+        cv2.polylines(frame, list(np.repeat(points[:, None, :], 2, axis=1)), False, KEYPOINT_COLOR,
+                      radius * 2, cv2.LINE_AA)
+    return frame
+
+
+def render_detections(frame, boxes, classes, conf_values, track_ids, class_names, display_mode,
+                      masks=None, keypoints=None):
+    """
+    Tespitleri kare üzerine yerinde çiz.
+    boxes orijinal kare koordinatlarında (N, 4); takip olmayan kutularda track_ids -1.
+    masks (N, h, w) tüm kareyi kaplayan düşük çözünürlüklü maskeler, keypoints (N, K, 3); ikisi de isteğe bağlı.
+    """
+    if len(boxes) == 0:
+        return frame
+
+    has_ids = track_ids is not None and len(track_ids) > 0 and bool((track_ids >= 0).any())
+
+    if masks is not None and display_mode != "censored":
+        try:
+            if display_mode == "normal":
+                colors = np.asarray(CLASS_COLORS)[classes.astype(int) % len(CLASS_COLORS)]
+            elif has_ids:
+                colors = np.asarray(ID_COLORS)[track_ids % len(ID_COLORS)]
+            else:
+                colors = np.tile((0, 255, 0), (len(boxes), 1))
+            # En güvenli örnek en üstte
+            render_masks(frame, masks, boxes, colors, order=np.argsort(conf_values, kind="stable"))
+        except Exception as mask_error:
+            print(f"Maske çizim hatası: {mask_error}")
+
+    # Görüntüleme moduna göre işlem yap
+    if display_mode == "normal":
+        try:
+            for i, box in enumerate(boxes.astype(int)):
+                x1, y1, x2, y2 = box
+                cls_id, conf = int(classes[i]), conf_values[i]
+                label = f"{class_names.get(cls_id, f'Class:{cls_id}')} {conf:.2f}"
+                color = CLASS_COLORS[cls_id % len(CLASS_COLORS)]
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+                text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+                cv2.rectangle(frame, (x1, y1-text_size[1]-5), (x1+text_size[0], y1), color, -1)
+                cv2.putText(frame, label, (x1, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+
+                if has_ids and track_ids[i] >= 0:
+                    id_text = f"ID:{track_ids[i]}"
+                    cv2.putText(frame, id_text, (x2-50, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+        except Exception as plot_error:
+            print(f"Plot hatası: {plot_error}")
+
+    elif display_mode in ("boxes_only", "confidence"):
+        try:
+            show_conf = display_mode == "confidence"
+
+            for i, box in enumerate(boxes.astype(int)):
+                x1, y1, x2, y2 = box
+                color = color_for_id(int(track_ids[i])) if has_ids else (0, 255, 0)
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+                label = ""
+                if has_ids:
+                    label += f"ID:{track_ids[i]} "
+                if show_conf:
+                    label += f"{conf_values[i]:.2f}"
+                if label:
+                    cv2.putText(frame, label.strip(), (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        except Exception as e:
+            print(f"Kutu/Conf çizim hatası: {e}")
+
+    elif display_mode == "censored" and masks is not None:
+        try:
+            censor_masks(frame, masks, boxes)
+        except Exception as blur_error:
+            print(f"Bulanıklaştırma hatası: {blur_error}")
+
+    elif display_mode == "censored":
+        try:
+            h, w = frame.shape[:2]
+            for box in boxes.astype(int):
+                x1, y1, x2, y2 = box
+                x1, y1 = max(0, x1), max(0, y1)
+                x2, y2 = min(w-1, x2), min(h-1, y2)
+                if x1 >= x2 or y1 >= y2: continue
+                roi = frame[y1:y2, x1:x2]
+                if roi.size > 0:
+                    frame[y1:y2, x1:x2] = cv2.GaussianBlur(roi, CENSOR_KERNEL, 0)
+        except Exception as blur_error:
+            print(f"Bulanıklaştırma hatası: {blur_error}")
+
+    if keypoints is not None and display_mode != "censored":
+        try:
+            render_keypoints(frame, keypoints)
+        except Exception as pose_error:
+            print(f"Poz çizim hatası: {pose_error}")
+
+    return frame
+
+
+def render_overlay(frame, ops):
+    """
+    Eklentilerin ürettiği çizim komutlarını uygula. Komutlar çıkarım thread'inde hazırlanır;
+    burada sadece birkaç cv2 çağrısı yapılır.
+    """
+    for kind, args in ops:
+        try:
+            if kind == "line":
+                cv2.line(frame, *args, cv2.LINE_AA)
+            elif kind == "rect":
+                cv2.rectangle(frame, *args)
+            elif kind == "polyline":
+                points, closed, color, thickness = args
+                cv2.polylines(frame, [np.asarray(points, dtype=np.int32)], closed, color, thickness, cv2.LINE_AA)
+            elif kind == "circle":
+                cv2.circle(frame, *args, cv2.LINE_AA)
+            elif kind == "text":
+                text, org, color, scale, thickness = args
+                cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness, cv2.LINE_AA)
+        except Exception as e:
+            print(f"Eklenti çizim hatası ({kind}): {e}")
+    return frame
+
+
+def box_centers(boxes, width, height):
+    """Kutu merkezlerini kare boyutuna göre normalize (0-1) olarak döndür"""
+    centers = np.empty((len(boxes), 2), dtype=np.float32)
+    centers[:, 0] = (boxes[:, 0] + boxes[:, 2]) * (0.5 / width)
+    centers[:, 1] = (boxes[:, 1] + boxes[:, 3]) * (0.5 / height)
+    return centers
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Makine başına çalışma zamanı otomatik ayarı
+Seçili model için bu makinede torch thread sayısı, arka uç (pytorch/onnx), toplu
+işlem (batch) boyutu ve çıkarım görüntü boyutu (imgsz) kombinasyonlarını örnek bir
+video üzerinde ölçer. En iyi profil (model, kaynak çözünürlüğü) başına
+tuning_profiles.yaml dosyasına yazılır ve model/video yüklenirken otomatik uygulanır.
+
+Arama aşamalıdır (her aşamada önceki en iyi değerler sabit tutulur):
+thread -> arka uç -> batch -> imgsz. Oynatıcı tek kare çalıştırdığı için imgsz tek kareyle
+(batch=1) ölçülür; kaynak FPS'ini karşılayan en büyük boyut seçilir, hiçbiri
+karşılamıyorsa en hızlısı. batch sadece toplu işlemede (--ingest) kullanılır.
+"""
+
+import os
+import time
+import importlib.util
+
+import cv2
+import yaml
+
+from detection_engine import get_threads, set_threads
+
+TUNING_FILE = "tuning_profiles.yaml"
+IMGSZ_CANDIDATES = (320, 480, 640, 960)
+BATCH_CANDIDATES = (1, 2, 4, 8)
+SAMPLE_FRAMES = 32  # Ölçümde kullanılacak örnek kare sayısı
+WARMUP_CALLS = 2  # Ölçüm öncesi ısınma çağrıları (ölçüme dahil edilmez)
+
+
+def default_profiles_path():
+    """Uygulama dizinindeki profil dosyası yolu"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), TUNING_FILE)
+
+
+def profile_key(model_name, resolution):
+    """Profil anahtarı: '<model>@<genişlik>x<yükseklik>'"""
+    return f"{os.path.basename(model_name)}@{int(resolution[0])}x{int(resolution[1])}"
+
+
+def load_profiles(path=None):
+    path = path or default_profiles_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return data.get("profiles", {})
+
+
+def find_profile(model_name, resolution, path=None):
+    """Model ve çözünürlük için kayıtlı profil, yoksa None"""
+    return load_profiles(path).get(profile_key(model_name, resolution))
+
+
+def save_profile(model_name, resolution, profile, path=None):
+    """Profili dosyaya yaz (aynı anahtardaki eski profilin üzerine)"""
+    path = path or default_profiles_path()
+    profiles = load_profiles(path)
+    profiles[profile_key(model_name, resolution)] = profile
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"profiles": profiles}, f, allow_unicode=True, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def thread_candidates():
+    """1, 2, 4, ... ve çekirdek sayısı"""
+    cpus = os.cpu_count() or 1
+    candidates = {cpus}
+    n = 1
+    while n < cpus:
+        candidates.add(n)
+        n *= 2
+    return sorted(candidates)
+
+
+def available_backends(device):
+    """Bu makinede denenebilecek arka uçlar (onnx sadece CPU'da, onnxruntime kuruluysa)"""
+    backends = ["pytorch"]
+    if device == "cpu" and importlib.util.find_spec("onnxruntime") is not None:
+        backends.append("onnx")
+    return backends
+
+
+class AutoTuner:
+    """
+    Verilen motor (model yüklü DetectionEngine) üzerinde ayar kombinasyonlarını ölçer.
+    progress(metin) ile ilerleme bildirilir; cancel() True dönerse ölçüm durur.
+    """
+
+    def __init__(self, engine, video_path, target_fps=None, sample_frames=SAMPLE_FRAMES,
+                 progress=None, cancel=None):
+        self.engine = engine
+        self.video_path = video_path
+        self.sample_frames = sample_frames
+        self.progress = progress or (lambda text: None)
+        self.cancel = cancel or (lambda: False)
+        self.results = []  # (ayarlar, fps) ölçüm tablosu
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Video açılamadı: {video_path}")
+        self.resolution = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.target_fps = target_fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+        # Örnek kareleri videonun geneline yayarak al
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        step = max(1, frame_count // max(1, sample_frames))
+        self.frames = []
+        for i in range(sample_frames):
+            if step > 1:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, i * step)
+            ret, frame = cap.read()
+            if not ret:
+                break
+            self.frames.append(frame)
+        cap.release()
+        if not self.frames:
+            raise RuntimeError("Örnek kare okunamadı")
+
+    def process_height(self, imgsz):
+        """imgsz'ye göre ön küçültme yüksekliği: uzun kenar imgsz olacak şekilde (çift küçültme yok)"""
+        w, h = self.resolution
+        return max(32, int(round(imgsz * h / max(w, h))))
+
+    def measure(self, settings):
+        """Ayarları uygula ve örnek kareler üzerinde kare/sn ölç (aynı ayarlar tekrar ölçülmez)"""
+        for measured, fps in self.results:
+            if measured == settings:
+                return fps
+        engine = self.engine
+        set_threads(settings["threads"])
+        engine.imgsz = settings["imgsz"]
+        engine.process_height = self.process_height(settings["imgsz"])
+        if settings["backend"] != engine.backend:
+            engine.load_model(engine.model_name, settings["backend"])
+        batch = settings["batch"]
+        batches = [self.frames[i:i + batch] for i in range(0, len(self.frames), batch)]
+
+        for chunk in batches[:WARMUP_CALLS]:
+            engine.infer_batch(chunk, 0.25, 0.45)
+        t_start = time.perf_counter()
+        for chunk in batches:
+            engine.infer_batch(chunk, 0.25, 0.45)
+        fps = len(self.frames) / max(1e-6, time.perf_counter() - t_start)
+
+        self.results.append((dict(settings), fps))
+        self.progress(f"{settings['backend']} thread={settings['threads']} batch={batch} "
+                      f"imgsz={settings['imgsz']}: {fps:.1f} FPS")
+        return fps
+
+    def sweep(self, best, name, candidates):
+        """Tek bir parametreyi tara; en hızlı değeri best'e yaz ve fps'i döndür"""
+        scores = {}
+        for value in candidates:
+            if self.cancel():
+                break
+            settings = dict(best, **{name: value})
+            try:
+                scores[value] = self.measure(settings)
+            except Exception as e:
+                self.progress(f"{name}={value} başarısız: {e}")
+        if scores:
+            best[name] = max(scores, key=scores.get)
+        return scores
+
+    def run(self):
+        """Aşamalı aramayı çalıştır ve profili (sözlük) döndür"""
+        engine = self.engine
+        best = {"threads": thread_candidates()[-1], "backend": engine.backend, "batch": 1, "imgsz": 640}
+
+        # Thread sayısı süreç genelidir: ölçüm bitince (veya hata olursa) önceki değere dönülür
+        previous_threads = get_threads()
+        try:
+            self.sweep(best, "threads", thread_candidates())
+            self.sweep(best, "backend", available_backends(engine.device))
+            self.sweep(best, "batch", BATCH_CANDIDATES)
+            # Oynatma profili tek kare infer() içindir: imgsz batch=1 ile ölçülür
+            scores = self.sweep(dict(best, batch=1), "imgsz", IMGSZ_CANDIDATES)
+        finally:
+            set_threads(previous_threads)
+        if scores:
+            realtime = [size for size, fps in scores.items() if fps >= self.target_fps]
+            best["imgsz"] = max(realtime) if realtime else max(scores, key=scores.get)
+
+        fps = scores.get(best["imgsz"], 0.0)  # Tek kare (oynatma) hızı
+        return {
+            "threads": int(best["threads"]),
+            # inter-op paralelliği tek akışta fayda sağlamaz; sadece toplu işlerde 2
+            "interop_threads": 1 if best["batch"] == 1 else 2,
+            "backend": best["backend"],
+            "batch": int(best["batch"]),
+            "imgsz": int(best["imgsz"]),
+            "process_height": self.process_height(best["imgsz"]),
+            "fps": round(float(fps), 1),
+            "device": engine.device,
+            "tuned_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+def run_autotune_cli(args, models_dir):
+    """Komut satırından otomatik ayar: ölçümleri yazdırır, profili kaydeder"""
+    from detection_engine import DetectionEngine
+
+    engine = DetectionEngine(models_dir, force_cpu=args.cpu)
+    engine.load_model(args.model)
+    tuner = AutoTuner(engine, args.video, progress=print)
+    print(f"Otomatik ayar: {args.model}, {tuner.resolution[0]}x{tuner.resolution[1]}, "
+          f"{len(tuner.frames)} örnek kare, hedef {tuner.target_fps:.1f} FPS")
+    try:
+        profile = tuner.run()
+    except KeyboardInterrupt:
+        print("\nİptal edildi")
+        return 1
+    save_profile(args.model, tuner.resolution, profile)
+    print(f"Profil kaydedildi ({profile_key(args.model, tuner.resolution)}): {profile}")
+    return 0
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Klasör izleme ile toplu işleme (ingest)
+Bir dizindeki videoları (izleme modunda yeni gelenleri de) bir süreç havuzuna
+dağıtır. Her süreç modeli bir kez yükler, thread sayısı sınırlıdır ve her video için
+tespit deposu (isteğe bağlı olarak açıklamalı video) yazar. İlerleme her
+INGEST_CHUNK_FRAMES karede bir kaydedilir; yarıda kalan işler sonraki çalıştırmada
+son tamamlanan parçadan devam eder.
+
+Çıktı dizini (video başına):
+    <isim>.cvdet/          - tespit deposu (sınıf/ID zaman indeksi dahil)
+    <isim>.ingest.json     - ilerleme kaydı (checkpoint)
+    <isim>_annotated.mp4   - açıklamalı video (--export-videos)
+"""
+
+import os
+import json
+import time
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from cache_paths import video_cache_key
+from detection_store import DetectionWriter, DetectionStore, Detections, STORE_SUFFIX
+from occurrence_index import OccurrenceIndex
+from video_decode import open_video
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".webm")
+INGEST_CHUNK_FRAMES = 300  # Checkpoint aralığı (kare)
+WATCH_INTERVAL = 5.0  # İzleme modunda klasör tarama aralığı (sn)
+REPORT_INTERVAL = 2.0  # Toplam hız raporu aralığı (sn)
+
+
+def scan_videos(folder):
+    """Klasördeki video dosyaları (alt dizinlere inilmez)"""
+    return sorted(entry.path for entry in os.scandir(folder)
+                  if entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def output_paths(video_path, output_dir):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return {
+        "store": os.path.join(output_dir, stem + STORE_SUFFIX),
+        "checkpoint": os.path.join(output_dir, stem + ".ingest.json"),
+        "export": os.path.join(output_dir, stem + "_annotated.mp4"),
+    }
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def save_checkpoint(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+# İşçi süreç durumu (_init_worker ile süreç başına bir kez kurulur)
+_engine = None
+_settings = None
+_progress = None
+
+
+def _init_worker(models_dir, settings, progress):
+    """İşçi süreç başlangıcı: thread sınırı ve model yükleme"""
+    global _engine, _settings, _progress
+    threads = str(settings["threads"])
+    # torch içe aktarılmadan önce ayarlanmalı (OpenMP/MKL havuzları)
+    os.environ["OMP_NUM_THREADS"] = threads
+    os.environ["MKL_NUM_THREADS"] = threads
+    cv2.setNumThreads(1)
+
+    from detection_engine import DetectionEngine, set_threads
+    set_threads(settings["threads"], 1)
+    engine = DetectionEngine(models_dir, force_cpu=settings["cpu"])
+    engine.load_model(settings["model"])
+    engine.batch = settings["batch"] or 1
+    _engine, _settings, _progress = engine, settings, progress
+
+
+def _apply_profile(resolution):
+    """Kayıtlı ayar profilini uygula; thread sayısı işçi sınırında kalır"""
+    from autotune import find_profile
+    profile = find_profile(_settings["model"], resolution)
+    if profile is not None:
+        _engine.apply_profile(dict(profile, threads=_settings["threads"], interop_threads=None,
+                                   batch=_settings["batch"] or profile.get("batch", 1)))
+
+
+def _detect(frames, decode_ratios=(1.0, 1.0)):
+    """
+    Kareler için Detections listesi (takip açıksa sıralı, değilse toplu çıkarım).
+    decode_ratios: çözücüde küçültülmüş kareden kaynak çözünürlüğüne oran; kutular kaynak koordinatlarına çevrilir.
+    """
+    conf, iou = _settings["conf"], _settings["iou"]
+    rx, ry = decode_ratios
+    if _settings["track"]:
+        detections = []
+        for frame in frames:
+            results, (sx, sy) = _engine.infer(frame, conf, iou, track=True)
+            detections.append(Detections.from_results(results, (sx * rx, sy * ry),
+                                                      track=not _engine.tracking_failed))
+        return detections
+    return [Detections.from_results(results, (sx * rx, sy * ry), track=False)
+            for results, (sx, sy) in _engine.infer_batch(frames, conf, iou)]
+
+
+def ingest_file(video_path, output_dir):
+    """İşçi süreçte tek videoyu işle (checkpoint'ten devam ederek); özet sözlük döndür"""
+    paths = output_paths(video_path, output_dir)
+    key = video_cache_key(video_path)
+    ckpt = load_checkpoint(paths["checkpoint"])
+    if ckpt is None or ckpt.get("key") != key or ckpt.get("model") != _settings["model"]:
+        ckpt = {"key": key, "model": _settings["model"], "next_frame": 0, "rows": 0, "frames": 0,
+                "max_track_id": -1, "done": False, "exported": False}
+    summary = {"video": video_path, "frames": 0, "seconds": 0.0, "resumed_at": ckpt["next_frame"],
+               "skipped": ckpt["done"] and (ckpt["exported"] or not _settings["export"])}
+    if summary["skipped"]:
+        return summary
+
+    t_start = time.time()
+    cap = open_video(video_path, _settings["decoder"], threads=_settings["threads"])
+    if not cap.isOpened():
+        raise RuntimeError(f"Video açılamadı: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    resolution = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    decode_ratios = (1.0, 1.0)
+    try:
+        if not ckpt["done"]:
+            _apply_profile(resolution)
+            if _settings["decode_scale"] and resolution[1] > (_engine.process_height or resolution[1]):
+                # Profil uygulandıktan sonra işleme yüksekliği belli olur; kareler çözücüde küçültülür
+                cap.release()
+                cap = open_video(video_path, _settings["decoder"], max_height=_engine.process_height,
+                                 threads=_settings["threads"])
+                decoded = (cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                decode_ratios = (resolution[0] / decoded[0], resolution[1] / decoded[1])
+            _engine.reset_tracker()
+            step = 1 if _settings["track"] else max(1, _engine.batch)
+            meta = {
+                "source": os.path.abspath(video_path),
+                "fps": fps,
+                "width": resolution[0],
+                "height": resolution[1],
+                "model": _settings["model"],
+                "names": dict(_engine.model.names),
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "tracked": bool(_settings["track"]),
+            }
+            next_frame = ckpt["next_frame"]
+            resume = (ckpt["rows"], ckpt["frames"]) if next_frame > 0 else None
+            # Takipçi devamda sıfırlanır ve ID'leri 1'den yeniden başlar; önceki parçalarda
+            # yazılmış ID'lerle çakışmaması için devam sonrası ID'ler en büyük yazılmış ID kadar kaydırılır
+            max_track_id = ckpt.get("max_track_id")
+            if max_track_id is None:
+                # Eski checkpoint: en büyük ID kayıtlı parçalardan okunur
+                max_track_id = -1
+                if next_frame > 0 and ckpt["rows"] > 0:
+                    ids = DetectionStore(paths["store"]).columns["track_id"][:ckpt["rows"]]
+                    max_track_id = int(ids.max()) if len(ids) else -1
+            track_offset = max_track_id + 1 if next_frame > 0 else 0
+            writer = DetectionWriter(paths["store"], meta, resume=resume)
+            try:
+                if next_frame > 0:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, next_frame)
+                eof = False
+                while not eof:
+                    chunk_end = next_frame + INGEST_CHUNK_FRAMES
+                    chunk_start = next_frame
+                    while next_frame < chunk_end and not eof:
+                        frames = []
+                        timestamps = []
+                        while len(frames) < min(step, chunk_end - next_frame):
+                            ret, frame = cap.read()
+                            if not ret:
+                                eof = True
+                                break
+                            frames.append(frame)
+                            # PyAV/ffmpeg okuyucularında gerçek PTS, OpenCV'de sabit FPS varsayımı
+                            pts = getattr(cap, "last_pts", None)
+                            timestamps.append((next_frame + len(timestamps)) / fps if pts is None else pts)
+                        if not frames:
+                            break
+                        for i, dets in enumerate(_detect(frames, decode_ratios)):
+                            xyxy, cls, conf, track_id = dets.arrays()
+                            if track_offset and len(track_id):
+                                track_id = np.where(track_id >= 0, track_id + track_offset, track_id)
+                            if len(track_id):
+                                max_track_id = max(max_track_id, int(track_id.max()))
+                            writer.append(next_frame + i, timestamps[i], xyxy, cls, conf, track_id)
+                        next_frame += len(frames)
+                    # Parça tamamlandı: depo diske yazılınca ilerleme kaydedilir
+                    ckpt["rows"], ckpt["frames"] = writer.checkpoint()
+                    ckpt["next_frame"] = next_frame
+                    ckpt["max_track_id"] = max_track_id
+                    ckpt["done"] = eof
+                    save_checkpoint(paths["checkpoint"], ckpt)
+                    summary["frames"] += next_frame - chunk_start
+                    _progress.put((os.getpid(), next_frame - chunk_start))
+            finally:
+                writer.close()
+            if ckpt["done"]:
+                # Sınıf/ID zaman indeksi depoyla birlikte hazır olsun (inceleme anında üretilmez)
+                OccurrenceIndex.for_store(DetectionStore(paths["store"]))
+
+        if _settings["export"] and not ckpt.get("exported"):
+            _export(video_path, paths, fps)
+            ckpt["exported"] = True
+            save_checkpoint(paths["checkpoint"], ckpt)
+    finally:
+        cap.release()
+    summary["seconds"] = time.time() - t_start
+    return summary
+
+
+def _export(video_path, paths, fps):
+    """Açıklamalı videoyu depodan yaz (model tekrar çalıştırılmaz)"""
+    from video_export import AnnotatedVideoExporter, FrameAnnotator
+
+    annotator = FrameAnnotator(store=DetectionStore(paths["store"]), display_mode=_settings["mode"], fps=fps)
+    exporter = AnnotatedVideoExporter(video_path, paths["export"], annotator, use_ffmpeg=_settings["ffmpeg"],
+                                      decoder=_settings["decoder"])
+    exporter.start()
+    exporter.join()
+    if exporter.error is not None:
+        raise RuntimeError(f"Dışa aktarma başarısız: {exporter.error}")
+
+
+class IngestService:
+    """
+    Klasörü tarar (watch=True ise sürekli izler), hazır videoları süreç havuzuna
+    gönderir ve toplam hızı raporlar. İzleme modunda boyutu iki tarama arasında
+    değişmeyen dosyalar hazır sayılır (kaydı süren dosyalar işlenmez).
+    """
+
+    def __init__(self, input_dir, output_dir, models_dir, settings, workers=1, watch=False):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.models_dir = models_dir
+        self.settings = settings
+        self.workers = workers
+        self.watch = watch
+        self.submitted = set()
+        self.completed = []
+        self.failed = []
+        self.total_frames = 0
+        self._sizes = {}  # yol -> (boyut, mtime) son taramada
+
+    def ready_videos(self):
+        ready = []
+        sizes = {}
+        for path in scan_videos(self.input_dir):
+            if path in self.submitted:
+                continue
+            st = os.stat(path)
+            sizes[path] = (st.st_size, st.st_mtime)
+            if not self.watch or self._sizes.get(path) == sizes[path]:
+                ready.append(path)
+        self._sizes = sizes
+        return ready
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        ctx = multiprocessing.get_context("spawn")  # torch/CUDA fork ile güvenli değil
+        manager = ctx.Manager()
+        progress = manager.Queue()
+        executor = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_worker,
+                                       initargs=(self.models_dir, self.settings, progress))
+        pending = {}
+        t_start = time.time()
+        last_scan = last_report = 0.0
+        try:
+            while True:
+                now = time.time()
+                if now - last_scan >= WATCH_INTERVAL or not last_scan:
+                    for path in self.ready_videos():
+                        self.submitted.add(path)
+                        pending[executor.submit(ingest_file, path, self.output_dir)] = path
+                    last_scan = now
+                if not pending and not self.watch:
+                    break
+
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                while True:
+                    try:
+                        self.total_frames += progress.get_nowait()[1]
+                    except queue.Empty:
+                        break
+                for future in done:
+                    self.finish(pending.pop(future), future)
+
+                if time.time() - last_report >= REPORT_INTERVAL:
+                    elapsed = max(1e-6, time.time() - t_start)
+                    print(f"\r{len(self.completed)}/{len(self.submitted)} video, {len(self.failed)} hata - "
+                          f"{self.total_frames} kare, {self.total_frames / elapsed:.1f} FPS toplam   ",
+                          end="", flush=True)
+                    last_report = time.time()
+        except KeyboardInterrupt:
+            print("\nDurduruluyor; yarıda kalan videolar sonraki çalıştırmada kaldığı yerden devam eder")
+            executor.shutdown(wait=False, cancel_futures=True)
+            manager.shutdown()
+            return 1
+        executor.shutdown()
+        manager.shutdown()
+
+        elapsed = max(1e-6, time.time() - t_start)
+        print(f"\nToplu işleme bitti: {len(self.completed)} video, {len(self.failed)} hata, "
+              f"{self.total_frames} kare, {elapsed:.0f} sn, {self.total_frames / elapsed:.1f} FPS toplam")
+        return 1 if self.failed else 0
+
+    def finish(self, path, future):
+        name = os.path.basename(path)
+        try:
+            summary = future.result()
+        except Exception as e:
+            self.failed.append(path)
+            print(f"\n{name}: hata - {e}")
+            return
+        self.completed.append(summary)
+        if summary["skipped"]:
+            print(f"\n{name}: zaten işlenmiş, atlandı")
+            return
+        resumed = f" ({summary['resumed_at']}. kareden devam)" if summary["resumed_at"] else ""
+        fps = summary["frames"] / max(1e-6, summary["seconds"])
+        print(f"\n{name}: {summary['frames']} kare, {summary['seconds']:.0f} sn, {fps:.1f} FPS{resumed}")
+
+
+def run_ingest_cli(args, models_dir):
+    """Komut satırından toplu işleme"""
+    if not os.path.isdir(args.ingest):
+        print(f"Klasör bulunamadı: {args.ingest}")
+        return 1
+    workers = max(1, args.workers)
+    settings = {
+        "model": args.model,
+        "conf": args.conf,
+        "iou": args.iou,
+        "track": args.track,
+        "cpu": args.cpu,
+        "mode": args.mode,
+        "ffmpeg": args.ffmpeg,
+        "export": args.export_videos,
+        "batch": args.batch,  # None: profil veya 1
+        "decoder": args.decoder,
+        "decode_scale": args.decode_scale,
+        "threads": args.threads_per_worker or max(1, (os.cpu_count() or 1) // workers),
+    }
+    output_dir = args.output or os.path.join(args.ingest, "cenkervision")
+    print(f"Toplu işleme: {args.ingest} -> {output_dir} ({workers} süreç x {settings['threads']} thread, "
+          f"model {args.model}{', izleme modu' if args.watch else ''})")
+    service = IngestService(args.ingest, output_dir, models_dir, settings, workers=workers, watch=args.watch)
+    return service.run()
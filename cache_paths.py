@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Önbellek yolları
+Küçük resim, klip, olay günlüğü ve toplu işleme modüllerinin ortak kullandığı
+kullanıcı önbellek dizini ve video başına önbellek anahtarı.
+"""
+
+import os
+import hashlib
+
+
+def default_cache_dir(kind="thumbs"):
+    """Kullanıcı önbellek dizini (~/.cache/cenkervision/<kind>)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cenkervision", kind)
+
+
+def video_cache_key(video_path):
+    """Yol, boyut ve değişiklik zamanından video başına önbellek anahtarı"""
+    st = os.stat(video_path)
+    raw = f"{os.path.abspath(video_path)}|{st.st_size}|{int(st.st_mtime)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
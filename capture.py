@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Düşük gecikmeli canlı yakalama
+Webcam gibi canlı kaynaklar için sürekli grab()/retrieve() yapan ve sadece en
+yeni kareyi tutan yakalayıcı thread ile ekran-kamera-ekran (glass-to-glass)
+gecikme ölçümü için zaman kodu deseni üreten/çözen yardımcı.
+"""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class LatestFrameGrabber:
+    """
+    Kaynaktan kesintisiz kare çeker ve sadece en yenisini saklar.
+    OpenCV'nin iç tamponu bu sayede hiç dolmaz; tüketici (çıkarım döngüsü)
+    her zaman en taze kareyi alır, arada kalan kareler atılır.
+    """
+
+    def __init__(self, cap, stamp=True):
+        self.cap = cap
+        self.stamp = stamp  # Kareyi yakalama anının zaman damgasıyla işaretle
+        self.frames_grabbed = 0
+        self.frames_dropped = 0  # Tüketici okumadan üzerine yazılan kareler
+        self.last_timestamp = None  # Son read() ile dönen karenin yakalama zamanı (time.monotonic)
+        self.error = None
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_ts = None
+        self._seq = 0
+        self._read_seq = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Destekleyen arka uçlarda sürücü tamponunu tek kareye indir
+        try:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LatestFrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.cap.grab():
+                self.error = "grab() başarısız"
+                with self._cond:
+                    self._cond.notify_all()
+                break
+            ts = time.monotonic() if self.stamp else None
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            with self._cond:
+                if self._seq > self._read_seq:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._frame_ts = ts
+                self._seq += 1
+                self.frames_grabbed += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """
+        Henüz okunmamış en yeni kareyi döndür (cap.read() ile uyumlu: (ret, frame)).
+        Yeni kare yoksa en fazla timeout kadar bekler.
+        """
+        with self._cond:
+            if self._seq == self._read_seq and self.error is None:
+                self._cond.wait_for(lambda: self._seq > self._read_seq or self.error is not None
+                                    or self._stop.is_set(), timeout)
+            if self._seq == self._read_seq:
+                return False, None
+            self._read_seq = self._seq
+            self.last_timestamp = self._frame_ts
+            return True, self._frame
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+
+class LatencyProbe:
+    """
+    Glass-to-glass gecikme ölçümü.
+    Ekranda, zamanla artan bir sayacı Gray kodlu siyah/beyaz hücre ızgarası olarak
+    gösterir. Kamera bu desene tutulduğunda, görüntülenen karedeki kod çözülür ve
+    o anda ekranda gösterilen kodla farkı gecikmeyi verir (ekran + kamera + işlem
+    hattı + ekran).
+    """
+
+    ROWS, COLS = 4, 5  # İlk iki hücre referans (beyaz, siyah), kalan 18 hücre veri
+    DATA_BITS = ROWS * COLS - 2
+
+    def __init__(self, unit_ms=5.0, history=120):
+        self.unit_ms = unit_ms
+        self.samples = deque(maxlen=history)
+        self._t0 = time.monotonic()
+
+    def current_code(self):
+        """Şu anki zaman kodu (unit_ms biriminde, DATA_BITS bite sarar)"""
+        ticks = int((time.monotonic() - self._t0) * 1000.0 / self.unit_ms)
+        return ticks % (1 << self.DATA_BITS)
+
+    def render(self, width, height, code=None):
+        """Kodu ızgara olarak çiz (BGR)"""
+        code = self.current_code() if code is None else code
+        gray = code ^ (code >> 1)
+        cells = np.zeros(self.ROWS * self.COLS, dtype=np.uint8)
+        cells[0] = 255
+        bits = (gray >> np.arange(self.DATA_BITS)) & 1
+        cells[2:] = bits.astype(np.uint8) * 255
+        grid = cells.reshape(self.ROWS, self.COLS)
+        image = cv2.resize(grid, (width, height), interpolation=cv2.INTER_NEAREST)
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+    def decode(self, frame):
+        """Kare tüm görüntüyü kaplayan deseni içeriyorsa kodu döndür, yoksa None"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        h, w = gray.shape[:2]
+        # Hücre kenarlarındaki bulanıklığı dışarıda bırakmak için hücre merkezlerini örnekle
+        ys = ((np.arange(self.ROWS) + 0.5) * h / self.ROWS).astype(int)
+        xs = ((np.arange(self.COLS) + 0.5) * w / self.COLS).astype(int)
+        r = max(1, min(h // (self.ROWS * 4), w // (self.COLS * 4)))
+        means = np.array([[gray[y - r:y + r, x - r:x + r].mean() for x in xs] for y in ys]).ravel()
+
+        white, black = means[0], means[1]
+        if white - black < 40:  # Desen görünmüyor veya kontrast yetersiz
+            return None
+        bits = (means[2:] > (white + black) / 2).astype(np.int64)
+        gray_code = int((bits << np.arange(self.DATA_BITS)).sum())
+
+        # Gray kodu ikiliye çevir
+        code, shift = gray_code, gray_code >> 1
+        while shift:
+            code ^= shift
+            shift >>= 1
+        return code
+
+    def measure(self, frame):
+        """Karedeki kodu şimdiki kodla karşılaştır; gecikmeyi (ms) kaydet ve döndür"""
+        decoded = self.decode(frame)
+        if decoded is None:
+            return None
+        diff = (self.current_code() - decoded) % (1 << self.DATA_BITS)
+        latency = diff * self.unit_ms
+        if latency > 5000:  # Yanlış çözüm; makul aralık dışında
+            return None
+        self.samples.append(latency)
+        return latency
+
+    def stats(self):
+        """(medyan, p95) gecikme (ms), örnek yoksa None"""
+        if not self.samples:
+            return None
+        arr = np.asarray(self.samples)
+        return float(np.median(arr)), float(np.percentile(arr, 95))
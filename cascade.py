@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Model kaskadı
+Her karede küçük (ucuz) model çalışır; büyük model sadece küçük modelin emin
+olmadığı karelerde/bölgelerde çalıştırılır ve sonuçlar birleştirilir.
+
+Yükseltme (escalation) tetikleyicileri:
+    - güveni belirsizlik bandında olan tespitler (conf_band)
+    - ilk kez görülen takip ID'leri (takip açıksa)
+    - ilgi bölgelerine (roi_zones) düşen tespitler
+    - her refresh_interval karede bir tam kare (küçük modelin hiç görmediği nesneler için)
+
+Tetikleyen kutuların (pay eklenmiş) birleşimi kare alanının max_region oranından
+küçükse büyük model sadece o bölgenin kırpıntısında, değilse tüm karede çalışır.
+"""
+
+import numpy as np
+
+from detection_store import Detections, results_to_arrays
+from annotations import box_centers
+
+CASCADE_CONF_BAND = (0.25, 0.55)  # Bu aralıktaki güvenler "belirsiz" sayılır
+CASCADE_REFRESH_INTERVAL = 30  # Her N karede bir büyük model tüm karede çalışır (0: kapalı)
+CASCADE_REGION_PAD = 0.15  # Bölge kutusuna eklenen pay (kutu boyutuna oranla)
+CASCADE_MAX_REGION = 0.5  # Bölge bu alan oranını aşarsa tüm kare işlenir
+CASCADE_MATCH_IOU = 0.3  # Büyük/küçük model kutularını eşleştirme eşiği
+CASCADE_SEEN_IDS = 4096  # Hatırlanan takip ID'si sayısı (yeni ID tespiti için)
+
+
+def box_iou(a, b):
+    """(N, 4) ve (M, 4) xyxy kutular için (N, M) IoU matrisi"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+class ModelCascade:
+    """
+    İki DetectionEngine (model yüklü) ile kaskad çıkarım. infer() tespit deposuyla
+    aynı Detections kaydını döndürür (orijinal kare koordinatlarında).
+    Takip durumu küçük modelde tutulur; büyük model kutuları ID'lerini IoU ile
+    eşleşen küçük model kutularından alır.
+    """
+
+    def __init__(self, small, large, conf_band=CASCADE_CONF_BAND, refresh_interval=CASCADE_REFRESH_INTERVAL,
+                 pad=CASCADE_REGION_PAD, max_region=CASCADE_MAX_REGION, roi_zones=None):
+        self.small = small
+        self.large = large
+        self.conf_band = conf_band
+        self.refresh_interval = refresh_interval
+        self.pad = pad
+        self.max_region = max_region
+        self.roi = None
+        if roi_zones:
+            from zone_analytics import PolygonSet
+            self.roi = PolygonSet(roi_zones)
+
+        self.frames = 0
+        self.escalations = 0
+        self.full_escalations = 0
+        self._seen_ids = {}  # takip ID'si -> son görüldüğü kare (ekleme sırasıyla)
+        self._class_map = self._build_class_map()
+
+    def _build_class_map(self):
+        """Büyük model sınıf numaralarını küçük modelinkine isimle eşle (aynıysa None)"""
+        small_names = dict(self.small.model.names)
+        large_names = dict(self.large.model.names)
+        if small_names == large_names:
+            return None
+        by_name = {name: cls for cls, name in small_names.items()}
+        lut = np.full(max(large_names) + 1, -1, dtype=np.int32)
+        for cls, name in large_names.items():
+            lut[cls] = by_name.get(name, -1)
+        return lut
+
+    @property
+    def escalation_rate(self):
+        return self.escalations / self.frames if self.frames else 0.0
+
+    def _new_track_mask(self, track_ids):
+        mask = np.zeros(len(track_ids), dtype=bool)
+        for i, tid in enumerate(track_ids.tolist()):
+            if tid < 0:
+                continue
+            if tid not in self._seen_ids:
+                mask[i] = True
+            self._seen_ids.pop(tid, None)
+            self._seen_ids[tid] = self.frames
+        while len(self._seen_ids) > CASCADE_SEEN_IDS:
+            self._seen_ids.pop(next(iter(self._seen_ids)))
+        return mask
+
+    def _region(self, boxes, w, h):
+        """Pay eklenmiş birleşim bölgesi (x1, y1, x2, y2), tam kare gerekiyorsa None"""
+        x1, y1 = boxes[:, :2].min(axis=0)
+        x2, y2 = boxes[:, 2:].max(axis=0)
+        pad = self.pad * max(x2 - x1, y2 - y1)
+        x1, y1 = max(0, int(x1 - pad)), max(0, int(y1 - pad))
+        x2, y2 = min(w, int(x2 + pad)), min(h, int(y2 + pad))
+        if (x2 - x1) * (y2 - y1) > self.max_region * w * h:
+            return None
+        return x1, y1, x2, y2
+
+    def infer(self, frame, conf, iou, track=False):
+        h, w = frame.shape[:2]
+        band_lo, band_hi = self.conf_band
+        self.frames += 1
+
+        # Küçük model belirsiz bandı da görecek kadar düşük eşikle çalışır
+        results, scale_ratios = self.small.infer(frame, min(conf, band_lo), iou, track=track)
+        names = dict(results[0].names) if results and hasattr(results[0], "names") else {}
+        xyxy, cls, confs, ids = results_to_arrays(results, scale_ratios)
+        if not track or self.small.tracking_failed:
+            ids = np.full(len(xyxy), -1, dtype=np.int32)
+
+        trigger = (confs >= band_lo) & (confs < band_hi)
+        if track:
+            trigger |= self._new_track_mask(ids)
+        if self.roi is not None and len(xyxy):
+            trigger |= self.roi.contains(box_centers(xyxy, w, h)).any(axis=1)
+        refresh = self.refresh_interval > 0 and self.frames % self.refresh_interval == 1
+
+        if refresh or trigger.any():
+            region = None if refresh else self._region(xyxy[trigger], w, h)
+            xyxy, cls, confs, ids = self._escalate(frame, region, conf, iou, xyxy, cls, confs, ids)
+
+        return Detections(xyxy, cls, confs, ids, names).select(confs >= conf)
+
+    def _escalate(self, frame, region, conf, iou, xyxy, cls, confs, ids):
+        """Büyük modeli bölgede (veya tüm karede) çalıştır ve küçük model sonuçlarıyla birleştir"""
+        h, w = frame.shape[:2]
+        self.escalations += 1
+        if region is None:
+            self.full_escalations += 1
+            x1, y1, x2, y2 = 0, 0, w, h
+        else:
+            x1, y1, x2, y2 = region
+        crop = frame[y1:y2, x1:x2]
+
+        results, scale_ratios = self.large.infer(crop, conf, iou, track=False)
+        l_xyxy, l_cls, l_conf, _ = results_to_arrays(results, scale_ratios)
+        l_xyxy[:, [0, 2]] += x1
+        l_xyxy[:, [1, 3]] += y1
+        if self._class_map is not None:
+            l_cls = self._class_map[l_cls]
+            valid = l_cls >= 0
+            l_xyxy, l_cls, l_conf = l_xyxy[valid], l_cls[valid].astype(np.int16), l_conf[valid]
+
+        # Kırpıntı kenarına değen (kesilmiş) büyük model kutuları güvenilmez; karenin kendi kenarı hariç
+        eps = 1.0
+        cut = np.zeros(len(l_xyxy), dtype=bool)
+        if x1 > 0:
+            cut |= l_xyxy[:, 0] <= x1 + eps
+        if y1 > 0:
+            cut |= l_xyxy[:, 1] <= y1 + eps
+        if x2 < w:
+            cut |= l_xyxy[:, 2] >= x2 - eps
+        if y2 < h:
+            cut |= l_xyxy[:, 3] >= y2 - eps
+        l_xyxy, l_cls, l_conf = l_xyxy[~cut], l_cls[~cut], l_conf[~cut]
+
+        # Bölgedeki küçük model kutuları: büyük modelle eşleşenler ID'lerini devreder,
+        # eşleşmeyen belirsizler büyük model tarafından reddedilmiş sayılır
+        centers = (xyxy[:, :2] + xyxy[:, 2:]) * 0.5
+        inside = ((centers[:, 0] >= x1) & (centers[:, 0] < x2) &
+                  (centers[:, 1] >= y1) & (centers[:, 1] < y2))
+        l_ids = np.full(len(l_xyxy), -1, dtype=np.int32)
+        l_matched = np.zeros(len(l_xyxy), dtype=bool)
+        matched = np.zeros(len(xyxy), dtype=bool)
+        if inside.any() and len(l_xyxy):
+            overlap = box_iou(l_xyxy, xyxy)
+            overlap[:, ~inside] = 0.0
+            # Açgözlü eşleştirme: en yüksek IoU'dan başla
+            for flat in np.argsort(overlap, axis=None)[::-1]:
+                li, si = divmod(int(flat), len(xyxy))
+                if overlap[li, si] < CASCADE_MATCH_IOU:
+                    break
+                if l_matched[li] or matched[si]:
+                    continue
+                l_ids[li] = ids[si]
+                l_matched[li] = matched[si] = True
+
+        drop = inside & (matched | (confs < self.conf_band[1]))
+        keep = ~drop
+        return (np.concatenate([xyxy[keep], l_xyxy]).astype(np.float32),
+                np.concatenate([cls[keep], l_cls]).astype(np.int16),
+                np.concatenate([confs[keep], l_conf]).astype(np.float32),
+                np.concatenate([ids[keep], l_ids]).astype(np.int32))
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Çözülmüş klip önbelleği
+Aynı kısa klip üzerinde tekrar tekrar eşik/model denemesi yapılırken her geçişte
+videoyu yeniden çözmemek için, bir kare aralığı bir kez ham BGR kareler olarak yerel
+diske yazılır ve bellek eşlemeli olarak okunur. Önbellek toplam boyutla sınırlıdır;
+sınır aşıldığında en uzun süredir kullanılmayan klipler silinir (LRU).
+
+Klip yapısı (önbellek dizininde):
+    <anahtar>_<başlangıç>_<bitiş>.frames - (N, H, W, 3) uint8 ham kareler
+    <anahtar>_<başlangıç>_<bitiş>.json   - kaynak, aralık, FPS, boyut, son kullanım
+"""
+
+import os
+import json
+import time
+
+import cv2
+import numpy as np
+
+from cache_paths import default_cache_dir, video_cache_key
+
+CLIP_CACHE_MAX_BYTES = 8 * 1024 ** 3  # Varsayılan toplam önbellek sınırı (8 GB)
+
+
+class DecodedClip:
+    """Önbellekteki tek bir klip; kareler salt okunur memmap görünümleri olarak döner"""
+
+    def __init__(self, meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.meta_path = meta_path
+        self.data_path = meta_path[:-len(".json")] + ".frames"
+        self.start = int(self.meta["start"])
+        self.end = int(self.meta["end"])  # Hariç
+        shape = (self.end - self.start, self.meta["height"], self.meta["width"], 3)
+        self.frames = np.memmap(self.data_path, dtype=np.uint8, mode="r", shape=shape)
+
+    @property
+    def nbytes(self):
+        return self.frames.nbytes
+
+    def __contains__(self, frame_idx):
+        return self.start <= frame_idx < self.end
+
+    def frame(self, frame_idx):
+        """Kareyi kopyasız döndür (salt okunur; üzerine çizim için kopyalanmalı)"""
+        return self.frames[frame_idx - self.start]
+
+    def close(self):
+        self.frames = None
+
+
+class ClipCache:
+    """Video başına çözülmüş klipleri yöneten boyut sınırlı LRU önbellek"""
+
+    def __init__(self, cache_dir=None, max_bytes=CLIP_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir("clips")
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entries(self):
+        """(meta_yolu, meta) listesi; bozuk kayıtlar atlanır"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries.append((path, json.load(f)))
+            except Exception:
+                continue
+        return entries
+
+    def total_bytes(self):
+        return sum(meta.get("nbytes", 0) for _, meta in self._entries())
+
+    def find(self, video_path, frame_idx=None):
+        """Videoya ait (ve verilmişse kareyi içeren) en büyük klibi aç, yoksa None"""
+        try:
+            key = video_cache_key(video_path)
+        except OSError:
+            return None
+        best = None
+        for path, meta in self._entries():
+            if meta.get("key") != key:
+                continue
+            if frame_idx is not None and not (meta["start"] <= frame_idx < meta["end"]):
+                continue
+            if best is None or meta["end"] - meta["start"] > best[1]["end"] - best[1]["start"]:
+                best = (path, meta)
+        if best is None:
+            return None
+        self._touch(*best)
+        return DecodedClip(best[0])
+
+    def _touch(self, meta_path, meta):
+        meta["last_used"] = time.time()
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def evict(self, needed_bytes=0):
+        """Toplam boyut sınırın altına inene kadar en eski klipleri sil"""
+        entries = sorted(self._entries(), key=lambda e: e[1].get("last_used", 0))
+        total = sum(meta.get("nbytes", 0) for _, meta in entries)
+        for path, meta in entries:
+            if total + needed_bytes <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= meta.get("nbytes", 0)
+
+    def remove(self, meta_path):
+        for path in (meta_path, meta_path[:-len(".json")] + ".frames"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Başka bir süreç/eşleme tarafından kullanılıyor olabilir
+
+    def clear(self):
+        for path, _ in self._entries():
+            self.remove(path)
+
+    def build(self, video_path, start_frame, end_frame, progress=None, cancel=None):
+        """
+        [start_frame, end_frame) aralığını bir kez çözüp önbelleğe yaz ve DecodedClip döndür.
+        progress(done, total) çağrılır; cancel() True dönerse iş yarıda bırakılır (None döner).
+        """
+        key = video_cache_key(video_path)
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Video açılamadı: {video_path}")
+        try:
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            start = max(0, int(start_frame))
+            end = min(int(end_frame), frame_count) if frame_count > 0 else int(end_frame)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            total = end - start
+            if total <= 0:
+                raise ValueError("Geçersiz kare aralığı")
+            nbytes = total * height * width * 3
+            if nbytes > self.max_bytes:
+                raise ValueError(f"Klip ({nbytes / 1024**3:.1f} GB) önbellek sınırından "
+                                 f"({self.max_bytes / 1024**3:.1f} GB) büyük")
+            self.evict(nbytes)
+
+            base = os.path.join(self.cache_dir, f"{key}_{start}_{end}")
+            part_path = base + ".frames.part"
+            frames = np.memmap(part_path, dtype=np.uint8, mode="w+", shape=(total, height, width, 3))
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            done = 0
+            while done < total:
+                if cancel is not None and cancel():
+                    break
+                # Doğrudan memmap içine çöz (ara kopya yok)
+                ret, _ = cap.read(frames[done])
+                if not ret:
+                    break
+                done += 1
+                if progress is not None and done % 10 == 0:
+                    progress(done, total)
+            frames.flush()
+            del frames
+
+            if done == 0 or (cancel is not None and cancel()):
+                os.remove(part_path)
+                return None
+            if done < total:
+                # Video beklenenden kısa: dosyayı okunan kare sayısına kırp
+                end = start + done
+                nbytes = done * height * width * 3
+                with open(part_path, "r+b") as f:
+                    f.truncate(nbytes)
+                base = os.path.join(self.cache_dir, f"{key}_{start}_{end}")
+                os.replace(part_path, base + ".frames.part")
+                part_path = base + ".frames.part"
+
+            os.replace(part_path, base + ".frames")
+            meta = {
+                "key": key,
+                "source": os.path.abspath(video_path),
+                "start": start,
+                "end": end,
+                "width": width,
+                "height": height,
+                "fps": cap.get(cv2.CAP_PROP_FPS),
+                "frame_count": frame_count,
+                "nbytes": nbytes,
+            }
+            self._touch(base + ".json", meta)
+            if progress is not None:
+                progress(done, total)
+            return DecodedClip(base + ".json")
+        finally:
+            cap.release()
+
+
+class ClipCapture:
+    """
+    cv2.VideoCapture ile uyumlu okuyucu: klip aralığındaki kareler memmap'ten
+    kopyasız okunur, aralık dışı kareler için kaynak video gerektiğinde açılır.
+    Oynatma, seek ve kare adımlama kodu değişmeden kullanılabilir.
+    """
+
+    def __init__(self, video_path, clip):
+        self.video_path = video_path
+        self.clip = clip
+        self.pos = 0  # Sıradaki karenin numarası (CAP_PROP_POS_FRAMES)
+        self._fallback = None
+        self._fallback_pos = None
+        self._grabbed = None
+
+    def isOpened(self):
+        return self.clip is not None
+
+    def _source(self):
+        if self._fallback is None:
+            self._fallback = cv2.VideoCapture(self.video_path)
+            self._fallback_pos = 0
+        return self._fallback
+
+    def grab(self):
+        if self.pos in self.clip:
+            self._grabbed = self.clip.frame(self.pos)
+        else:
+            cap = self._source()
+            if self._fallback_pos != self.pos:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.pos)
+            if not cap.grab():
+                self._grabbed = None
+                return False
+            self._fallback_pos = self.pos + 1
+            self._grabbed = cap
+        self.pos += 1
+        return True
+
+    def retrieve(self, image=None):
+        grabbed, self._grabbed = self._grabbed, None
+        if grabbed is None:
+            return False, None
+        if isinstance(grabbed, np.ndarray):
+            return True, grabbed
+        return grabbed.retrieve(image)
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.pos = max(0, int(value))
+            return True
+        return self._source().set(prop, value)
+
+    def get(self, prop):
+        meta = self.clip.meta
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(meta["frame_count"])
+        if prop == cv2.CAP_PROP_FPS:
+            return float(meta["fps"])
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(meta["width"])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(meta["height"])
+        return self._source().get(prop)
+
+    def release(self):
+        if self._fallback is not None:
+            self._fallback.release()
+            self._fallback = None
+        self._grabbed = None
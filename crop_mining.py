@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Belirsiz tespitlerden veri seti örneği toplama
+Oynatma veya dışa aktarma sırasında, güveni belirli bir aralıkta kalan (modelin emin
+olmadığı) tespitleri sınıf filtresi, takip ID'si yeniliği ve sınıf başına hız sınırıyla
+örnekler. Seçilen karelerin tamamı YOLO biçimli etiketleriyle, nesneler ayrıca kesit
+(crop) olarak kaydedilir. Kare thread'inde sadece vektörel seçim ve seçilen karenin
+kopyası yapılır; JPEG/PNG kodlama ve disk yazma sınırlı bir kuyruktan beslenen arka
+plan thread'lerinde çalışır. Kuyruk doluysa örnek atılır, çağıran asla beklemez.
+
+Çıktı yapısı (<klasör>/):
+    images/<kaynak>_<kare>.jpg          - tam kare (çizimsiz)
+    labels/<kaynak>_<kare>.txt          - karedeki tüm tespitler: sınıf cx cy w h (0-1)
+    crops/<sınıf>/<kaynak>_<kare>_<id>.jpg - seçilen nesnelerin kesitleri
+    data.yaml                           - sınıf isimleri (Ultralytics veri seti biçimi)
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+
+import cv2
+import numpy as np
+import yaml
+
+MINE_CONF_BAND = (0.25, 0.60)  # Bu güven aralığındaki tespitler örneklenir [alt, üst)
+MINE_CLASS_RATE = 1.0  # Sınıf başına saniyede en fazla kesit (video zamanı)
+MINE_TRACK_REFRESH = 10.0  # Aynı takip ID'si bu kadar saniye (video zamanı) içinde tekrar örneklenmez
+MINE_CROP_PAD = 0.1  # Kesit kenar payı (kutu boyutuna oranla)
+MINE_QUEUE_SIZE = 16  # Yazılmayı bekleyen en fazla kare (1080p'de ~100 MB)
+MINE_WORKERS = 2  # Kodlama/yazma thread sayısı (cv2.imwrite GIL'i bırakır)
+MINE_FORMATS = ("jpg", "png")
+MINE_JPEG_QUALITY = 95
+MINE_TRACK_MEMORY = 4096  # Hatırlanan takip ID'si sayısı bunu aşınca eskiler unutulur
+
+
+def default_mine_dir(video_path=None):
+    """Videonun yanındaki <video>_mined klasörü (webcam için çalışma dizininde zaman damgalı)"""
+    if video_path:
+        return os.path.splitext(video_path)[0] + "_mined"
+    return os.path.abspath(f"cenkervision_mined_{time.strftime('%Y%m%d_%H%M%S')}")
+
+
+def parse_band(text):
+    """'0.25:0.6' -> (0.25, 0.6); boş metin varsayılan aralık"""
+    if not text:
+        return MINE_CONF_BAND
+    low, _, high = text.partition(":")
+    band = (float(low), float(high) if high else 1.0)
+    if not 0.0 <= band[0] < band[1] <= 1.0:
+        raise ValueError(f"Geçersiz güven aralığı: {text}")
+    return band
+
+
+def _safe_name(text):
+    """Dosya/klasör adında kullanılabilir metin"""
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_") or "x"
+
+
+def yolo_labels(boxes, classes, frame_shape):
+    """Kutuları YOLO etiket satırlarına çevir: 'sınıf cx cy w h' (kareye göre 0-1)"""
+    h, w = frame_shape[:2]
+    if len(boxes) == 0:
+        return ""
+    xyxy = np.clip(boxes.astype(np.float64), 0, [w, h, w, h])
+    cx = (xyxy[:, 0] + xyxy[:, 2]) * 0.5 / w
+    cy = (xyxy[:, 1] + xyxy[:, 3]) * 0.5 / h
+    bw = (xyxy[:, 2] - xyxy[:, 0]) / w
+    bh = (xyxy[:, 3] - xyxy[:, 1]) / h
+    return "".join(f"{int(c)} {x:.6f} {y:.6f} {bw_:.6f} {bh_:.6f}\n"
+                   for c, x, y, bw_, bh_ in zip(classes.tolist(), cx, cy, bw, bh) if bw_ > 0 and bh_ > 0)
+
+
+class CropMiner:
+    """
+    Örnek toplayıcı. submit() kare thread'inden (oynatma/dışa aktarma) çağrılır; seçim
+    yoksa kopya bile yapılmaz. Sayaçlar (saved_frames, saved_crops, limited, dropped)
+    başka thread'lerden okunabilir; close() kuyruğu boşaltıp data.yaml'ı yazar.
+    """
+
+    def __init__(self, directory, band=MINE_CONF_BAND, classes=None, rate=MINE_CLASS_RATE,
+                 track_refresh=MINE_TRACK_REFRESH, image_format="jpg", workers=MINE_WORKERS,
+                 queue_size=MINE_QUEUE_SIZE, source=None):
+        if image_format not in MINE_FORMATS:
+            raise ValueError(f"Desteklenmeyen görüntü biçimi: {image_format}")
+        self.directory = os.path.abspath(directory)
+        self.band = band
+        self.classes = {c.strip() for c in classes} if classes else None  # Sınıf adları veya numaraları
+        self.rate = rate
+        self.track_refresh = track_refresh
+        self.image_format = image_format
+        self.workers = workers
+        self.queue_size = queue_size
+        self.stem = "frame"
+        self.saved_frames = 0
+        self.saved_crops = 0
+        self.limited = 0  # Hız sınırı veya takip yeniliği yüzünden atlanan aday
+        self.dropped = 0  # Kuyruk dolu olduğu için atılan kare
+        self.errors = 0
+        self.names = {}
+
+        self._tokens = {}  # Sınıf -> (jeton, son zaman)
+        self._track_seen = {}  # Takip ID'si -> son örneklendiği zaman
+        self._allowed = (None, None)  # (names sözlüğü, izinli sınıf numaraları) önbelleği
+        self._last_frame = None
+        self._lock = threading.Lock()  # Sayaçlar ve isimler (yazıcı thread'leri)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        if source is not None:
+            self.set_source(source)
+        for sub in ("images", "labels", "crops"):
+            os.makedirs(os.path.join(self.directory, sub), exist_ok=True)
+        for i in range(workers):
+            thread = threading.Thread(target=self._run, name=f"CropMiner-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def clone(self, source=None):
+        """Aynı ayarlarla ayrı bir toplayıcı (ör. dışa aktarma thread'i için)"""
+        return CropMiner(self.directory, self.band, self.classes, self.rate, self.track_refresh,
+                         self.image_format, self.workers, self.queue_size, source=source)
+
+    def set_source(self, source):
+        """Dosya adlarının öneki: video adı veya webcam için zaman damgalı ad"""
+        if isinstance(source, int) or str(source).isdigit():
+            self.stem = f"webcam{source}_{time.strftime('%Y%m%d_%H%M%S')}"
+        else:
+            self.stem = _safe_name(os.path.splitext(os.path.basename(str(source)))[0])
+        self._tokens.clear()
+        self._track_seen.clear()
+        self._last_frame = None
+
+    def _allowed_classes(self, names):
+        """Sınıf filtresini (ad veya numara) bu modelin sınıf numaralarına çevir"""
+        if self.classes is None:
+            return None
+        cached_names, allowed = self._allowed
+        if cached_names is not names:
+            allowed = {int(c) for c, name in names.items() if str(c) in self.classes or str(name) in self.classes}
+            allowed.update(int(c) for c in self.classes if c.isdigit())
+            self._allowed = (names, allowed)
+        return allowed
+
+    def _take_token(self, cls_id, t):
+        """Sınıfın jeton kovasından bir kesit hakkı al (geri sarmada kova sıfırlanır)"""
+        burst = max(1.0, self.rate)
+        tokens, last = self._tokens.get(cls_id, (burst, t))
+        if t < last:
+            tokens, last = burst, t
+        tokens = min(burst, tokens + (t - last) * self.rate)
+        if tokens < 1.0:
+            self._tokens[cls_id] = (tokens, t)
+            return False
+        self._tokens[cls_id] = (tokens - 1.0, t)
+        return True
+
+    def _novel_track(self, track_id, t):
+        last = self._track_seen.get(track_id)
+        return last is None or abs(t - last) >= self.track_refresh
+
+    def select(self, detections, timestamp):
+        """Örneklenecek tespitlerin indeksleri (boş dizi: bu karede örnek yok)"""
+        conf = detections.conf
+        candidates = np.flatnonzero((conf >= self.band[0]) & (conf < self.band[1]))
+        if len(candidates) == 0:
+            return candidates
+        allowed = self._allowed_classes(detections.names)
+        cls = detections.cls
+        track_ids = detections.track_id
+        chosen = []
+        for i in candidates.tolist():
+            cls_id = int(cls[i])
+            if allowed is not None and cls_id not in allowed:
+                continue
+            track_id = int(track_ids[i])
+            if track_id >= 0 and not self._novel_track(track_id, timestamp):
+                self.limited += 1
+                continue
+            if not self._take_token(cls_id, timestamp):
+                self.limited += 1
+                continue
+            if track_id >= 0:
+                self._track_seen[track_id] = timestamp
+            chosen.append(i)
+        if len(self._track_seen) > MINE_TRACK_MEMORY:
+            self._track_seen = {k: v for k, v in self._track_seen.items() if abs(timestamp - v) < self.track_refresh}
+        return np.array(chosen, dtype=np.int64)
+
+    def submit(self, frame, detections, frame_idx, timestamp=None):
+        """
+        Karenin tespitlerinden örnek seç ve yazma kuyruğuna at; hemen döner. Kare sadece
+        örnek seçilirse kopyalanır (çağıran kareyi sonradan üzerine çizebilir). Aynı kare
+        (ör. eşik değişince yeniden işleme) ikinci kez örneklenmez.
+        """
+        if detections is None or len(detections) == 0 or frame_idx == self._last_frame:
+            return 0
+        self._last_frame = frame_idx
+        if self._queue.full():
+            # Yazıcılar geride: kopya ve seçim yapılmaz, hız sınırı jetonları harcanmaz
+            with self._lock:
+                self.dropped += 1
+            return 0
+        t = timestamp if timestamp is not None else time.monotonic()
+        chosen = self.select(detections, t)
+        if len(chosen) == 0:
+            return 0
+        job = (frame.copy(), frame_idx, detections.xyxy, detections.cls, detections.track_id, chosen,
+               detections.names)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return 0
+        return len(chosen)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._write(*job)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"Örnek yazma hatası: {e}")
+
+    def _write(self, frame, frame_idx, boxes, classes, track_ids, chosen, names):
+        params = [cv2.IMWRITE_JPEG_QUALITY, MINE_JPEG_QUALITY] if self.image_format == "jpg" else []
+        ext = "." + self.image_format
+        base = f"{self.stem}_{frame_idx:06d}"
+        h, w = frame.shape[:2]
+
+        crops = 0
+        for i in chosen.tolist():
+            x1, y1, x2, y2 = boxes[i].tolist()
+            pad_x, pad_y = (x2 - x1) * MINE_CROP_PAD, (y2 - y1) * MINE_CROP_PAD
+            x1, y1 = max(0, int(x1 - pad_x)), max(0, int(y1 - pad_y))
+            x2, y2 = min(w, int(round(x2 + pad_x))), min(h, int(round(y2 + pad_y)))
+            if x2 <= x1 or y2 <= y1:
+                continue
+            cls_id = int(classes[i])
+            class_dir = os.path.join(self.directory, "crops", _safe_name(names.get(cls_id, cls_id)))
+            os.makedirs(class_dir, exist_ok=True)
+            track_id = int(track_ids[i])
+            suffix = f"id{track_id}" if track_id >= 0 else f"n{i}"
+            if cv2.imwrite(os.path.join(class_dir, f"{base}_{suffix}{ext}"), frame[y1:y2, x1:x2], params):
+                crops += 1
+
+        if not cv2.imwrite(os.path.join(self.directory, "images", base + ext), frame, params):
+            raise RuntimeError(f"Görüntü yazılamadı: {base}{ext}")
+        with open(os.path.join(self.directory, "labels", base + ".txt"), "w") as f:
+            f.write(yolo_labels(boxes, classes, frame.shape))
+        with self._lock:
+            self.saved_frames += 1
+            self.saved_crops += crops
+            self.names.update(names)
+
+    def summary(self):
+        text = f"{self.saved_frames} kare, {self.saved_crops} kesit"
+        if self.dropped:
+            text += f", {self.dropped} kare atlandı (kuyruk dolu)"
+        if self.errors:
+            text += f", {self.errors} hata"
+        return text
+
+    def write_dataset_yaml(self):
+        """data.yaml'ı sınıf isimleriyle yaz (önceki oturumların isimleri korunur)"""
+        path = os.path.join(self.directory, "data.yaml")
+        names = {}
+        try:
+            with open(path, "r") as f:
+                names.update((yaml.safe_load(f) or {}).get("names") or {})
+        except (OSError, yaml.YAMLError):
+            pass
+        with self._lock:
+            names.update({int(c): str(n) for c, n in self.names.items()})
+        data = {"path": self.directory, "train": "images", "val": "images",
+                "names": {int(c): str(n) for c, n in sorted(names.items())}}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+        os.replace(tmp, path)
+
+    def close(self):
+        """Kuyruktaki örnekleri yaz, thread'leri durdur ve data.yaml'ı güncelle"""
+        if not self._threads:
+            return
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.saved_frames:
+            self.write_dataset_yaml()
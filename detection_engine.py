@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Tespit motoru
+YOLO modelinin yüklenmesi, cihaz seçimi ve kare başına çıkarım (tespit/takip).
+Tkinter'a bağımlı değildir; oynatıcı ve başsız (headless) işler (dışa aktarma,
+toplu işleme vb.) aynı motoru kullanır.
+"""
+
+import os
+import time
+from collections import deque
+
+import cv2
+
+from tracing import TRACER
+
+# Ağır çıkarım bağımlılıkları (torch/ultralytics) ilk ihtiyaçta yüklenir;
+# inceleme modunda (tespitler depodan okunurken) hiç yüklenmez.
+torch = None
+YOLO = None
+
+DEFAULT_MODELS = ["yolov8n.pt", "yolov8s.pt", "yolov8m.pt", "yolov8l.pt", "yolov8x.pt"]
+PROCESS_HEIGHT = 720  # Bu yükseklikten büyük kareler çıkarımdan önce küçültülür
+# Dışa aktarılmış arka uçların model dosyası/dizini son ekleri (ultralytics adlandırması)
+EXPORT_SUFFIXES = {"onnx": ".onnx", "openvino": "_openvino_model"}
+ADAPTIVE_LEVELS = (320, 480, 640, 960)  # Uyarlamalı çözünürlük basamakları (imgsz)
+
+
+def load_inference_backend():
+    """torch ve ultralytics modüllerini ilk kullanımda içe aktar"""
+    global torch, YOLO
+    if YOLO is None:
+        import torch as _torch
+        from ultralytics import YOLO as _YOLO
+        torch, YOLO = _torch, _YOLO
+    return torch, YOLO
+
+
+def select_device(force_cpu=False):
+    """Kullanılacak cihazı belirle (MPS, CUDA veya CPU)"""
+    if force_cpu:
+        print("CPU kullanımı manuel olarak zorlandı.")
+        return "cpu"
+
+    load_inference_backend()
+    if torch.backends.mps.is_available():
+        try:
+            # MPS kullanılabilirliğini daha detaylı kontrol et
+            torch.zeros(1).to("mps")
+            print("Apple Silicon MPS (Metal Performance Shaders) kullanılıyor")
+            print("MPS cihazı hazır:", torch.backends.mps.is_built())
+            return "mps"
+        except Exception as e:
+            print(f"MPS kullanılabilir ancak bir hata oluştu: {e}")
+            print("CPU'ya düşüyor...")
+            return "cpu"
+    elif torch.cuda.is_available():
+        print("NVIDIA CUDA GPU kullanılıyor")
+        return "cuda"
+    else:
+        print("CPU kullanılıyor")
+        return "cpu"
+
+
+def empty_device_cache():
+    """GPU belleğini serbest bırak (torch yüklenmemişse bir şey yapmaz)"""
+    import gc
+    gc.collect()
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def set_threads(threads=None, interop_threads=None):
+    """
+    torch intra-op ve inter-op thread sayılarını ayarla. inter-op sayısı torch'ta
+    ilk paralel işten sonra değiştirilemez; bu durumda sessizce atlanır.
+    """
+    load_inference_backend()
+    if threads:
+        torch.set_num_threads(int(threads))
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(int(interop_threads))
+        except RuntimeError:
+            pass
+
+
+def get_threads():
+    """Geçerli torch intra-op thread sayısı"""
+    load_inference_backend()
+    return torch.get_num_threads()
+
+
+def exported_backend(model_path):
+    """Dosya/dizin adı dışa aktarılmış bir modeli gösteriyorsa arka ucunu, değilse None döndür"""
+    path = model_path.rstrip("/\\")
+    for backend, suffix in EXPORT_SUFFIXES.items():
+        if path.endswith(suffix):
+            return backend
+    return None
+
+
+def export_model(model_path, backend):
+    """Modeli verilen arka uca (ör. onnx) bir kez dışa aktar ve dosya yolunu döndür"""
+    exported = os.path.splitext(model_path)[0] + EXPORT_SUFFIXES[backend]
+    if not os.path.exists(exported):
+        load_inference_backend()
+        exported = YOLO(model_path).export(format=backend, dynamic=True)
+    return exported
+
+
+def default_tracker_config_path():
+    """Projedeki ByteTrack yapılandırma dosyası, yoksa ultralytics varsayılanı"""
+    local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trackers", "bytetrack.yaml")
+    return local_path if os.path.exists(local_path) else "bytetrack.yaml"
+
+
+class AdaptiveResolution:
+    """
+    Ölçülen çıkarım gecikmesini kare bütçesiyle karşılaştırıp imgsz basamağını
+    histerezisle değiştirir. Pencere medyanı bütçeyi aşarsa bir basamak iner; bir üst
+    basamağın tahmini gecikmesi (piksel sayısıyla orantılı) bütçenin up_margin katının
+    altında kalıyorsa bir basamak çıkar. Her değişiklikten sonra pencere yeniden dolana
+    kadar karar verilmez.
+    """
+
+    def __init__(self, budget, levels=ADAPTIVE_LEVELS, start=640, window=15, up_margin=0.7):
+        self.budget = budget  # Kare başına çıkarım bütçesi (sn)
+        self.levels = tuple(sorted(levels))
+        self.index = self.levels.index(start) if start in self.levels else len(self.levels) // 2
+        self.up_margin = up_margin
+        self.samples = deque(maxlen=window)
+
+    @property
+    def imgsz(self):
+        return self.levels[self.index]
+
+    def update(self, latency):
+        """Son çıkarım süresini (sn) kaydet; basamak değiştiyse True döndür"""
+        self.samples.append(latency)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        ordered = sorted(self.samples)
+        median = ordered[len(ordered) // 2]
+
+        if median > self.budget and self.index > 0:
+            self.index -= 1
+        elif self.index < len(self.levels) - 1:
+            scale = (self.levels[self.index + 1] / self.imgsz) ** 2
+            if median * scale < self.budget * self.up_margin:
+                self.index += 1
+            else:
+                return False
+        else:
+            return False
+        self.samples.clear()
+        return True
+
+
+class DetectionEngine:
+    """
+    Tek bir YOLO modelini ve onun takip durumunu sarar.
+    Takip durumu modele bağlı olduğundan, aynı anda iki farklı video akışı
+    (ör. oynatma ve dışa aktarma) için ayrı motor örnekleri kullanılmalıdır.
+    """
+
+    def __init__(self, models_dir=None, device=None, force_cpu=False, debug=False,
+                 process_height=PROCESS_HEIGHT):
+        self.models_dir = models_dir
+        self.device = device
+        self.force_cpu = force_cpu
+        self.debug = debug
+        self.process_height = process_height
+        self.model = None
+        self.model_name = None
+        self.tracker_config_path = default_tracker_config_path()
+        self.tracking_failed = False  # Son çağrıda takip hatası olup normal tespite düşüldü mü
+        self.last_inference_time = 0.0
+        self.imgsz = None  # Çıkarım görüntü boyutu (None: ultralytics varsayılanı, 640)
+        self.batch = 1  # Toplu işlerde bir çağrıda işlenecek kare sayısı
+        self.backend = "pytorch"  # pytorch veya dışa aktarılmış arka uç (ör. onnx)
+        self.adaptive = None  # AdaptiveResolution; açıksa imgsz'yi gecikme bütçesine göre seçer
+
+    def resolve_model_path(self, model_name):
+        """Özel modeller dizinindeki dosyayı, yoksa ultralytics model adını döndür"""
+        if self.models_dir:
+            custom_path = os.path.join(self.models_dir, model_name)
+            if os.path.exists(custom_path):
+                return custom_path
+        return model_name
+
+    def load_model(self, model_name, backend=None):
+        """Modeli yükle ve seçilen cihaza taşı; hata durumunda istisna fırlatır"""
+        load_inference_backend()
+        if self.device is None:
+            self.device = select_device(self.force_cpu)
+        backend = backend or self.backend
+
+        model_path = self.resolve_model_path(model_name)
+        if exported_backend(model_path):
+            # Zaten dışa aktarılmış model (ör. yolov8n_int8.onnx) doğrudan yüklenir
+            backend = exported_backend(model_path)
+        elif backend != "pytorch":
+            model_path = export_model(model_path, backend)
+        model = YOLO(model_path)
+        self.backend = backend
+
+        # Modeli seçilen cihaza taşı (dışa aktarılmış arka uçlar kendi cihaz seçimini yapar)
+        if self.device != "cpu" and backend == "pytorch":
+            try:
+                print(f"Model {self.device} cihazına taşınıyor...")
+                model.to(self.device)
+                print(f"Model başarıyla {self.device} cihazına taşındı!")
+            except Exception as e:
+                print(f"Model {self.device} cihazına taşınırken hata: {e}")
+                print("Güvenli mod: Model CPU'da kalacak")
+                self.device = "cpu"
+
+        self.model = model
+        self.model_name = model_name
+        return model
+
+    def apply_profile(self, profile):
+        """Otomatik ayar profilini (thread, imgsz, batch, arka uç) uygula; arka uç değiştiyse model yeniden yüklenir"""
+        set_threads(profile.get("threads"), profile.get("interop_threads"))
+        self.imgsz = profile.get("imgsz", self.imgsz)
+        self.batch = profile.get("batch", self.batch)
+        self.process_height = profile.get("process_height", self.process_height)
+        backend = profile.get("backend", self.backend)
+        if backend != self.backend and self.model_name is not None:
+            self.load_model(self.model_name, backend)
+
+    def predict_args(self, conf, iou):
+        """model()/model.track() için ortak argümanlar"""
+        args = {"conf": conf, "iou": iou}
+        imgsz = self.adaptive.imgsz if self.adaptive is not None else self.imgsz
+        if imgsz:
+            args["imgsz"] = imgsz
+        return args
+
+    def prepare(self, frame):
+        """
+        Kareyi çıkarım çözünürlüğüne küçült; (kare, (ölçek_w, ölçek_h)) döndür. Uyarlamalı
+        çözünürlük process_height'tan büyük bir basamaktaysa kare o basamağın uzun kenarına
+        kadar korunur; aksi halde büyük basamak sadece letterbox'ı büyütür, detay kazandırmaz.
+        """
+        h, w = frame.shape[:2]
+        target_h = self.process_height
+        if target_h and self.adaptive is not None:
+            target_h = max(target_h, int(round(self.adaptive.imgsz * h / max(w, h))))
+        if target_h and h > target_h:
+            target_w = int(w * target_h / h)
+            # Hız için INTER_LINEAR kullan
+            resized = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+            if self.debug:
+                print(f"Frame boyutlandırıldı: {w}x{h} -> {target_w}x{target_h}")
+            return resized, (w / target_w, h / target_h)
+        return frame, (1.0, 1.0)
+
+    def infer(self, frame, conf, iou, track=False):
+        """
+        Kare üzerinde tespit veya takip çalıştır; (results, scale_ratios) döndür.
+        Takip hatasında normal tespite, cihaz hatasında CPU'ya düşer
+        (tracking_failed bayrağı ayarlanır). Her iki deneme de başarısızsa istisna fırlatır.
+        """
+        with TRACER.span("preprocess", "engine"):
+            process_frame, scale_ratios = self.prepare(frame)
+        self.tracking_failed = False
+        t_start = time.time()
+
+        try:
+            if track:
+                try:
+                    # Ultralytics tespit ve ByteTrack güncellemesini tek çağrıda yapar
+                    with TRACER.span("model+track", "engine"):
+                        results = self.model.track(
+                            process_frame,
+                            persist=True,  # Takip ID'lerini sonraki frameler için sakla
+                            tracker=self.tracker_config_path,  # ByteTrack yapılandırması
+                            **self.predict_args(conf, iou)
+                        )
+                except Exception as track_error:
+                    # ByteTrack hatası durumunda normal predict() metodunu kullan
+                    error_str = str(track_error)
+                    print(f"ByteTrack hatası, normal tespit kullanılıyor: {error_str}" if error_str
+                          else "ByteTrack hatası, normal tespit kullanılıyor")
+                    self.tracking_failed = True
+                    with TRACER.span("model", "engine"):
+                        results = self.model(process_frame, **self.predict_args(conf, iou))
+            else:
+                with TRACER.span("model", "engine"):
+                    results = self.model(process_frame, **self.predict_args(conf, iou))
+        except Exception as e:
+            # Ana hata yakalama: CPU'da ve takipsiz tekrar dene
+            print(f"Model çalıştırma hatası: {str(e)}")
+            self.device = "cpu"
+            self.tracking_failed = track
+            t_start = time.time()
+            with TRACER.span("model", "engine", fallback="cpu"):
+                results = self.model(process_frame, **self.predict_args(conf, iou))
+
+        self.last_inference_time = time.time() - t_start
+        if self.debug:
+            print(f"YOLO çıkarım süresi: {self.last_inference_time*1000:.1f} ms")
+        if self.adaptive is not None and self.adaptive.update(self.last_inference_time):
+            print(f"Uyarlamalı çözünürlük: imgsz {self.adaptive.imgsz}")
+        return results, scale_ratios
+
+    def infer_batch(self, frames, conf, iou):
+        """
+        Kareleri tek çağrıda (takipsiz) işle; kare başına (results, scale_ratios) listesi döndür.
+        Toplu işler ve otomatik ayar ölçümleri için.
+        """
+        with TRACER.span("preprocess", "engine", batch=len(frames)):
+            prepared = [self.prepare(frame) for frame in frames]
+        t_start = time.time()
+        with TRACER.span("model", "engine", batch=len(frames)):
+            results = self.model([p[0] for p in prepared], **self.predict_args(conf, iou))
+        self.last_inference_time = time.time() - t_start
+        return [([r], p[1]) for r, p in zip(results, prepared)]
+
+    def reset_tracker(self):
+        """Takip durumunu sıfırla (yeni video veya seek sonrası)"""
+        predictor = getattr(self.model, "predictor", None)
+        if predictor is not None and hasattr(predictor, "trackers"):
+            for tracker in predictor.trackers:
+                tracker.reset()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Tespit kayıt deposu
+Kare başına tespitleri (kare no, zaman, xyxy, sınıf, güven, takip ID) sütun
+bazlı ham ikili dosyalara parça parça ekleyen akış yazıcısı ve bu dosyaları
+bellek eşlemeli (memory-mapped) olarak açan okuyucu.
+
+Depo yapısı (<video>.cvdet/ dizini):
+    meta.json       - sürüm, kaynak bilgisi, sınıf isimleri, sütun tipleri
+    <sütun>.bin     - her sütun için ardışık ham NumPy verisi
+    index.bin       - kare başına (kare no, ilk satır, satır sayısı, zaman)
+"""
+
+import os
+import json
+import queue
+import threading
+
+import numpy as np
+
+STORE_VERSION = 1
+STORE_SUFFIX = ".cvdet"
+DEFAULT_CHUNK_ROWS = 65536  # Diske yazmadan önce biriktirilecek satır sayısı
+DEFAULT_QUEUE_FRAMES = 256  # Yazıcı kuyruğundaki maksimum kare sayısı (bellek sınırı)
+
+# Sütun adı -> (dtype, satır başına şekil)
+COLUMNS = {
+    "frame": (np.int32, ()),
+    "t": (np.float64, ()),
+    "xyxy": (np.float32, (4,)),
+    "cls": (np.int16, ()),
+    "conf": (np.float32, ()),
+    "track_id": (np.int32, ()),  # Takip yoksa -1
+}
+
+INDEX_DTYPE = np.dtype([("frame", np.int32), ("start", np.int64), ("count", np.int32), ("t", np.float64)])
+
+
+def default_store_path(video_path):
+    """Video dosyasının yanındaki varsayılan depo yolu"""
+    return os.path.splitext(video_path)[0] + STORE_SUFFIX
+
+
+def results_to_arrays(results, scale_ratios=None):
+    """
+    Ultralytics Results nesnesini orijinal kare koordinatlarında NumPy dizilerine çevir.
+    (xyxy, cls, conf, track_id) döndürür; tespit yoksa boş diziler.
+    """
+    if not results or results[0].boxes is None or len(results[0].boxes) == 0:
+        return (np.empty((0, 4), np.float32), np.empty(0, np.int16),
+                np.empty(0, np.float32), np.empty(0, np.int32))
+
+    boxes = results[0].boxes
+    xyxy = boxes.xyxy.cpu().numpy().astype(np.float32)
+    if scale_ratios is not None and scale_ratios != (1.0, 1.0):
+        xyxy[:, [0, 2]] *= scale_ratios[0]
+        xyxy[:, [1, 3]] *= scale_ratios[1]
+    cls = boxes.cls.cpu().numpy().astype(np.int16)
+    conf = boxes.conf.cpu().numpy().astype(np.float32)
+    if boxes.id is not None:
+        track_id = boxes.id.cpu().numpy().astype(np.int32)
+    else:
+        track_id = np.full(len(xyxy), -1, dtype=np.int32)
+    return xyxy, cls, conf, track_id
+
+
+def results_to_masks(results):
+    """
+    Segmentasyon maskelerini (N, h, w) uint8 olarak döndür (yoksa None). Maskeler model girişi
+    çözünürlüğünde kalır, sadece letterbox dolgusu kırpılır; böylece tüm kareyi kaplarlar ve
+    ekran çözünürlüğüne çizim sırasında bir kez büyütülürler.
+    """
+    if not results or getattr(results[0], "masks", None) is None or len(results[0].masks) == 0:
+        return None
+    data = results[0].masks.data
+    mh, mw = data.shape[1:]
+    oh, ow = results[0].orig_shape[:2]
+    gain = min(mh / oh, mw / ow)
+    pad_w, pad_h = (mw - ow * gain) / 2, (mh - oh * gain) / 2
+    top, left = int(round(pad_h - 0.1)), int(round(pad_w - 0.1))
+    bottom, right = int(round(mh - pad_h + 0.1)), int(round(mw - pad_w + 0.1))
+    # Eşikleme ve kırpma cihazda yapılır; CPU'ya sadece uint8 kopya gelir
+    return (data[:, top:bottom, left:right] > 0.5).byte().cpu().numpy()
+
+
+def results_to_keypoints(results, scale_ratios=None):
+    """Poz noktalarını orijinal kare koordinatlarında (N, K, 3) float32 (x, y, güven) döndür (yoksa None)"""
+    if not results or getattr(results[0], "keypoints", None) is None or len(results[0].keypoints) == 0:
+        return None
+    keypoints = results[0].keypoints.data.cpu().numpy().astype(np.float32)
+    if keypoints.shape[-1] == 2:  # Güven değeri olmayan modeller
+        keypoints = np.concatenate([keypoints, np.ones(keypoints.shape[:-1] + (1,), np.float32)], axis=-1)
+    if scale_ratios is not None and scale_ratios != (1.0, 1.0):
+        keypoints[..., 0] *= scale_ratios[0]
+        keypoints[..., 1] *= scale_ratios[1]
+    return keypoints
+
+
+class Detections:
+    """
+    Bir karenin tespitleri için kompakt kayıt (orijinal kare koordinatlarında).
+    Sadece çizim ve dışa aktarma için gereken dizileri tutar; Ultralytics Results
+    nesnesinin aksine tensör, cihaz belleği veya kaynak görüntüye referans içermez.
+    Çıkarım thread'inde oluşturulur; kuyruk, önbellekler ve dışa aktarıcılar bunu kullanır.
+    Segmentasyon/poz modellerinde maskeler ve poz noktaları da tutulur (depoya yazılmaz).
+    Eklentilerin çıkarım thread'inde ürettiği çizim komutları overlay'de taşınır.
+    """
+
+    __slots__ = ("xyxy", "cls", "conf", "track_id", "names", "masks", "keypoints", "overlay")
+
+    def __init__(self, xyxy, cls, conf, track_id=None, names=None, masks=None, keypoints=None, overlay=None):
+        self.xyxy = xyxy  # (N, 4) float32
+        self.cls = cls  # (N,) int16
+        self.conf = conf  # (N,) float32
+        self.track_id = track_id if track_id is not None else np.full(len(xyxy), -1, dtype=np.int32)
+        self.names = names if names is not None else {}  # Sınıf isimleri (model/depo ile paylaşılır)
+        self.masks = masks  # (N, h, w) uint8, tüm kareyi kaplayan düşük çözünürlüklü maskeler veya None
+        self.keypoints = keypoints  # (N, K, 3) float32 (x, y, güven) veya None
+        self.overlay = overlay  # Eklenti çizim komutları [(tür, argümanlar), ...] veya None
+
+    @classmethod
+    def empty(cls, names=None):
+        return cls(np.empty((0, 4), np.float32), np.empty(0, np.int16), np.empty(0, np.float32),
+                   np.empty(0, np.int32), names)
+
+    @classmethod
+    def from_results(cls, results, scale_ratios=None, track=True):
+        """Ultralytics sonucunu kayda çevir (cihazdan tek seferlik kopya); track=False ise ID'ler -1"""
+        names = results[0].names if results and hasattr(results[0], "names") else {}
+        xyxy, classes, conf, track_id = results_to_arrays(results, scale_ratios)
+        return cls(xyxy, classes, conf, track_id if track else None, names,
+                   results_to_masks(results), results_to_keypoints(results, scale_ratios))
+
+    def __len__(self):
+        return len(self.xyxy)
+
+    @property
+    def has_ids(self):
+        return len(self.track_id) > 0 and bool((self.track_id >= 0).any())
+
+    def select(self, mask):
+        """Maske/indeksle seçilen tespitlerden yeni kayıt"""
+        return Detections(self.xyxy[mask], self.cls[mask], self.conf[mask], self.track_id[mask], self.names,
+                          self.masks[mask] if self.masks is not None else None,
+                          self.keypoints[mask] if self.keypoints is not None else None, self.overlay)
+
+    def arrays(self):
+        """(xyxy, cls, conf, track_id) - DetectionWriter.append ile aynı sıra"""
+        return self.xyxy, self.cls, self.conf, self.track_id
+
+
+class DetectionWriter:
+    """
+    Arka plan thread'inde çalışan akış yazıcısı.
+    append() sadece diziyi sınırlı bir kuyruğa koyar; disk G/Ç'si ve parça
+    birleştirme yazıcı thread'inde yapılır. Bellek kullanımı kuyruk boyutu ve
+    parça boyutu ile sınırlıdır.
+    """
+
+    def __init__(self, path, meta=None, chunk_rows=DEFAULT_CHUNK_ROWS, queue_frames=DEFAULT_QUEUE_FRAMES,
+                 resume=None):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.meta = dict(meta or {})
+        self.rows_written = 0
+        self.frames_written = 0
+        self.error = None
+
+        os.makedirs(path, exist_ok=True)
+        if resume is None:
+            # Var olan depo üzerine yazılır
+            mode = "wb"
+        else:
+            # Kaldığı yerden devam: dosyalar checkpoint() ile kaydedilmiş (satır, kare) sayısına kırpılır
+            self.rows_written, self.frames_written = (int(v) for v in resume)
+            for name, (dtype, shape) in COLUMNS.items():
+                row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+                self._truncate(os.path.join(path, name + ".bin"), self.rows_written * row_bytes)
+            self._truncate(os.path.join(path, "index.bin"), self.frames_written * INDEX_DTYPE.itemsize)
+            mode = "ab"
+        self._files = {name: open(os.path.join(path, name + ".bin"), mode) for name in COLUMNS}
+        self._index_file = open(os.path.join(path, "index.bin"), mode)
+        self._reset_chunk()
+        self._write_meta()
+
+        self._queue = queue.Queue(maxsize=queue_frames)
+        self._thread = threading.Thread(target=self._run, name="DetectionWriter", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _truncate(file_path, size):
+        with open(file_path, "ab") as f:
+            if f.tell() < size:
+                raise ValueError(f"Depo checkpoint'ten kısa, devam edilemez: {file_path}")
+            f.truncate(size)
+
+    def _reset_chunk(self):
+        self._chunk = {name: [] for name in COLUMNS}
+        self._chunk_index = []
+        self._chunk_size = 0
+
+    def append(self, frame_idx, timestamp, xyxy, cls, conf, track_id=None, block=True):
+        """Bir karenin tespitlerini ekle (boş kareler de indekslenir)"""
+        if self.error is not None:
+            raise RuntimeError(f"Tespit yazıcısı hatası: {self.error}")
+        self._queue.put((frame_idx, timestamp, xyxy, cls, conf, track_id), block=block)
+
+    def checkpoint(self):
+        """
+        Kuyruktaki her şeyi diske yaz ve bitmesini bekle; (satır, kare) sayısını döndür.
+        Bu değerler resume= ile verilerek yarıda kalan yazım tam bu noktadan sürdürülebilir.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self.error is not None:
+            raise RuntimeError(f"Tespit yazıcısı hatası: {self.error}")
+        return self.rows_written, self.frames_written
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                try:
+                    self._flush()
+                except Exception as e:
+                    self.error = e
+                item.set()
+                continue
+            try:
+                self._add(*item)
+                if self._chunk_size >= self.chunk_rows:
+                    self._flush()
+            except Exception as e:
+                self.error = e
+                print(f"Tespit yazıcısı hatası: {e}")
+        try:
+            self._flush()
+        except Exception as e:
+            self.error = e
+
+    def _add(self, frame_idx, timestamp, xyxy, cls, conf, track_id):
+        n = len(xyxy)
+        self._chunk_index.append((frame_idx, self.rows_written + self._chunk_size, n, timestamp))
+        if n:
+            if track_id is None:
+                track_id = np.full(n, -1, dtype=np.int32)
+            self._chunk["frame"].append(np.full(n, frame_idx, dtype=np.int32))
+            self._chunk["t"].append(np.full(n, timestamp, dtype=np.float64))
+            self._chunk["xyxy"].append(np.asarray(xyxy, dtype=np.float32).reshape(n, 4))
+            self._chunk["cls"].append(np.asarray(cls, dtype=np.int16))
+            self._chunk["conf"].append(np.asarray(conf, dtype=np.float32))
+            self._chunk["track_id"].append(np.asarray(track_id, dtype=np.int32))
+        self._chunk_size += n
+
+    def _flush(self):
+        """Birikmiş parçayı sütun dosyalarının sonuna ekle"""
+        if not self._chunk_index:
+            return
+        for name, parts in self._chunk.items():
+            if parts:
+                self._files[name].write(np.concatenate(parts).tobytes())
+            self._files[name].flush()
+        self._index_file.write(np.array(self._chunk_index, dtype=INDEX_DTYPE).tobytes())
+        self._index_file.flush()
+
+        self.rows_written += self._chunk_size
+        self.frames_written += len(self._chunk_index)
+        self._reset_chunk()
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = dict(self.meta)
+        meta.update({
+            "version": STORE_VERSION,
+            "rows": self.rows_written,
+            "frames": self.frames_written,
+            "columns": {name: [np.dtype(dt).str, list(shape)] for name, (dt, shape) in COLUMNS.items()},
+        })
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        """Kuyruğu boşalt, son parçayı yaz ve dosyaları kapat"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        for f in self._files.values():
+            f.close()
+        self._index_file.close()
+        if self.error is not None:
+            raise RuntimeError(f"Tespit yazıcısı hatası: {self.error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DetectionStore:
+    """
+    Bellek eşlemeli tespit deposu okuyucusu.
+    Sütunlar np.memmap olarak açılır; milyonlarca tespit belleğe kopyalanmadan
+    dilimlenebilir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version", 0) > STORE_VERSION:
+            raise ValueError(f"Desteklenmeyen depo sürümü: {self.meta.get('version')}")
+
+        self.names = {int(k): v for k, v in self.meta.get("names", {}).items()}
+        self.columns = {}
+        rows = None
+        for name, (dtype, shape) in self.meta["columns"].items():
+            arr = self._map(os.path.join(path, name + ".bin"), np.dtype(dtype), tuple(shape))
+            self.columns[name] = arr
+            rows = len(arr) if rows is None else min(rows, len(arr))
+        # Yarıda kalan yazımlarda sütunları ortak uzunluğa kırp
+        self.rows = rows or 0
+        for name in self.columns:
+            self.columns[name] = self.columns[name][:self.rows]
+        # Takipli kaydedildiyse ID'si olmayan karelerde de bölge ziyaretleri açık kalmalı.
+        # Yazıcılar bunu meta.json'a yazar; alanı olmayan eski depolarda ID sütunu taranır.
+        self.tracked = self.meta.get("tracked")
+        if self.tracked is None:
+            track_col = self.columns.get("track_id")
+            self.tracked = track_col is not None and len(track_col) > 0 and bool((track_col >= 0).any())
+
+        self.index = self._map(os.path.join(path, "index.bin"), INDEX_DTYPE, ())
+        valid = (self.index["start"] + self.index["count"]) <= self.rows
+        if not valid.all():
+            self.index = self.index[:int(np.argmin(valid))]
+
+        # Kare no -> indeks satırı doğrudan arama tablosu (O(1) seek).
+        # Aynı kare birden fazla yazıldıysa (geri sarma) son kayıt geçerlidir.
+        frames = np.asarray(self.index["frame"], dtype=np.int64)
+        self.frame_count = int(frames.max()) + 1 if len(frames) else 0
+        self._lookup = np.full(self.frame_count, -1, dtype=np.int64)
+        self._lookup[frames] = np.arange(len(frames))
+
+    @staticmethod
+    def _map(path, dtype, shape):
+        """Dosya boyutundan satır sayısını çıkararak memmap aç"""
+        row_bytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        n = size // row_bytes
+        if n == 0:
+            return np.empty((0,) + shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(n,) + shape)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def frame_rows(self, frame_idx):
+        """Bir kareye ait satır aralığını (start, stop) döndür, kare yoksa None"""
+        if frame_idx < 0 or frame_idx >= self.frame_count:
+            return None
+        pos = self._lookup[frame_idx]
+        if pos < 0:
+            return None
+        start = int(self.index["start"][pos])
+        return start, start + int(self.index["count"][pos])
+
+    def frame(self, frame_idx):
+        """Bir karenin tespitlerini Detections kaydı olarak döndür (memmap görünümleri), kare yoksa None"""
+        span = self.frame_rows(frame_idx)
+        if span is None:
+            return None
+        start, stop = span
+        c = self.columns
+        return Detections(c["xyxy"][start:stop], c["cls"][start:stop], c["conf"][start:stop],
+                          c["track_id"][start:stop], self.names)
+
+    def close(self):
+        """Memmap referanslarını bırak"""
+        self.columns = {}
+        self.index = None
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Olay günlüğü (Memory Bank entegrasyonu)
+Uygulama olayları UI/çıkarım thread'lerinden kuyruğa atılıp hemen dönülür; arka plan
+thread'i olayları toplu olarak yalnızca-ekleme (append-only) JSONL dosyasına yazar ve
+Memory Bank'taki "activeContext" belgesini sadece belirli aralıklarla son olaylardan
+yeniden oluşturur (sıkıştırma). Memory Bank başlatma belgeleri de bu thread'de yazılır.
+
+Başsız/üretim çalıştırmalarında --no-journal veya CENKERVISION_NO_JOURNAL=1 ile
+tamamen kapatılabilir; kapalıyken log() hiçbir iş yapmaz ve memory_bank içe aktarılmaz.
+"""
+
+import os
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from cache_paths import default_cache_dir
+
+JOURNAL_FILE = "events.jsonl"
+JOURNAL_QUEUE_SIZE = 1024  # Kuyruk dolarsa yeni olaylar atılır (çağıran asla beklemez)
+JOURNAL_FLUSH_INTERVAL = 2.0  # En geç bu kadar saniyede bir dosyaya yaz
+JOURNAL_FLUSH_SIZE = 64  # Bu kadar olay birikince beklemeden yaz
+JOURNAL_COMPACT_INTERVAL = 60.0  # activeContext belgesinin yeniden yazılma aralığı (sn)
+JOURNAL_CONTEXT_EVENTS = 20  # activeContext belgesine yazılan son olay sayısı
+
+
+def journal_disabled_by_env():
+    return os.environ.get("CENKERVISION_NO_JOURNAL", "").strip().lower() in ("1", "true", "yes")
+
+
+class EventJournal:
+    """
+    Engellemeyen, toplu yazan olay günlüğü.
+    setup: Memory Bank hazır olduğunda (arka plan thread'inde) bir kez çağrılır, setup(bank).
+    """
+
+    def __init__(self, path=None, enabled=True, setup=None, use_memory_bank=True,
+                 flush_interval=JOURNAL_FLUSH_INTERVAL, flush_size=JOURNAL_FLUSH_SIZE,
+                 compact_interval=JOURNAL_COMPACT_INTERVAL):
+        self.enabled = enabled and not journal_disabled_by_env()
+        self.path = path or os.path.join(default_cache_dir("journal"), JOURNAL_FILE)
+        self.setup = setup
+        self.use_memory_bank = use_memory_bank
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.compact_interval = compact_interval
+
+        self.bank = None
+        self.dropped = 0  # Kuyruk dolu olduğu için atılan olay sayısı
+        self.recent = deque(maxlen=JOURNAL_CONTEXT_EVENTS)
+        self._queue = queue.Queue(maxsize=JOURNAL_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._dirty = False  # Son sıkıştırmadan beri yeni olay var mı
+        self._thread = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, name="EventJournal", daemon=True)
+            self._thread.start()
+
+    def log(self, event_type, details):
+        """Olayı kuyruğa at ve hemen dön (kapalıysa veya kuyruk doluysa olay atılır)"""
+        if not self.enabled:
+            return
+        event = {"time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "type": event_type, "details": details}
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def query(self, text):
+        """Memory Bank'ta arama (hazır değilse hata sözlüğü)"""
+        if self.bank is None:
+            return {"error": "Memory Bank kullanılamıyor"}
+        return self.bank.query(text)
+
+    def close(self, timeout=2.0):
+        """Kalan olayları yaz, son sıkıştırmayı yap ve thread'i durdur"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _open_bank(self):
+        if not self.use_memory_bank:
+            return
+        try:
+            from memory_bank import MemoryBank
+            bank = MemoryBank()
+            if self.setup is not None:
+                self.setup(bank)
+            self.bank = bank
+        except Exception as e:
+            print(f"Memory Bank kullanılamıyor, sadece günlük dosyasına yazılacak: {e}")
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._open_bank()
+        batch = []
+        last_flush = last_compact = time.monotonic()
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                stopping = self._stop.is_set()
+                try:
+                    # Durdurulurken kuyrukta kalanlar beklemeden toplanır
+                    batch.append(self._queue.get_nowait() if stopping else self._queue.get(timeout=0.25))
+                    drained = False
+                except queue.Empty:
+                    drained = True
+                final = stopping and drained
+
+                now = time.monotonic()
+                if batch and (final or len(batch) >= self.flush_size or now - last_flush >= self.flush_interval):
+                    self._flush(f, batch)
+                    batch = []
+                    last_flush = now
+                if self._dirty and (final or now - last_compact >= self.compact_interval):
+                    self._compact()
+                    last_compact = now
+                if final:
+                    break
+
+    def _flush(self, f, batch):
+        f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch))
+        f.flush()
+        self.recent.extend(batch)
+        self._dirty = True
+
+    def _compact(self):
+        """activeContext belgesini son olaylardan tek seferde yeniden yaz"""
+        self._dirty = False
+        if self.bank is None:
+            return
+        last = self.recent[-1]
+        lines = "\n".join(f"- {e['time']} | {e['type']}: {e['details']}" for e in reversed(self.recent))
+        try:
+            self.bank.update_document(
+                "activeContext",
+                f"""# Aktif Bağlam
+
+## Son Olay
+- Tip: {last['type']}
+- Detaylar: {last['details']}
+- Zaman: {last['time']}
+
+## Son Olaylar
+{lines}
+"""
+            )
+        except Exception as e:
+            print(f"Error updating Memory Bank: {e}")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Hız/doğruluk değerlendirmesi
+Modelleri (ve varsa dışa aktarılmış/nicemlenmiş varyantlarını) yerel etiketli klipler
+üzerinde çalıştırır; bu makinedeki FPS ve gecikme yüzdeliklerini mAP/recall ile yan
+yana raporlar. Sonuçlar model_eval.yaml dosyasına yazılır; Pareto-optimal
+(hiçbir model hem daha hızlı hem daha doğru değil) satırlar işaretlenir ve oynatıcı
+model seçilirken bu tabloyu gösterir.
+
+Etiketli klip klasörü (her video için biri):
+    <isim>.mp4 + <isim>.gt.cvdet/   - tespit deposu biçiminde doğru etiketler
+    <isim>.mp4 + <isim>_labels/     - YOLO biçiminde kare başına .txt (ör. frame_000120.txt:
+                                      "sınıf cx cy w h", normalize); isteğe bağlı classes.txt
+Sadece etiketli kareler değerlendirilir (seyrek etiketleme yeterlidir).
+"""
+
+import os
+import re
+import glob
+import time
+
+import cv2
+import numpy as np
+import yaml
+
+from batch_ingest import scan_videos
+from cascade import box_iou
+from detection_engine import DEFAULT_MODELS, EXPORT_SUFFIXES
+from detection_store import DetectionStore, Detections, STORE_SUFFIX
+from video_decode import SEEK_MIN_STEP
+
+EVAL_FILE = "model_eval.yaml"
+EVAL_CONF = 0.25  # Hız ölçümü ve recall/precision için çalışma eşiği
+AP_CONF = 0.001  # mAP için düşük eşik (tüm PR eğrisi)
+EVAL_IOU = 0.45  # NMS IoU eşiği
+MATCH_IOUS = np.arange(0.5, 0.96, 0.05)  # mAP@0.5:0.95 eşleştirme eşikleri
+SPEED_FRAMES = 100  # Hız ölçümünde kullanılan kare sayısı
+WARMUP_FRAMES = 3
+
+
+def default_eval_path():
+    """Uygulama dizinindeki değerlendirme tablosu yolu"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), EVAL_FILE)
+
+
+def load_eval_table(path=None):
+    """{varyant: satır} sözlüğü, dosya yoksa boş"""
+    path = path or default_eval_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return data.get("results", {})
+
+
+def save_eval_table(results, path=None):
+    """Sonuçları mevcut tabloyla birleştir, Pareto işaretlerini yenile ve yaz"""
+    path = path or default_eval_path()
+    table = load_eval_table(path)
+    table.update(results)
+    mark_pareto(table)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"results": table}, f, allow_unicode=True, sort_keys=True)
+    os.replace(tmp, path)
+    return table
+
+
+def mark_pareto(table):
+    """Aynı cihazda hem daha hızlı hem daha doğru bir rakibi olmayan satırları işaretle"""
+    for name, row in table.items():
+        row["pareto"] = not any(
+            other is not row and other.get("device") == row.get("device")
+            and other["fps"] >= row["fps"] and other["map50_95"] >= row["map50_95"]
+            and (other["fps"] > row["fps"] or other["map50_95"] > row["map50_95"])
+            for other in table.values())
+
+
+def format_eval_row(name, row):
+    """Durum çubuğu için tek satır özet"""
+    text = (f"{name}: {row['fps']:.1f} FPS (p95 {row['p95_ms']:.0f} ms), mAP50 {row['map50']:.3f}, "
+            f"mAP50-95 {row['map50_95']:.3f}, recall {row['recall']:.2f} [{row['device']}]")
+    return text + (" - Pareto" if row.get("pareto") else "")
+
+
+class LabeledClip:
+    """Video ve kare numarası -> (xyxy piksel, sınıf) doğru etiketleri"""
+
+    def __init__(self, video_path, labels, names=None):
+        self.video_path = video_path
+        self.labels = labels  # {kare: (xyxy (N, 4) float32, cls (N,) int)}
+        self.names = names  # {sınıf: isim}; yoksa model sınıf numaraları kullanılır
+
+
+def _frame_number(file_name):
+    numbers = re.findall(r"\d+", os.path.splitext(file_name)[0])
+    return int(numbers[-1]) if numbers else None
+
+
+def _read_class_names(*folders):
+    for folder in folders:
+        path = os.path.join(folder, "classes.txt")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return {i: line.strip() for i, line in enumerate(f) if line.strip()}
+    return None
+
+
+def load_labeled_clips(folder):
+    """Klasördeki etiketli klipleri yükle (etiketi olmayan videolar atlanır)"""
+    clips = []
+    for video_path in scan_videos(folder):
+        stem = os.path.splitext(video_path)[0]
+        if os.path.isdir(stem + ".gt" + STORE_SUFFIX):
+            store = DetectionStore(stem + ".gt" + STORE_SUFFIX)
+            labels = {}
+            for frame in np.asarray(store.index["frame"]).tolist():
+                dets = store.frame(frame)
+                labels[frame] = (np.asarray(dets.xyxy, dtype=np.float32), np.asarray(dets.cls, dtype=np.int64))
+            clips.append(LabeledClip(video_path, labels, store.names or None))
+        elif os.path.isdir(stem + "_labels"):
+            label_dir = stem + "_labels"
+            cap = cv2.VideoCapture(video_path)
+            w, h = cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+            cap.release()
+            labels = {}
+            for path in glob.glob(os.path.join(label_dir, "*.txt")):
+                frame = _frame_number(os.path.basename(path))
+                if frame is None or os.path.basename(path) == "classes.txt":
+                    continue
+                # Boş dosya: karede nesne yok (negatif örnek)
+                rows = np.loadtxt(path, ndmin=2, dtype=np.float64) if os.path.getsize(path) else np.empty((0, 5))
+                cx, cy, bw, bh = rows[:, 1] * w, rows[:, 2] * h, rows[:, 3] * w, rows[:, 4] * h
+                xyxy = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1).astype(np.float32)
+                labels[frame] = (xyxy, rows[:, 0].astype(np.int64))
+            clips.append(LabeledClip(video_path, labels, _read_class_names(label_dir, folder)))
+    return [clip for clip in clips if clip.labels]
+
+
+def model_variants(models_dir, model_names):
+    """(etiket, model yolu) listesi: her model ve yanında bulunan dışa aktarılmış varyantlar"""
+    variants = []
+    for name in model_names:
+        variants.append((name, name))
+        stem = os.path.splitext(name)[0]
+        for folder in {models_dir, os.getcwd()} - {None}:
+            for suffix in EXPORT_SUFFIXES.values():
+                for path in sorted(glob.glob(os.path.join(folder, f"{stem}*{suffix}"))):
+                    label = os.path.basename(path.rstrip("/\\"))
+                    if all(label != v[0] for v in variants):
+                        variants.append((label, path))
+    return variants
+
+
+def iter_labeled_frames(clip):
+    """Etiketli kareleri sırayla çöz (yakın kareler grab ile atlanır, uzaklara seek edilir)"""
+    cap = cv2.VideoCapture(clip.video_path)
+    pos = 0
+    try:
+        for frame_idx in sorted(clip.labels):
+            if frame_idx - pos >= SEEK_MIN_STEP or frame_idx < pos:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                pos = frame_idx
+            while pos < frame_idx and cap.grab():
+                pos += 1
+            ret, frame = cap.read()
+            pos += 1
+            if not ret:
+                break
+            yield frame_idx, frame
+    finally:
+        cap.release()
+
+
+def average_precision(conf, tp, n_gt):
+    """Tüm noktalı interpolasyonla AP (PR eğrisi altındaki alan)"""
+    if n_gt == 0:
+        return 0.0
+    if len(conf) == 0:
+        return 0.0
+    order = np.argsort(-conf, kind="stable")
+    tp = tp[order].astype(np.float64)
+    tp_cum = np.cumsum(tp)
+    recall = tp_cum / n_gt
+    precision = tp_cum / np.arange(1, len(tp) + 1)
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    steps = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+
+def match_frame(pred_xyxy, pred_cls, pred_conf, gt_xyxy, gt_cls):
+    """Kare içinde güvene göre açgözlü eşleştirme; (P, len(MATCH_IOUS)) TP matrisi"""
+    tp = np.zeros((len(pred_xyxy), len(MATCH_IOUS)), dtype=bool)
+    if len(pred_xyxy) == 0 or len(gt_xyxy) == 0:
+        return tp
+    iou = box_iou(pred_xyxy, gt_xyxy)
+    iou[pred_cls[:, None] != gt_cls[None, :]] = 0.0
+    order = np.argsort(-pred_conf, kind="stable")
+    for t, threshold in enumerate(MATCH_IOUS):
+        used = np.zeros(len(gt_xyxy), dtype=bool)
+        for p in order:
+            candidates = np.where(~used & (iou[p] >= threshold))[0]
+            if len(candidates):
+                g = candidates[np.argmax(iou[p, candidates])]
+                used[g] = True
+                tp[p, t] = True
+    return tp
+
+
+class ModelEvaluator:
+    """Tek bir model varyantını klipler üzerinde ölçer"""
+
+    def __init__(self, engine, clips, progress=None):
+        self.engine = engine
+        self.clips = clips
+        self.progress = progress or (lambda text: None)
+
+    def class_map(self, clip):
+        """Model sınıf numarası -> doğru etiket sınıf numarası (isimle; eşleşmeyen -1)"""
+        names = dict(self.engine.model.names)
+        if not clip.names:
+            return None
+        by_name = {name: cls for cls, name in clip.names.items()}
+        lut = np.full(max(names) + 1, -1, dtype=np.int64)
+        for cls, name in names.items():
+            lut[cls] = by_name.get(name, -1)
+        return lut
+
+    def detect(self, frame, conf):
+        results, scale_ratios = self.engine.infer(frame, conf, EVAL_IOU)
+        return Detections.from_results(results, scale_ratios, track=False)
+
+    def measure_speed(self):
+        """Çalışma eşiğinde uçtan uca kare süreleri (ön/son işleme dahil) ve model süreleri"""
+        frames = []
+        for clip in self.clips:
+            for _, frame in iter_labeled_frames(clip):
+                frames.append(frame)
+                if len(frames) >= SPEED_FRAMES + WARMUP_FRAMES:
+                    break
+            if len(frames) >= SPEED_FRAMES + WARMUP_FRAMES:
+                break
+        for frame in frames[:WARMUP_FRAMES]:
+            self.detect(frame, EVAL_CONF)
+        latencies = []
+        for frame in frames[WARMUP_FRAMES:] or frames:
+            t_start = time.perf_counter()
+            self.detect(frame, EVAL_CONF)
+            latencies.append(time.perf_counter() - t_start)
+        return np.asarray(latencies) * 1000.0
+
+    def measure_accuracy(self):
+        """mAP@0.5, mAP@0.5:0.95 ve çalışma eşiğinde recall/precision"""
+        confs, classes, tps = [], [], []
+        gt_counts = {}
+        for clip in self.clips:
+            lut = self.class_map(clip)
+            for frame_idx, frame in iter_labeled_frames(clip):
+                gt_xyxy, gt_cls = clip.labels[frame_idx]
+                dets = self.detect(frame, AP_CONF)
+                cls = np.asarray(dets.cls, dtype=np.int64)
+                if lut is not None:
+                    cls = lut[cls]
+                keep = cls >= 0
+                tp = match_frame(dets.xyxy[keep], cls[keep], dets.conf[keep], gt_xyxy, gt_cls)
+                confs.append(dets.conf[keep])
+                classes.append(cls[keep])
+                tps.append(tp)
+                for c in gt_cls.tolist():
+                    gt_counts[c] = gt_counts.get(c, 0) + 1
+            self.progress(f"{os.path.basename(clip.video_path)}: {len(clip.labels)} etiketli kare")
+
+        conf = np.concatenate(confs) if confs else np.empty(0, np.float32)
+        cls = np.concatenate(classes) if classes else np.empty(0, np.int64)
+        tp = np.concatenate(tps) if tps else np.empty((0, len(MATCH_IOUS)), bool)
+        n_gt = sum(gt_counts.values())
+        ap = np.array([[average_precision(conf[cls == c], tp[cls == c, t], n)
+                        for t in range(len(MATCH_IOUS))] for c, n in gt_counts.items()])
+        operating = conf >= EVAL_CONF
+        tp50 = int(tp[operating, 0].sum())
+        return {
+            "map50": float(ap[:, 0].mean()) if len(ap) else 0.0,
+            "map50_95": float(ap.mean()) if len(ap) else 0.0,
+            "recall": tp50 / n_gt if n_gt else 0.0,
+            "precision": tp50 / int(operating.sum()) if operating.any() else 0.0,
+            "labels": n_gt,
+        }
+
+    def run(self):
+        latencies = self.measure_speed()
+        row = {
+            "fps": round(float(1000.0 / latencies.mean()), 1) if len(latencies) else 0.0,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 1) if len(latencies) else 0.0,
+            "p95_ms": round(float(np.percentile(latencies, 95)), 1) if len(latencies) else 0.0,
+            "p99_ms": round(float(np.percentile(latencies, 99)), 1) if len(latencies) else 0.0,
+        }
+        accuracy = self.measure_accuracy()
+        row.update({k: round(v, 4) if isinstance(v, float) else v for k, v in accuracy.items()})
+        row.update({
+            "backend": self.engine.backend,
+            "device": self.engine.device,
+            "evaluated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        return row
+
+
+def print_eval_table(table):
+    print(f"{'Model':<32} {'Cihaz':<6} {'FPS':>7} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'mAP50':>7} {'mAP50-95':>9} {'Recall':>7} {'Pareto':>7}")
+    for name, row in sorted(table.items(), key=lambda item: -item[1]["fps"]):
+        print(f"{name:<32} {row['device']:<6} {row['fps']:>7.1f} {row['p50_ms']:>7.1f} {row['p95_ms']:>7.1f} "
+              f"{row['p99_ms']:>7.1f} {row['map50']:>7.3f} {row['map50_95']:>9.3f} {row['recall']:>7.2f} "
+              f"{'*' if row.get('pareto') else '':>7}")
+
+
+def run_eval_cli(args, models_dir):
+    """Komut satırından değerlendirme: tabloyu yazdırır ve model_eval.yaml'a kaydeder"""
+    from detection_engine import DetectionEngine
+
+    clips = load_labeled_clips(args.evaluate)
+    if not clips:
+        print(f"Etiketli klip bulunamadı: {args.evaluate} (<isim>.gt.cvdet veya <isim>_labels/ gerekli)")
+        return 1
+    if args.eval_models:
+        model_names = [name.strip() for name in args.eval_models.split(",") if name.strip()]
+    else:
+        custom = sorted(f for f in os.listdir(models_dir) if f.endswith(".pt")) if os.path.isdir(models_dir) else []
+        model_names = DEFAULT_MODELS + custom
+    print(f"Değerlendirme: {len(clips)} klip, {sum(len(c.labels) for c in clips)} etiketli kare")
+
+    results = {}
+    try:
+        for label, path in model_variants(models_dir, model_names):
+            print(f"{label} ölçülüyor...")
+            try:
+                engine = DetectionEngine(models_dir, force_cpu=args.cpu)
+                engine.load_model(path)
+                results[label] = ModelEvaluator(engine, clips, progress=lambda text: print("  " + text)).run()
+                print("  " + format_eval_row(label, dict(results[label], pareto=False)))
+            except Exception as e:
+                print(f"  {label} başarısız: {e}")
+    except KeyboardInterrupt:
+        print("\nİptal edildi; ölçülen modeller kaydediliyor")
+    if not results:
+        return 1
+    table = save_eval_table(results)
+    print()
+    print_eval_table(table)
+    print(f"\nTablo kaydedildi: {default_eval_path()}")
+    return 0
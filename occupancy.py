@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Doluluk ısı haritası ve iz birikimi
+Isı haritası kare çözünürlüğünde değil, küçük bir ızgarada tutulur: her karede kutular
+fark dizisine tek dağıtma (scatter-add) ile eklenir ve ızgara üstel olarak söner.
+Takip ID'lerinin izleri, tracker'ın track_buffer değeriyle sınırlı halka tamponlarda
+tutulur. İkisi de oynatıcıda ve dışa aktarmada overlay olarak çizilir, görüntü (.png)
+veya dizi (.npy/.npz) olarak kaydedilebilir.
+"""
+
+import os
+
+import cv2
+import numpy as np
+import yaml
+
+from annotations import color_for_id
+
+HEATMAP_GRID_WIDTH = 128  # Isı haritası ızgarasının sütun sayısı (satırlar en-boy oranından)
+HEATMAP_DECAY = 0.98  # Kare başına sönme çarpanı (~35 karede yarıya iner)
+HEATMAP_ALPHA = 0.5  # Overlay saydamlığı
+HEATMAP_MIN_LEVEL = 8  # Bu seviyenin (0-255) altındaki hücreler çizilmez
+DEFAULT_TRACK_BUFFER = 30  # Tracker yapılandırması okunamazsa iz uzunluğu (kare)
+TRAIL_THICKNESS = 2
+
+
+def read_track_buffer(config_path):
+    """Tracker yapılandırmasından track_buffer değerini oku (yoksa varsayılan)"""
+    try:
+        with open(config_path, "r") as f:
+            return max(2, int(yaml.safe_load(f).get("track_buffer", DEFAULT_TRACK_BUFFER)))
+    except Exception:
+        return DEFAULT_TRACK_BUFFER
+
+
+class OccupancyHeatmap:
+    """Kutuların kapladığı alanların üstel sönümlü birikimi (küçük ızgarada)"""
+
+    def __init__(self, grid_width=HEATMAP_GRID_WIDTH, decay=HEATMAP_DECAY):
+        self.grid_width = grid_width
+        self.decay = decay
+        self.grid = None
+        self.frame_size = None  # (w, h); ızgara bu boyuta göre ayrıldı
+        self.last_frame = None
+        self.frames = 0
+
+    def reset(self):
+        self.grid = None
+        self.frame_size = None
+        self.last_frame = None
+        self.frames = 0
+
+    def update(self, boxes, frame_shape, frame_idx=None):
+        """
+        Karenin kutularını ekle. Önce ızgara geçen kare sayısı kadar söndürülür; aynı kare
+        (ör. eşik değişince yeniden çizim) ikinci kez eklenmez.
+        """
+        h, w = frame_shape[:2]
+        if self.grid is None or self.frame_size != (w, h):
+            rows = max(1, int(round(self.grid_width * h / w)))
+            self.grid = np.zeros((rows, self.grid_width), dtype=np.float32)
+            self.frame_size = (w, h)
+            self.last_frame = None
+        if frame_idx is not None:
+            if frame_idx == self.last_frame:
+                return
+            steps = frame_idx - self.last_frame if self.last_frame is not None and frame_idx > self.last_frame else 1
+            self.last_frame = frame_idx
+        else:
+            steps = 1
+        self.grid *= self.decay ** steps
+        self.frames += 1
+        if len(boxes) == 0:
+            return
+
+        # Kutu -> hücre aralığı; dört köşe fark dizisine eklenir, iki kümülatif toplam alanı doldurur
+        gh, gw = self.grid.shape
+        cols = np.clip((boxes[:, [0, 2]] * (gw / w)).astype(np.int64), 0, gw - 1)
+        rows = np.clip((boxes[:, [1, 3]] * (gh / h)).astype(np.int64), 0, gh - 1)
+        x0, x1 = cols[:, 0], cols[:, 1] + 1
+        y0, y1 = rows[:, 0], rows[:, 1] + 1
+        diff = np.zeros((gh + 1, gw + 1), dtype=np.float32)
+        np.add.at(diff, (np.concatenate([y0, y0, y1, y1]), np.concatenate([x0, x1, x0, x1])),
+                  np.repeat(np.array([1, -1, -1, 1], dtype=np.float32), len(boxes)))
+        self.grid += diff.cumsum(axis=0).cumsum(axis=1)[:gh, :gw]
+
+    def levels(self):
+        """Izgarayı en yüksek değere göre 0-255'e ölçekle (boşsa None)"""
+        if self.grid is None:
+            return None
+        peak = float(self.grid.max())
+        if peak <= 0:
+            return None
+        return (self.grid * (255.0 / peak)).astype(np.uint8)
+
+    def colorize(self, size=None):
+        """Renkli ısı haritası görüntüsü (BGR); size verilmezse kare boyutunda"""
+        levels = self.levels()
+        if levels is None:
+            return None
+        return cv2.resize(cv2.applyColorMap(levels, cv2.COLORMAP_JET), size or self.frame_size,
+                          interpolation=cv2.INTER_LINEAR)
+
+    def render(self, frame, alpha=HEATMAP_ALPHA):
+        """
+        Isı haritasını kareyle harmanla. Renk tablosu ızgara çözünürlüğünde uygulanır ve
+        sadece ısınmış hücrelerin sınır kutusu kare boyutuna bir kez büyütülür.
+        """
+        levels = self.levels()
+        if levels is None:
+            return frame
+        hot = levels >= HEATMAP_MIN_LEVEL
+        rows, cols = np.nonzero(hot)
+        if len(rows) == 0:
+            return frame
+        h, w = frame.shape[:2]
+        gh, gw = levels.shape
+        gy0, gy1, gx0, gx1 = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+        y0, y1, x0, x1 = gy0 * h // gh, gy1 * h // gh, gx0 * w // gw, gx1 * w // gw
+        if y1 <= y0 or x1 <= x0:
+            return frame
+        size = (x1 - x0, y1 - y0)
+        color = cv2.resize(cv2.applyColorMap(levels[gy0:gy1, gx0:gx1], cv2.COLORMAP_JET), size,
+                           interpolation=cv2.INTER_LINEAR)
+        mask = cv2.resize(hot[gy0:gy1, gx0:gx1].view(np.uint8), size, interpolation=cv2.INTER_NEAREST)
+        roi = frame[y0:y1, x0:x1]
+        cv2.copyTo(cv2.addWeighted(roi, 1.0 - alpha, color, alpha, 0), mask, roi)
+        return frame
+
+    def save(self, path):
+        """.npy ise ham ızgarayı, değilse renkli görüntüyü kaydet"""
+        if self.grid is None:
+            return False
+        if path.lower().endswith(".npy"):
+            np.save(path, self.grid)
+            return True
+        image = self.colorize()
+        if image is None:
+            return False
+        return cv2.imwrite(path, image)
+
+
+class TrajectoryBuffer:
+    """
+    Takip ID'si başına sabit uzunluklu halka tampon (kutu merkezleri, piksel).
+    track_buffer kadar kare görülmeyen ID'ler, tracker'ın kayıp izi bıraktığı gibi bırakılır.
+    """
+
+    def __init__(self, length=DEFAULT_TRACK_BUFFER, capacity=64):
+        self.length = int(length)
+        self.ids = np.full(capacity, -1, dtype=np.int64)  # -1: boş yuva
+        self.points = np.zeros((capacity, self.length, 2), dtype=np.float32)
+        self.heads = np.zeros(capacity, dtype=np.int64)  # Sonraki yazılacak konum
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+        self._slots = {}
+        self.last_frame = None
+
+    def reset(self):
+        self.ids[:] = -1
+        self.counts[:] = 0
+        self._slots.clear()
+        self.last_frame = None
+
+    def _grow(self):
+        capacity = len(self.ids) * 2
+        self.ids = np.concatenate([self.ids, np.full(capacity - len(self.ids), -1, dtype=np.int64)])
+        self.points = np.concatenate([self.points, np.zeros_like(self.points)])
+        self.heads = np.concatenate([self.heads, np.zeros_like(self.heads)])
+        self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+        self.last_seen = np.concatenate([self.last_seen, np.zeros_like(self.last_seen)])
+
+    def _slot(self, track_id):
+        slot = self._slots.get(track_id)
+        if slot is None:
+            free = np.flatnonzero(self.ids < 0)
+            if len(free) == 0:
+                slot = len(self.ids)
+                self._grow()
+            else:
+                slot = int(free[0])
+            self.ids[slot] = track_id
+            self.heads[slot] = 0
+            self.counts[slot] = 0
+            self._slots[track_id] = slot
+        return slot
+
+    def update(self, track_ids, boxes, frame_idx):
+        """Karenin takipli kutularının merkezlerini tamponlara ekle (geri sarmada izler sıfırlanır)"""
+        if frame_idx == self.last_frame:
+            return
+        if self.last_frame is not None and frame_idx < self.last_frame:
+            self.reset()
+        self.last_frame = frame_idx
+
+        stale = np.flatnonzero((self.ids >= 0) & (frame_idx - self.last_seen > self.length))
+        for slot in stale:
+            del self._slots[int(self.ids[slot])]
+        self.ids[stale] = -1
+
+        if track_ids is None:
+            return
+        tracked = track_ids >= 0
+        track_ids, boxes = track_ids[tracked], boxes[tracked]
+        if len(track_ids) == 0:
+            return
+        slots = np.fromiter((self._slot(int(t)) for t in track_ids), dtype=np.int64, count=len(track_ids))
+        centers = np.empty((len(boxes), 2), dtype=np.float32)
+        centers[:, 0] = (boxes[:, 0] + boxes[:, 2]) * 0.5
+        centers[:, 1] = (boxes[:, 1] + boxes[:, 3]) * 0.5
+        heads = self.heads[slots]
+        self.points[slots, heads] = centers
+        self.heads[slots] = (heads + 1) % self.length
+        self.counts[slots] = np.minimum(self.counts[slots] + 1, self.length)
+        self.last_seen[slots] = frame_idx
+
+    def tracks(self):
+        """(takip ID'si, (n, 2) noktalar eskiden yeniye) çiftleri"""
+        for slot in np.flatnonzero(self.ids >= 0):
+            count = self.counts[slot]
+            order = (self.heads[slot] - count + np.arange(count)) % self.length
+            yield int(self.ids[slot]), self.points[slot, order]
+
+    def render(self, frame, thickness=TRAIL_THICKNESS):
+        """Her izi ID renginde tek bir polyline çağrısıyla çiz"""
+        for track_id, points in self.tracks():
+            if len(points) >= 2:
+                cv2.polylines(frame, [np.round(points).astype(np.int32)], False, color_for_id(track_id),
+                              thickness, cv2.LINE_AA)
+        return frame
+
+    def save(self, path):
+        """İzleri .npz olarak kaydet (anahtar: id_<takip ID'si>)"""
+        np.savez(path, **{f"id_{track_id}": points for track_id, points in self.tracks()})
+        return True
+
+
+class MotionOverlay:
+    """
+    Isı haritası ve izleri birlikte güncelleyip çizen yardımcı (oynatıcı ve dışa aktarma).
+    Kapalı katman güncellenmez; açıldığında birikime kaldığı yerden devam eder.
+    """
+
+    def __init__(self, heatmap=True, trails=True, track_buffer=DEFAULT_TRACK_BUFFER):
+        self.heatmap = OccupancyHeatmap()
+        self.trails = TrajectoryBuffer(track_buffer)
+        self.show_heatmap = heatmap
+        self.show_trails = trails
+
+    @property
+    def enabled(self):
+        return self.show_heatmap or self.show_trails
+
+    def reset(self):
+        self.heatmap.reset()
+        self.trails.reset()
+
+    def update(self, detections, frame_shape, frame_idx, tracking=True):
+        if self.show_heatmap:
+            self.heatmap.update(detections.xyxy, frame_shape, frame_idx)
+        if self.show_trails:
+            self.trails.update(detections.track_id if tracking else None, detections.xyxy, frame_idx)
+
+    def render(self, frame):
+        """Önce ısı haritası, üstüne izler (kutulardan önce çağrılır)"""
+        if self.show_heatmap:
+            self.heatmap.render(frame)
+        if self.show_trails:
+            self.trails.render(frame)
+        return frame
+
+    def save(self, base):
+        """<base>_heatmap.png/.npy ve <base>_trails.npz dosyalarını yaz; yazılan yolları döndür"""
+        base = os.path.splitext(base)[0]
+        written = []
+        if self.show_heatmap:
+            for path in (f"{base}_heatmap.png", f"{base}_heatmap.npy"):
+                if self.heatmap.save(path):
+                    written.append(path)
+        if self.show_trails and self.trails.save(f"{base}_trails.npz"):
+            written.append(f"{base}_trails.npz")
+        return written
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Sınıf/takip ID'si zaman indeksi
+Tespit deposundan ters indeks üretir: sınıf -> görüldüğü kare aralıkları ve takip ID'si ->
+ilk/son kare. İndeks deponun içine (occurrences.npz) kaydedilir; "sonraki kamyon" veya
+"ID 42'nin ilk karesi" gibi sorgular model çalıştırmadan, ikili arama ile anında cevaplanır.
+Depo büyüdüyse (satır/kare sayısı değiştiyse) indeks yeniden üretilir.
+"""
+
+import os
+
+import numpy as np
+
+OCCURRENCE_FILE = "occurrences.npz"
+OCCURRENCE_GAP = 0  # Aradaki boşluk bu kadar kareye kadarsa iki görünüm tek aralık sayılır
+ALL_CLASSES = -1  # Herhangi bir tespit içeren kareler
+
+
+def _runs(presence, groups, max_gap):
+    """
+    (G, F) bool görünüm haritasından (grup, başlangıç, bitiş) aralıkları; satır ve kare
+    sırasına göre sıralı. Aradaki boşluk max_gap kareyi aşmayan aralıklar birleştirilir.
+    """
+    edges = np.diff(presence.astype(np.int8), axis=1, prepend=0, append=0)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1] - 1
+    if len(starts) == 0 or max_gap <= 0:
+        return groups[rows], starts, ends
+    new = np.ones(len(starts), dtype=bool)
+    new[1:] = (rows[1:] != rows[:-1]) | (starts[1:] - ends[:-1] - 1 > max_gap)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    return groups[rows[first]], starts[first], ends[last]
+
+
+class OccurrenceIndex:
+    """Sınıf başına kare aralıkları ve takip ID'si başına ilk/son kare"""
+
+    def __init__(self, interval_cls, starts, ends, track_ids, track_first, track_last, track_cls,
+                 rows=0, frames=0):
+        self.interval_cls = interval_cls  # (M,) sınıf (ALL_CLASSES dahil), sınıf ve başlangıca göre sıralı
+        self.starts = starts  # (M,) aralığın ilk karesi
+        self.ends = ends  # (M,) aralığın son karesi (dahil)
+        self.track_ids = track_ids  # (T,) sıralı takip ID'leri
+        self.track_first = track_first
+        self.track_last = track_last
+        self.track_cls = track_cls  # ID'nin ilk görüldüğü karedeki sınıfı
+        self.rows = rows  # İndekslenen deponun satır ve kare sayısı (tazelik kontrolü)
+        self.frames = frames
+        self.classes = np.unique(interval_cls)
+        self._offsets = np.searchsorted(interval_cls, self.classes)
+        self._ends = np.append(self._offsets[1:], len(interval_cls))
+
+    @classmethod
+    def build(cls, store, max_gap=OCCURRENCE_GAP):
+        """
+        Depo sütunlarından sıralama yapmadan indeks üret: görülen sınıflar için kare başına
+        görünüm haritası tek dağıtma (scatter) ile doldurulur, aralıklar fark alınarak çıkarılır.
+        """
+        frames = np.asarray(store["frame"], dtype=np.int64)
+        classes = np.asarray(store["cls"], dtype=np.int64)
+        index = store.index
+        frame_count = int(frames.max()) + 1 if len(frames) else 0
+
+        present = np.flatnonzero(np.bincount(classes)) if len(classes) else np.empty(0, np.int64)
+        row_of = np.zeros(int(present.max()) + 1 if len(present) else 0, dtype=np.int64)
+        row_of[present] = np.arange(len(present))
+        presence = np.zeros((len(present) + 1, frame_count), dtype=bool)
+        presence[row_of[classes], frames] = True
+        presence[-1, np.asarray(index["frame"][index["count"] > 0], dtype=np.int64)] = True
+        groups = np.append(present, ALL_CLASSES)
+        interval_cls, starts, ends = _runs(presence, groups, max_gap)
+        del presence
+        order = np.argsort(interval_cls, kind="stable")  # ALL_CLASSES başa; sınıf içi sıra korunur
+
+        # Takip ID'si başına ilk/son kare; ilk karedeki sınıf anahtarın alt bitlerinden okunur
+        track = np.asarray(store["track_id"], dtype=np.int64)
+        tracked = track >= 0
+        ids, frames, classes = track[tracked], frames[tracked], classes[tracked]
+        size = int(ids.max()) + 1 if len(ids) else 0
+        first_key = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_key, ids, (frames << 16) | classes)
+        last = np.full(size, -1, dtype=np.int64)
+        np.maximum.at(last, ids, frames)
+        track_ids = np.flatnonzero(last >= 0)
+        first_key = first_key[track_ids]
+        return cls(interval_cls[order], starts[order], ends[order], track_ids, first_key >> 16,
+                   last[track_ids], first_key & 0xFFFF, rows=store.rows, frames=len(index))
+
+    def save(self, store_path):
+        path = os.path.join(store_path, OCCURRENCE_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, interval_cls=self.interval_cls, starts=self.starts, ends=self.ends,
+                     track_ids=self.track_ids, track_first=self.track_first, track_last=self.track_last,
+                     track_cls=self.track_cls, size=np.array([self.rows, self.frames]))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, store_path):
+        """Kayıtlı indeksi yükle, yoksa None"""
+        path = os.path.join(store_path, OCCURRENCE_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            rows, frames = (int(v) for v in data["size"])
+            return cls(data["interval_cls"], data["starts"], data["ends"], data["track_ids"],
+                       data["track_first"], data["track_last"], data["track_cls"], rows=rows, frames=frames)
+
+    @classmethod
+    def for_store(cls, store, max_gap=OCCURRENCE_GAP):
+        """Depo için güncel indeks: kayıtlı ve tazeyse yüklenir, değilse üretilip kaydedilir"""
+        try:
+            index = cls.load(store.path)
+        except Exception as e:
+            print(f"Zaman indeksi okunamadı, yeniden üretiliyor: {e}")
+            index = None
+        if index is not None and index.rows == store.rows and index.frames == len(store.index):
+            return index
+        index = cls.build(store, max_gap)
+        try:
+            index.save(store.path)
+        except OSError as e:
+            print(f"Zaman indeksi kaydedilemedi: {e}")  # Salt okunur depo: bellekte kullanılır
+        return index
+
+    def intervals(self, cls_id=ALL_CLASSES):
+        """Sınıfın (başlangıç, bitiş) dizileri; sınıf hiç görülmediyse boş"""
+        pos = np.searchsorted(self.classes, cls_id)
+        if pos >= len(self.classes) or self.classes[pos] != cls_id:
+            return self.starts[:0], self.ends[:0]
+        lo, hi = self._offsets[pos], self._ends[pos]
+        return self.starts[lo:hi], self.ends[lo:hi]
+
+    def next_start(self, frame_idx, cls_id=ALL_CLASSES):
+        """frame_idx'ten sonra başlayan ilk görünüm: (kare, sıra, toplam) veya None"""
+        starts, _ = self.intervals(cls_id)
+        pos = int(np.searchsorted(starts, frame_idx, side="right"))
+        if pos >= len(starts):
+            return None
+        return int(starts[pos]), pos + 1, len(starts)
+
+    def prev_start(self, frame_idx, cls_id=ALL_CLASSES):
+        """frame_idx'ten önce başlayan son görünüm: (kare, sıra, toplam) veya None"""
+        starts, _ = self.intervals(cls_id)
+        pos = int(np.searchsorted(starts, frame_idx, side="left")) - 1
+        if pos < 0:
+            return None
+        return int(starts[pos]), pos + 1, len(starts)
+
+    def track_span(self, track_id):
+        """Takip ID'sinin (ilk kare, son kare, sınıf) değeri, ID yoksa None"""
+        pos = np.searchsorted(self.track_ids, track_id)
+        if pos >= len(self.track_ids) or self.track_ids[pos] != track_id:
+            return None
+        return int(self.track_first[pos]), int(self.track_last[pos]), int(self.track_cls[pos])
+
+    def presence(self, cls_id, bins, frame_count):
+        """Zaman çizelgesi şeridi için kutu başına görünüm var mı (bins,) bool"""
+        starts, ends = self.intervals(cls_id)
+        marks = np.zeros(bins + 1, dtype=np.int32)
+        if len(starts) and frame_count > 0:
+            scale = bins / frame_count
+            np.add.at(marks, np.minimum((starts * scale).astype(np.int64), bins - 1), 1)
+            np.add.at(marks, np.minimum((ends * scale).astype(np.int64), bins - 1) + 1, -1)
+        return np.cumsum(marks[:-1]) > 0
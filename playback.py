@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Değişken hızlı oynatma yardımcıları
+Hız çarpanından, ekranda gösterilecek her kare için kaç kaynak karenin ilerleneceğini
+(arada kalanlar sadece grab() ile geçilir, renk dönüşümü/kopya yapılmaz) ve kareler
+arası süreyi hesaplar. Yüksek hızlarda çıkarım her gösterilen karede değil, ölçülen
+çıkarım süresinin bütçeye sığdığı aralıkla çalıştırılır. Geri adımlar, son çözülen
+karelerin bellek sınırlı tamponundan video yeniden açılmadan karşılanır.
+"""
+
+import math
+import threading
+from collections import deque
+
+PLAYBACK_SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+DISPLAY_MAX_FPS = 30.0  # Hızlı oynatmada ekrana basılan kare hızı üst sınırı
+HISTORY_MAX_MB = 512  # Geri adım tamponunun bellek sınırı
+STRIDE_EMA = 0.2  # Çıkarım süresi ortalamasının yumuşatma katsayısı
+
+
+def format_speed(speed):
+    """1.0 -> '1×', 0.25 -> '0.25×'"""
+    return f"{speed:g}×"
+
+
+def playback_step(fps, speed, max_rate=0):
+    """
+    Hız için (adım, kare süresi): her gösterilen kare için ilerlenecek kaynak kare sayısı
+    ve iki gösterim arası süre (sn). 1× ve altında her kare gösterilir (max_rate ile
+    sınırlı); üstünde gösterim hızı DISPLAY_MAX_FPS'te tutulup aradaki kareler atlanır.
+    """
+    fps = fps if fps and fps > 0 else 30.0
+    source_rate = fps * speed
+    if speed <= 1.0:
+        rate = min(source_rate, max_rate) if max_rate > 0 else source_rate
+        return 1, 1.0 / rate
+    step = max(1, int(round(source_rate / DISPLAY_MAX_FPS)))
+    return step, step / source_rate
+
+
+class InferenceStride:
+    """
+    Gösterilen karelerin kaçta birinde çıkarım yapılacağı. Çıkarım süresinin hareketli
+    ortalaması kare bütçesini aşıyorsa aralık büyür; aradaki kareler son tespitlerle çizilir.
+    """
+
+    def __init__(self, ema=STRIDE_EMA):
+        self.ema = ema
+        self.cost = None  # Ortalama çıkarım süresi (sn)
+        self.stride = 1
+        self._since = 0
+
+    def reset(self):
+        self.cost = None
+        self.stride = 1
+        self._since = 0
+
+    def due(self):
+        """Bu gösterilen karede çıkarım yapılmalı mı?"""
+        return self._since + 1 >= self.stride
+
+    def observe(self, seconds, budget):
+        """Yapılan çıkarımın süresini bildir, aralığı bütçeye göre güncelle"""
+        self.cost = seconds if self.cost is None else self.cost + self.ema * (seconds - self.cost)
+        self.stride = max(1, math.ceil(self.cost / budget)) if budget > 0 else 1
+        self._since = 0
+
+    def skip(self):
+        self._since += 1
+
+
+class FrameHistory:
+    """
+    Son çözülen karelerin (kare no, kare, tespitler, zaman) tamponu. Toplam boyut
+    HISTORY_MAX_MB'yi aşınca en eskiler atılır. Oynatma thread'i ekler, UI thread'i okur.
+    """
+
+    def __init__(self, max_mb=HISTORY_MAX_MB):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._items = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def push(self, frame_idx, frame, detections=None, timestamp=None):
+        """Kareyi ekle (kopyalanmaz; kare sonradan değiştirilmemeli). Geri sarmada tampon sıfırlanır"""
+        with self._lock:
+            if self._items and frame_idx <= self._items[-1][0]:
+                self._items.clear()
+                self._bytes = 0
+            self._items.append((frame_idx, frame, detections, timestamp))
+            self._bytes += frame.nbytes
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                self._bytes -= self._items.popleft()[1].nbytes
+
+    def before(self, frame_idx):
+        """frame_idx'ten önceki en yakın tamponlanmış kare veya None"""
+        with self._lock:
+            for item in reversed(self._items):
+                if item[0] < frame_idx:
+                    return item
+        return None
+
+    def after(self, frame_idx):
+        """frame_idx'ten sonraki en yakın tamponlanmış kare veya None"""
+        with self._lock:
+            for item in self._items:
+                if item[0] > frame_idx:
+                    return item
+        return None
+
+    def __len__(self):
+        return len(self._items)
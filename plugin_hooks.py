@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Eklenti (son işleme ve overlay) kancaları
+Kare başına özel mantık (çizgi sayma, uyarılar, özel filtreler) için eklenti API'si.
+Eklentiler çıkarım thread'inde, kompakt Detections kaydı üzerinde çalışır: process()
+tespitleri süzer/değiştirir, paint() çizim komutları üretir; UI thread'i sadece bu
+komutları uygular. Her kanca ayrı ölçülür; kare başına süre bütçesini aşacak kancalar
+o karede atlanır ve bir sonraki karelere ertelenir.
+
+Eklenti dosyaları plugins/ klasöründen yüklenir ("_" ile başlayanlar hariç). Dosya ya
+register(manager) fonksiyonu ile manager.add(...) çağırır ya da PLUGINS listesi tanımlar.
+"""
+
+import glob
+import importlib.util
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from tracing import TRACER
+
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+PLUGIN_BUDGET_MS = 8.0  # Kare başına tüm kancaların toplam süre bütçesi
+PLUGIN_MAX_DEFER = 10  # Bütçe yüzünden üst üste bu kadar atlanan kanca sonraki karede yine de çalışır
+PLUGIN_MAX_ERRORS = 5  # Üst üste bu kadar hata veren kanca devre dışı bırakılır
+STATS_WINDOW = 120  # Süre istatistikleri için son kanca çağrısı sayısı
+
+
+class Plugin:
+    """
+    Eklenti temel sınıfı. Alt sınıflar process ve/veya paint'i tanımlar.
+    process(frame, detections, ctx): yeni Detections döndürür (ör. detections.select(maske))
+    veya None ile kaydı olduğu gibi bırakır. paint(frame, detections, ctx): ctx.line/rect/
+    polyline/circle/text ile çizim komutu ekler. Kare salt okunurdur, değiştirilmemelidir.
+    """
+
+    name = None  # Boşsa sınıf adı kullanılır
+    every = 1  # Her N karede bir çalış (pahalı kancalar için)
+
+    def process(self, frame, detections, ctx):
+        return None
+
+    def paint(self, frame, detections, ctx):
+        pass
+
+    def close(self):
+        pass
+
+
+class FrameContext:
+    """Kancalara verilen kare bilgisi ve çizim komutu toplayıcı"""
+
+    __slots__ = ("frame_idx", "timestamp", "ops")
+
+    def __init__(self, frame_idx=None, timestamp=None):
+        self.frame_idx = frame_idx
+        self.timestamp = timestamp  # Video zamanı (sn)
+        self.ops = []
+
+    def line(self, p1, p2, color=(0, 255, 255), thickness=2):
+        self.ops.append(("line", (tuple(map(int, p1)), tuple(map(int, p2)), color, thickness)))
+
+    def rect(self, p1, p2, color=(0, 255, 255), thickness=2):
+        self.ops.append(("rect", (tuple(map(int, p1)), tuple(map(int, p2)), color, thickness)))
+
+    def polyline(self, points, color=(0, 255, 255), closed=False, thickness=2):
+        self.ops.append(("polyline", (np.asarray(points, dtype=np.int32), closed, color, thickness)))
+
+    def circle(self, center, radius, color=(0, 255, 255), thickness=-1):
+        self.ops.append(("circle", (tuple(map(int, center)), int(radius), color, thickness)))
+
+    def text(self, text, org, color=(0, 255, 255), scale=0.7, thickness=2):
+        self.ops.append(("text", (str(text), tuple(map(int, org)), color, scale, thickness)))
+
+
+class HookStats:
+    """Tek bir kancanın (eklenti + process/paint) süre, atlama ve hata sayaçları"""
+
+    def __init__(self, plugin, kind):
+        self.plugin = plugin
+        self.kind = kind  # "process" veya "paint"
+        self.fn = getattr(plugin, kind)
+        self.label = f"{plugin.name}.{kind}"
+        self.enabled = True
+        self.calls = 0
+        self.skipped = 0  # Bütçe yüzünden atlanan kareler
+        self.deferred = 0  # Üst üste atlanma sayısı
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.durations = deque(maxlen=STATS_WINDOW)
+        self.avg = 0.0  # Son çağrıların ortalama süresi (sn)
+
+    def record(self, seconds):
+        self.calls += 1
+        self.deferred = 0
+        self.durations.append(seconds)
+        self.avg = sum(self.durations) / len(self.durations)
+
+    def p95(self):
+        if not self.durations:
+            return 0.0
+        return float(np.percentile(np.fromiter(self.durations, dtype=np.float64), 95))
+
+
+class PluginManager:
+    """
+    Eklentileri yükler ve kare başına kancaları bütçe içinde çalıştırır. run() çıkarım
+    thread'inden (veya dışa aktarma thread'inden) çağrılır; aynı anda tek kare işlenir.
+    """
+
+    def __init__(self, budget_ms=PLUGIN_BUDGET_MS):
+        self.budget = budget_ms / 1000.0
+        self.directory = None
+        self.plugins = []
+        self.hooks = []  # Önce tüm process kancaları, sonra paint kancaları (eklenme sırasıyla)
+        self.last_cost = 0.0  # Son karede kancalarda geçen toplam süre (sn)
+        self._lock = threading.Lock()
+
+    def add(self, plugin):
+        """Eklenti örneğini kaydet; sınıf verilirse örneklenir"""
+        if isinstance(plugin, type):
+            plugin = plugin()
+        if not plugin.name:
+            plugin.name = type(plugin).__name__
+        hooks = [HookStats(plugin, kind) for kind in ("process", "paint")
+                 if getattr(type(plugin), kind) is not getattr(Plugin, kind)]
+        if not hooks:
+            print(f"Eklenti {plugin.name} process veya paint tanımlamıyor, atlandı")
+            return None
+        with self._lock:
+            self.plugins.append(plugin)
+            self.hooks = sorted(self.hooks + hooks, key=lambda h: h.kind != "process")
+        return plugin
+
+    def load_dir(self, directory=PLUGIN_DIR):
+        """Klasördeki eklenti dosyalarını yükle; yüklenen eklenti sayısını döndür"""
+        self.directory = directory
+        if not os.path.isdir(directory):
+            return 0
+        before = len(self.plugins)
+        for path in sorted(glob.glob(os.path.join(directory, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name.startswith("_"):
+                continue
+            try:
+                spec = importlib.util.spec_from_file_location(f"cenkervision_plugin_{name}", path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                if hasattr(module, "register"):
+                    module.register(self)
+                for plugin in getattr(module, "PLUGINS", ()):
+                    self.add(plugin)
+            except Exception as e:
+                print(f"Eklenti yüklenemedi ({os.path.basename(path)}): {e}")
+        loaded = len(self.plugins) - before
+        if loaded:
+            print(f"{loaded} eklenti yüklendi: {', '.join(p.name for p in self.plugins[before:])}")
+        return loaded
+
+    def clone(self):
+        """Aynı klasörden, aynı açık/kapalı durumlarıyla bağımsız bir yönetici (ör. dışa aktarma için)"""
+        other = PluginManager(self.budget * 1000.0)
+        if self.directory is not None:
+            other.load_dir(self.directory)
+        enabled = {h.label: h.enabled for h in self.hooks}
+        for hook in other.hooks:
+            hook.enabled = enabled.get(hook.label, hook.enabled)
+        return other
+
+    @property
+    def active(self):
+        return any(h.enabled for h in self.hooks)
+
+    def set_enabled(self, plugin_name, enabled):
+        for hook in self.hooks:
+            if hook.plugin.name == plugin_name:
+                hook.enabled = enabled
+                if enabled:
+                    hook.consecutive_errors = 0
+
+    def is_enabled(self, plugin_name):
+        return any(h.enabled for h in self.hooks if h.plugin.name == plugin_name)
+
+    def run(self, frame, detections, frame_idx=None, timestamp=None):
+        """
+        Kancaları sırayla çalıştır ve (son işlenmiş) Detections döndür; çizim komutları
+        kaydın overlay alanına eklenir. Bütçede kalan süre kancanın ortalamasına yetmiyorsa
+        kanca bu karede atlanır (PLUGIN_MAX_DEFER kez üst üste atlanan yine de çalışır).
+        """
+        if detections is None or not self.hooks:
+            return detections
+        with self._lock:
+            ctx = FrameContext(frame_idx, timestamp)
+            start = time.perf_counter()
+            for hook in self.hooks:
+                if not hook.enabled:
+                    continue
+                every = hook.plugin.every
+                if every > 1 and frame_idx is not None and frame_idx % every:
+                    continue
+                if (time.perf_counter() - start + hook.avg > self.budget
+                        and hook.deferred < PLUGIN_MAX_DEFER):
+                    hook.skipped += 1
+                    hook.deferred += 1
+                    continue
+
+                hook_start = time.perf_counter()
+                try:
+                    with TRACER.span(hook.label, "plugins", frame=frame_idx):
+                        result = hook.fn(frame, detections, ctx)
+                except Exception as e:
+                    hook.errors += 1
+                    hook.consecutive_errors += 1
+                    print(f"Eklenti hatası ({hook.label}): {e}")
+                    if hook.consecutive_errors >= PLUGIN_MAX_ERRORS:
+                        hook.enabled = False
+                        print(f"{hook.label} üst üste {PLUGIN_MAX_ERRORS} hata verdi, devre dışı bırakıldı")
+                    continue
+                finally:
+                    hook.record(time.perf_counter() - hook_start)
+                hook.consecutive_errors = 0
+                if hook.kind == "process" and result is not None:
+                    detections = result
+            self.last_cost = time.perf_counter() - start
+
+        if ctx.ops:
+            detections.overlay = (detections.overlay or []) + ctx.ops
+        return detections
+
+    def stats_lines(self):
+        """Kanca başına 'ad: ort / p95 ms, çağrı, atlanan, hata' satırları"""
+        lines = []
+        for hook in self.hooks:
+            state = "" if hook.enabled else " [kapalı]"
+            lines.append(f"{hook.label}: {hook.avg*1000:.2f} ms (p95 {hook.p95()*1000:.2f}) - "
+                         f"{hook.calls} çağrı, {hook.skipped} atlandı, {hook.errors} hata{state}")
+        return lines
+
+    def close(self):
+        for plugin in self.plugins:
+            try:
+                plugin.close()
+            except Exception as e:
+                print(f"Eklenti kapatma hatası ({plugin.name}): {e}")
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""
+Örnek eklenti: yatay bir çizgiyi geçen takip ID'lerini sayar ve küçük kutuları süzer.
+"_" ile başlayan dosyalar yüklenmez; kullanmak için dosyayı "cizgi_sayaci.py" olarak
+kopyalayın. Takip (ByteTrack) açık olmalıdır.
+"""
+
+from plugin_hooks import Plugin
+
+LINE_Y = 0.6  # Çizginin kare yüksekliğine göre konumu (0-1)
+MIN_AREA = 400  # Bu alandan (piksel²) küçük kutular atılır
+
+
+class MinAreaFilter(Plugin):
+    name = "Küçük Kutu Filtresi"
+
+    def process(self, frame, detections, ctx):
+        boxes = detections.xyxy
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        return detections.select(area >= MIN_AREA)
+
+
+class LineCounter(Plugin):
+    name = "Çizgi Sayacı"
+
+    def __init__(self):
+        self.last_y = {}  # Takip ID'si -> önceki karedeki merkez y
+        self.down = 0
+        self.up = 0
+
+    def paint(self, frame, detections, ctx):
+        h, w = frame.shape[:2]
+        line_y = LINE_Y * h
+        ids = detections.track_id
+        centers_y = (detections.xyxy[:, 1] + detections.xyxy[:, 3]) * 0.5
+        for track_id, y in zip(ids[ids >= 0].tolist(), centers_y[ids >= 0].tolist()):
+            prev = self.last_y.get(track_id)
+            if prev is not None:
+                if prev < line_y <= y:
+                    self.down += 1
+                elif prev >= line_y > y:
+                    self.up += 1
+            self.last_y[track_id] = y
+        ctx.line((0, line_y), (w, line_y), (0, 200, 255), 2)
+        ctx.text(f"Asagi: {self.down}  Yukari: {self.up}", (10, int(line_y) - 10), (0, 200, 255))
+
+
+PLUGINS = [MinAreaFilter, LineCounter]
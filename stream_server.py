@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Yerel MJPEG/HTTP yayın sunucusu
+Açıklamalı görüntüyü ağdaki diğer makinelere yayınlar: /stream.mjpg (MJPEG akışı),
+/snapshot.jpg (son kare) ve /detections.json (son karenin tespitleri). Her kare küçük
+bir thread havuzunda bir kez JPEG'e çevrilir ve bağlı tüm istemcilerle paylaşılır.
+İstemciler her zaman en yeni kareyi alır; yavaş bir istemci sadece kendi karelerini
+kaçırır, oynatma döngüsünü veya diğer istemcileri bekletmez.
+"""
+
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import cv2
+
+STREAM_PORT = 8080
+STREAM_HOST = "0.0.0.0"  # Yerel ağdan erişim için tüm arayüzler
+STREAM_QUALITY = 80  # JPEG kalitesi
+STREAM_MAX_WIDTH = 1280  # Daha geniş kareler kodlamadan önce küçültülür (0: küçültme yok)
+STREAM_WORKERS = 2  # JPEG kodlayıcı thread sayısı (cv2.imencode GIL'i bırakır)
+BOUNDARY = b"cenkervision-frame"
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>CenkerVision</title>
+<style>body{background:#111;color:#ddd;font-family:sans-serif;margin:0;padding:12px}
+img{max-width:100%;display:block;margin-bottom:8px}pre{font-size:12px}</style></head>
+<body><img src="/stream.mjpg" alt="CenkerVision yayını"><pre id="d"></pre>
+<script>
+setInterval(function(){fetch("/detections.json").then(function(r){return r.json()}).then(function(j){
+document.getElementById("d").textContent="Kare "+j.frame+" - "+j.detections.length+" tespit\\n"+
+j.detections.map(function(o){return (o.id>=0?"#"+o.id+" ":"")+o.name+" "+o.conf.toFixed(2)}).join("\\n")})},500);
+</script></body></html>
+""".encode("utf-8")
+
+
+def parse_address(text, default_host=STREAM_HOST, default_port=STREAM_PORT):
+    """'8080', ':8080', '127.0.0.1:8080' veya boş metinden (host, port) döndür"""
+    text = (text or "").strip()
+    if not text:
+        return default_host, default_port
+    host, _, port = text.rpartition(":")
+    return host or default_host, int(port)
+
+
+def detections_payload(detections, frame_idx=None, timestamp=None):
+    """Tespit kaydını JSON'a uygun sözlüğe çevir"""
+    payload = {"frame": frame_idx, "timestamp": timestamp, "detections": []}
+    if detections is None:
+        return payload
+    names = detections.names
+    boxes = detections.xyxy.astype(float).round(1).tolist()
+    classes = detections.cls.tolist()
+    conf = detections.conf.astype(float).round(3).tolist()
+    ids = detections.track_id.tolist()
+    payload["detections"] = [
+        {"box": box, "cls": int(c), "name": str(names.get(int(c), c)), "conf": s, "id": int(i)}
+        for box, c, s, i in zip(boxes, classes, conf, ids)
+    ]
+    return payload
+
+
+class FrameHub:
+    """
+    Yayınlanan son kare, onun JPEG'i ve tespitleri. publish() hiç beklemez: kodlayıcılar
+    meşgulse kare atlanır. İstemciler wait_newer() ile gördüklerinden yeni ilk JPEG'i alır.
+    """
+
+    def __init__(self, quality=STREAM_QUALITY, max_width=STREAM_MAX_WIDTH, workers=STREAM_WORKERS):
+        self.quality = quality
+        self.max_width = max_width
+        self.workers = workers
+        self.frames_published = 0
+        self.frames_encoded = 0
+        self.frames_dropped = 0  # Kodlayıcılar meşgul olduğu için kodlanmayan kareler
+        self.clients = 0
+        self.stopped = False
+
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="StreamEncoder")
+        self._in_flight = 0
+        self._frame = None  # Son yayınlanan (çizilmiş) kare; sonradan değiştirilmemeli
+        self._frame_seq = 0
+        self._meta = (None, None, None)  # (Detections, kare no, zaman)
+        self._jpeg = None
+        self._jpeg_seq = 0
+
+    def encode(self, frame):
+        """Kareyi (gerekirse küçülterek) JPEG baytlarına çevir"""
+        h, w = frame.shape[:2]
+        if self.max_width and w > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, int(h * self.max_width / w)), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise RuntimeError("JPEG kodlama başarısız")
+        return buf.tobytes()
+
+    def publish(self, frame, detections=None, frame_idx=None, timestamp=None):
+        """Yeni kareyi yayınla; akış istemcisi yoksa kodlama yapılmaz (anlık görüntü isteğe göre kodlanır)"""
+        with self._cond:
+            if self.stopped:
+                return
+            self._frame_seq += 1
+            seq = self._frame_seq
+            self._frame = frame
+            self._meta = (detections, frame_idx, timestamp)
+            self.frames_published += 1
+            if self.clients == 0:
+                return
+            if self._in_flight >= self.workers:
+                self.frames_dropped += 1
+                return
+            self._in_flight += 1
+        self._pool.submit(self._encode_job, seq, frame)
+
+    def _encode_job(self, seq, frame):
+        try:
+            jpeg = self.encode(frame)
+        except Exception as e:
+            print(f"Yayın kodlama hatası: {e}")
+            jpeg = None
+        with self._cond:
+            self._in_flight -= 1
+            # Havuzda sonradan biten eski kare, yenisinin üzerine yazılmaz
+            if jpeg is not None and seq > self._jpeg_seq:
+                self._jpeg, self._jpeg_seq = jpeg, seq
+                self.frames_encoded += 1
+                self._cond.notify_all()
+
+    def wait_newer(self, seen_seq, timeout=1.0):
+        """seen_seq'ten yeni JPEG'i bekle: (seq, jpeg) veya zaman aşımında None"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._jpeg_seq > seen_seq or self.stopped, timeout):
+                return None
+            if self.stopped:
+                return None
+            return self._jpeg_seq, self._jpeg
+
+    def snapshot(self):
+        """Son karenin JPEG'i: akış zaten kodladıysa paylaşılır, yoksa burada kodlanır"""
+        with self._cond:
+            if self._jpeg is not None and self._jpeg_seq == self._frame_seq:
+                return self._jpeg
+            frame, seq = self._frame, self._frame_seq
+        if frame is None:
+            return None
+        jpeg = self.encode(frame)
+        with self._cond:
+            if seq > self._jpeg_seq:
+                self._jpeg, self._jpeg_seq = jpeg, seq
+        return jpeg
+
+    def detections(self):
+        with self._cond:
+            detections, frame_idx, timestamp = self._meta
+        return detections_payload(detections, frame_idx, timestamp)
+
+    def add_client(self):
+        with self._cond:
+            self.clients += 1
+
+    def remove_client(self):
+        with self._cond:
+            self.clients -= 1
+
+    def stop(self):
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+        self._pool.shutdown(wait=False)
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    server_version = "CenkerVision"
+
+    def log_message(self, format, *args):
+        pass  # Her istek için konsola yazma
+
+    def do_GET(self):
+        hub = self.server.hub
+        path = urlsplit(self.path).path
+        if path in ("/", "/index.html"):
+            self._send(200, "text/html; charset=utf-8", INDEX_HTML)
+        elif path == "/stream.mjpg":
+            self._stream(hub)
+        elif path == "/snapshot.jpg":
+            jpeg = hub.snapshot()
+            if jpeg is None:
+                self._send(503, "text/plain; charset=utf-8", "Henüz kare yok".encode("utf-8"))
+            else:
+                self._send(200, "image/jpeg", jpeg)
+        elif path == "/detections.json":
+            self._send(200, "application/json", json.dumps(hub.detections()).encode("utf-8"))
+        else:
+            self._send(404, "text/plain; charset=utf-8", b"Not found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, hub):
+        """MJPEG akışı: her parça en yeni paylaşılan JPEG; arada kalan kareler bu istemci için atlanır"""
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=" + BOUNDARY.decode())
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        hub.add_client()
+        seq = 0
+        try:
+            while not hub.stopped:
+                item = hub.wait_newer(seq)
+                if item is None:
+                    continue
+                seq, jpeg = item
+                self.wfile.write(b"--" + BOUNDARY + b"\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                                 + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, TimeoutError):
+            pass  # İstemci ayrıldı
+        finally:
+            hub.remove_client()
+
+
+class StreamServer:
+    """
+    Arka plan thread'inde çalışan HTTP sunucusu. publish() oynatıcının (veya dışa
+    aktarmanın) her çizilmiş karesi için çağrılır; kareyi ayrıca kopyalamaz.
+    """
+
+    def __init__(self, host=STREAM_HOST, port=STREAM_PORT, quality=STREAM_QUALITY,
+                 max_width=STREAM_MAX_WIDTH, workers=STREAM_WORKERS):
+        self.hub = FrameHub(quality=quality, max_width=max_width, workers=workers)
+        self._server = ThreadingHTTPServer((host, port), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.hub = self.hub
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StreamServer", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    @property
+    def url(self):
+        """Tarayıcıda açılacak adres (tüm arayüzlerde dinleniyorsa makine adı)"""
+        host, port = self.address
+        if host in ("0.0.0.0", "::", ""):
+            host = socket.gethostname()
+        return f"http://{host}:{port}/"
+
+    @property
+    def clients(self):
+        return self.hub.clients
+
+    def publish(self, frame, detections=None, frame_idx=None, timestamp=None):
+        self.hub.publish(frame, detections, frame_idx, timestamp)
+
+    def stop(self):
+        """Sunucuyu kapat; açık akışlar bir sonraki beklemede sonlanır"""
+        self.hub.stop()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(2.0)
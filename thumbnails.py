@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Önizleme küçük resim indeksi
+Her N karede bir düşük çözünürlüklü küçük resmi arka planda çözüp video başına
+bellek eşlemeli bir önbellek dosyasına yazar. İlerleme çubuğu sürüklenirken
+önizlemeler bu dosyadan anında okunur; oluşturma yarıda kalsa bile hazır olan
+kısım kullanılabilir ve bir sonraki açılışta kaldığı yerden devam eder.
+"""
+
+import os
+import json
+import threading
+
+import cv2
+import numpy as np
+
+from cache_paths import default_cache_dir, video_cache_key
+from video_decode import SEEK_MIN_STEP
+
+THUMB_WIDTH = 160
+THUMB_INTERVAL_SEC = 2.0  # Küçük resimler arası süre (sn)
+
+
+class ThumbnailIndex:
+    """
+    Video başına küçük resim önbelleği.
+    thumbs: (count, h, w, 3) uint8 memmap; built: hazır küçük resim sayısı
+    (baştan itibaren sıralı doldurulur).
+    """
+
+    def __init__(self, video_path, cache_dir=None, interval_sec=THUMB_INTERVAL_SEC, width=THUMB_WIDTH):
+        self.video_path = video_path
+        self.cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Video açılamadı: {video_path}")
+        self.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        src_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 16
+        src_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 9
+        cap.release()
+
+        self.step = max(1, int(round(interval_sec * fps)))
+        self.count = max(1, (self.frame_count + self.step - 1) // self.step)
+        self.width = width
+        self.height = max(2, int(round(width * src_h / src_w / 2)) * 2)
+
+        key = video_cache_key(video_path)
+        self.data_path = os.path.join(self.cache_dir, key + ".thumbs")
+        self.meta_path = os.path.join(self.cache_dir, key + ".json")
+        self.built = 0
+        self._open()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _open(self):
+        """Önbelleği aç; parametreler değiştiyse sıfırdan oluştur"""
+        meta = None
+        if os.path.exists(self.meta_path) and os.path.exists(self.data_path):
+            try:
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception:
+                meta = None
+        # Kaynağın bildirdiği kare sayısıyla doğrulanır; okuma sonunda kısaltılmış sayı meta'dan alınır
+        if (meta and meta.get("source_count") == self.frame_count and meta.get("step") == self.step
+                and meta.get("shape", [])[1:] == [self.height, self.width, 3]):
+            self.count = max(1, min(self.count, int(meta["shape"][0])))
+        else:
+            meta = None
+        shape = (self.count, self.height, self.width, 3)
+        if meta:
+            self.thumbs = np.memmap(self.data_path, dtype=np.uint8, mode="r+", shape=shape)
+            self.built = int(meta.get("built", 0))
+        else:
+            self.thumbs = np.memmap(self.data_path, dtype=np.uint8, mode="w+", shape=shape)
+            self.built = 0
+            self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "source": os.path.abspath(self.video_path),
+            "shape": [self.count, self.height, self.width, 3],
+            "source_count": self.frame_count,  # CAP_PROP_FRAME_COUNT (fazla bildirebilir)
+            "step": self.step,
+            "built": self.built,
+        }
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    @property
+    def complete(self):
+        return self.built >= self.count
+
+    def start(self):
+        """Eksik küçük resimleri arka planda oluşturmaya başla"""
+        if self.complete or (self._thread is not None and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._build, name="ThumbnailIndex", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _build(self):
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            use_seek = self.step >= SEEK_MIN_STEP
+            pos = self.built * self.step
+            cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+            last_flush = self.built
+            while self.built < self.count and not self._stop.is_set():
+                target = self.built * self.step
+                if use_seek and pos != target:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    pos = target
+                # Ara kareleri çözmeden atla (grab() dönüştürme/kopya yapmaz)
+                while pos < target:
+                    if not cap.grab():
+                        break
+                    pos += 1
+                ret, frame = cap.read()
+                pos += 1
+                if not ret:
+                    break
+                self.thumbs[self.built] = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+                self.built += 1
+                if self.built - last_flush >= 50:
+                    self.thumbs.flush()
+                    self._write_meta()
+                    last_flush = self.built
+            # Kısa videolarda son kare sayısı beklenenden az olabilir
+            if self.built < self.count and not self._stop.is_set():
+                self.count = self.built
+        except Exception as e:
+            print(f"Küçük resim indeksi hatası: {e}")
+        finally:
+            cap.release()
+            self.thumbs.flush()
+            self._write_meta()
+
+    def index_for_frame(self, frame_idx):
+        return min(self.count - 1, max(0, int(frame_idx) // self.step))
+
+    def get(self, frame_idx):
+        """Kareye en yakın hazır küçük resmi döndür (BGR), henüz yoksa None"""
+        idx = self.index_for_frame(frame_idx)
+        if idx >= self.built:
+            if self.built == 0:
+                return None
+            idx = self.built - 1
+        return self.thumbs[idx]
+
+    def density(self, store, bins=None):
+        """
+        Tespit deposundan küçük resim aralığı başına tespit sayıları (yoğunluk şeridi için).
+        store: DetectionStore; sonuç (count,) int64 dizi.
+        """
+        bins = bins or self.count
+        counts = np.zeros(bins, dtype=np.int64)
+        index = store.index
+        if index is None or len(index) == 0:
+            return counts
+        buckets = np.minimum(np.asarray(index["frame"], dtype=np.int64) // self.step, bins - 1)
+        np.add.at(counts, buckets, np.asarray(index["count"], dtype=np.int64))
+        return counts
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Zaman çizelgesi izleme ve örnekleyici profil
+Tracer: boru hattı aşamalarının (decode, preprocess, model, track, draw, display...)
+thread başına süre aralıklarını (span) sınırlı bir halka tamponda toplar ve Chrome/
+Perfetto iz biçiminde (JSON, chrome://tracing veya ui.perfetto.dev) kaydeder.
+Kapalıyken span() paylaşılan boş bir bağlam döndürür; ek yük bir öznitelik kontrolüdür.
+
+SamplingProfiler: arka plan thread'inde tüm thread'lerin yığınlarını belirli aralıklarla
+örnekler ve son N saniyeyi katlanmış yığın (folded stacks) biçiminde yazar; çıktı
+speedscope, flamegraph.pl veya inferno ile flamegraph olarak açılabilir.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter, deque
+
+TRACE_MAX_EVENTS = 500000  # Halka tampon boyutu (~1080p/30 FPS'de birkaç dakika)
+PROFILE_INTERVAL = 0.005  # Örnekleme aralığı (sn)
+PROFILE_WINDOW_SEC = 30.0  # Flamegraph için tutulan son süre (sn)
+
+
+def timestamped_path(prefix, suffix):
+    """Çalışma dizininde zaman damgalı dosya adı (ör. cenkervision_trace_20240101_120000.json)"""
+    return os.path.abspath(f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}{suffix}")
+
+
+class _NullSpan:
+    """İzleme kapalıyken kullanılan boş bağlam"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._add("X", self.name, self.cat, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Thread güvenli span kaydedici (deque.append atomik olduğu için kilit yok)"""
+
+    def __init__(self, max_events=TRACE_MAX_EVENTS):
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self._threads = {}  # thread kimliği -> isim
+        self._origin = time.perf_counter_ns()
+
+    def start(self):
+        self.events.clear()
+        self._threads.clear()
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def span(self, name, cat="pipeline", **args):
+        """with TRACER.span("model"): ... - kapalıyken boş bağlam döner"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def instant(self, name, cat="pipeline", **args):
+        """Anlık olay (ör. atılan kare)"""
+        if self.enabled:
+            self._add("i", name, cat, time.perf_counter_ns(), 0, args)
+
+    def _add(self, ph, name, cat, start_ns, dur_ns, args):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self.events.append((ph, name, cat, start_ns, dur_ns, tid, args))
+
+    def save(self, path):
+        """Chrome/Perfetto iz dosyası yaz; kaydedilen olay sayısını döndür"""
+        pid = os.getpid()
+        trace = [{"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in list(self._threads.items())]
+        events = list(self.events)
+        for ph, name, cat, start_ns, dur_ns, tid, args in events:
+            event = {"ph": ph, "name": name, "cat": cat, "pid": pid, "tid": tid,
+                     "ts": (start_ns - self._origin) / 1000.0}
+            if ph == "X":
+                event["dur"] = dur_ns / 1000.0
+            else:
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            trace.append(event)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+TRACER = Tracer()
+
+
+class SamplingProfiler:
+    """
+    Duvar saati örnekleyici profil: her interval'de sys._current_frames() ile tüm
+    thread'lerin yığınını alır, son window_sec saniyeyi bellekte tutar.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, window_sec=PROFILE_WINDOW_SEC):
+        self.interval = interval
+        self.window_sec = window_sec
+        self.samples = deque()  # (zaman, yığın metni)
+        self._labels = {}  # kod nesnesi -> etiket (her karede yeniden biçimlendirmemek için)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                name = names.get(tid)
+                if name is None:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                    name = names.get(tid, str(tid))
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                self.samples.append((now, ";".join(reversed(stack))))
+            cutoff = now - self.window_sec
+            while self.samples and self.samples[0][0] < cutoff:
+                self.samples.popleft()
+
+    def dump_folded(self, path, last_sec=None):
+        """Son last_sec saniyenin (varsayılan: tüm pencere) katlanmış yığınlarını yaz; örnek sayısını döndür"""
+        samples = list(self.samples)
+        if last_sec is not None and samples:
+            cutoff = samples[-1][0] - last_sec
+            samples = [s for s in samples if s[0] >= cutoff]
+        counts = Counter(stack for _, stack in samples)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+        return len(samples)
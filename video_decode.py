@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Alternatif video kod çözücüler
+cv2.VideoCapture kareleri tek thread'de ve tam kaynak çözünürlüğünde çözer. Buradaki
+okuyucular PyAV veya yerel ffmpeg sürecine boru üzerinden çok thread'li çözme yapar,
+isteğe bağlı olarak kareleri çözücü tarafında boru hattının ihtiyaç duyduğu yüksekliğe
+küçültür ve her karenin gerçek sunum zamanını (PTS) verir. Çözme, sınırlı bir kuyruğa
+yazan arka plan thread'inde yapılır; böylece çıkarımla üst üste biner.
+
+Okuyucular cv2.VideoCapture ile uyumludur (read/grab/retrieve/get/set/release); açılamazlarsa
+open_video() OpenCV'ye düşer.
+"""
+
+import os
+import json
+import queue
+import importlib.util
+import shutil
+import threading
+import subprocess
+from fractions import Fraction
+
+import cv2
+import numpy as np
+
+DECODE_BACKENDS = ("opencv", "pyav", "ffmpeg")
+DECODE_QUEUE_SIZE = 8  # Önceden çözülmüş kare sayısı (4K'da ~200 MB)
+DECODE_THREADS = 0  # Çözücü thread sayısı (0: otomatik)
+SEEK_MIN_STEP = 120  # Bu adımdan büyük aralıklarda grab() yerine seek kullanılır
+
+
+def pyav_available():
+    # Sadece kurulu mu diye bakılır; PyAV'ı (ve FFmpeg kütüphanelerini) yüklemez
+    return importlib.util.find_spec("av") is not None
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def available_backends():
+    """Bu makinede kullanılabilen arka uçlar (opencv her zaman var)"""
+    backends = ["opencv"]
+    if pyav_available():
+        backends.append("pyav")
+    if ffmpeg_available():
+        backends.append("ffmpeg")
+    return backends
+
+
+def scaled_size(width, height, max_height):
+    """max_height'i aşan boyutu en-boy oranını koruyarak küçült (çift sayılara yuvarlanır)"""
+    if not max_height or height <= max_height:
+        return width, height
+    return max(2, int(width * max_height / height) // 2 * 2), max(2, int(max_height) // 2 * 2)
+
+
+class _EndOfStream:
+    pass
+
+
+_EOS = _EndOfStream()
+
+
+class ThreadedDecoder:
+    """
+    Arka plan thread'inde çözen okuyucuların ortak kısmı. Alt sınıflar _probe() ile
+    kaynak bilgisini doldurur ve _frames(start_frame) ile (pts_sn, kare) üretir.
+    Konum değiştirme (set POS_FRAMES) bir sonraki okumada çözücüyü o kareden yeniden başlatır.
+    """
+
+    backend = None
+
+    def __init__(self, path, max_height=None, threads=DECODE_THREADS, queue_size=DECODE_QUEUE_SIZE):
+        self.path = path
+        self.threads = threads
+        self.queue_size = queue_size
+        self.fps = 0.0
+        self.frame_count = 0
+        self.source_size = (0, 0)  # Kaynak (genişlik, yükseklik)
+        self.start_time = 0.0  # İlk karenin PTS değeri (sn)
+        self.error = None
+        self._probe()
+        self.size = scaled_size(*self.source_size, max_height)  # Çıktı (genişlik, yükseklik)
+
+        self.pos = 0  # Sıradaki karenin numarası (CAP_PROP_POS_FRAMES)
+        self.last_pts = None  # Son okunan karenin PTS değeri (sn, kaynak başlangıcına göre)
+        self._opened = self.source_size[0] > 0
+        self._queue = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._restart_at = 0  # None değilse bir sonraki okumada çözücü bu kareden başlar
+        self._grabbed = None
+
+    @property
+    def scaled(self):
+        return self.size != self.source_size
+
+    def isOpened(self):
+        return self._opened
+
+    def _probe(self):
+        raise NotImplementedError
+
+    def _frames(self, start_frame):
+        raise NotImplementedError
+
+    def _start(self, start_frame):
+        self._stop_thread()
+        self._stop.clear()
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(target=self._run, args=(start_frame, self._queue),
+                                        name=f"Decoder-{self.backend}", daemon=True)
+        self._thread.start()
+
+    def _run(self, start_frame, out):
+        frames = self._frames(start_frame)
+        try:
+            for item in frames:
+                while not self._stop.is_set():
+                    try:
+                        out.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+        except Exception as e:
+            self.error = str(e)
+            print(f"{self.backend} çözme hatası: {e}")
+        finally:
+            frames.close()  # ffmpeg süreci / PyAV kapsayıcısı hemen kapatılır
+        while not self._stop.is_set():
+            try:
+                out.put(_EOS, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _stop_thread(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(2.0)
+        self._thread = None
+        self._queue = None
+
+    def grab(self):
+        if not self._opened:
+            return False
+        if self._restart_at is not None:
+            self._start(self._restart_at)
+            self._restart_at = None
+        item = self._queue.get()
+        if item is _EOS:
+            self._queue.put(_EOS)  # Sonraki okumalar da dosya sonunu görsün
+            self._grabbed = None
+            return False
+        self.last_pts, self._grabbed = item
+        self.pos += 1
+        return True
+
+    def retrieve(self, image=None):
+        frame, self._grabbed = self._grabbed, None
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.size[0])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.size[1])
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return (self.last_pts or 0.0) * 1000.0
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.pos = max(0, int(value))
+            self._restart_at = self.pos
+            self._stop_thread()
+            return True
+        return False
+
+    def release(self):
+        self._stop_thread()
+        self._opened = False
+
+    def _frame_time(self, frame_idx):
+        """Kare numarasının kaynak zamanı (sn, ilk kareye göre)"""
+        return frame_idx / self.fps if self.fps > 0 else 0.0
+
+
+class PyAVCapture(ThreadedDecoder):
+    """PyAV (libavcodec) ile çok thread'li çözme; küçültme libswscale ile renk dönüşümüyle birlikte yapılır"""
+
+    backend = "pyav"
+
+    def _probe(self):
+        import av
+        with av.open(self.path) as container:
+            stream = container.streams.video[0]
+            rate = stream.average_rate or stream.guessed_rate
+            self.fps = float(rate) if rate else 0.0
+            self.source_size = (stream.codec_context.width, stream.codec_context.height)
+            if stream.start_time is not None:
+                self.start_time = float(stream.start_time * stream.time_base)
+            self.frame_count = stream.frames
+            if not self.frame_count and self.fps > 0:
+                duration = (float(stream.duration * stream.time_base) if stream.duration
+                            else (container.duration or 0) / av.time_base)
+                self.frame_count = int(round(duration * self.fps))
+
+    def _frames(self, start_frame):
+        import av
+        width, height = self.size
+        with av.open(self.path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"  # Kare + dilim thread'leri
+            stream.thread_count = self.threads
+            target = None
+            if start_frame > 0:
+                target = self._frame_time(start_frame) - 0.5 / max(self.fps, 1.0)
+                offset = int((self.start_time + target) / stream.time_base)
+                container.seek(max(0, offset), stream=stream, backward=True)
+            for frame in container.decode(stream):
+                if frame.pts is None:
+                    continue
+                pts = float(frame.pts * stream.time_base) - self.start_time
+                if target is not None and pts < target:
+                    continue  # Anahtar kareden hedefe kadar olanlar atlanır
+                target = None
+                yield pts, frame.to_ndarray(format="bgr24", width=width, height=height)
+
+
+class FFmpegCapture(ThreadedDecoder):
+    """
+    Yerel ffmpeg sürecinden ham BGR kareler okuyan okuyucu. Kare zamanları showinfo
+    filtresinin stderr çıktısından alınır (-copyts ile kaynak zaman damgaları korunur).
+    """
+
+    backend = "ffmpeg"
+
+    def _probe(self):
+        cmd = [shutil.which("ffprobe") or "ffprobe", "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate,nb_frames,start_time,duration"
+               ":format=duration", "-of", "json", self.path]
+        info = json.loads(subprocess.run(cmd, capture_output=True, check=True).stdout)
+        stream = info["streams"][0]
+        rate = stream.get("avg_frame_rate") or "0/1"
+        if rate in ("0/0", "0/1"):
+            rate = stream.get("r_frame_rate") or "0/1"
+        self.fps = float(Fraction(rate)) if rate != "0/0" else 0.0
+        self.source_size = (int(stream["width"]), int(stream["height"]))
+        self.start_time = float(stream.get("start_time") or 0.0)
+        self.frame_count = int(stream.get("nb_frames") or 0)
+        if not self.frame_count and self.fps > 0:
+            duration = float(stream.get("duration") or info.get("format", {}).get("duration") or 0.0)
+            self.frame_count = int(round(duration * self.fps))
+
+    def _frames(self, start_frame):
+        width, height = self.size
+        filters = ["showinfo"]
+        if self.scaled:
+            filters.append(f"scale={width}:{height}:flags=bilinear")
+        cmd = [shutil.which("ffmpeg") or "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "info",
+               "-threads", str(self.threads)]
+        if start_frame > 0:
+            cmd += ["-ss", f"{self._frame_time(start_frame):.6f}"]
+        cmd += ["-copyts", "-i", self.path, "-map", "0:v:0", "-vf", ",".join(filters),
+                "-vsync", "passthrough", "-f", "rawvideo", "-pix_fmt", "bgr24", "-"]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL)
+        pts_queue = queue.Queue()
+        reader = threading.Thread(target=self._read_pts, args=(proc.stderr, pts_queue), daemon=True)
+        reader.start()
+        frame_bytes = width * height * 3
+        index = start_frame
+        produced = 0  # Bu süreçten okunan kare sayısı (showinfo satır sırasıyla eşleşir)
+        pending = None
+        try:
+            while True:
+                buffer = bytearray(frame_bytes)
+                if proc.stdout.readinto(buffer) != frame_bytes:
+                    break
+                pts = None
+                try:
+                    # Zaman aşımından sonra geç gelen satırlar sıra numarasıyla atlanır
+                    while pending is None or pending[0] < produced:
+                        pending = pts_queue.get(timeout=1.0)
+                    if pending[0] == produced and pending[1] is not None:
+                        pts = pending[1] - self.start_time
+                except queue.Empty:
+                    pass
+                if pts is None:
+                    pts = self._frame_time(index)  # showinfo satırı gelmediyse sabit FPS varsay
+                index += 1
+                produced += 1
+                yield pts, np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+        finally:
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+
+    @staticmethod
+    def _read_pts(stream, pts_queue):
+        """showinfo satırlarından (sıra no, pts) üret; okunamayan değer None olarak sırayı korur"""
+        seq = 0
+        for line in iter(stream.readline, b""):
+            start = line.find(b"pts_time:")
+            if start < 0 or b"Parsed_showinfo" not in line:
+                continue
+            value = line[start + len(b"pts_time:"):].split(None, 1)[0]
+            try:
+                pts = float(value)
+            except ValueError:
+                pts = None
+            pts_queue.put((seq, pts))
+            seq += 1
+        stream.close()
+
+
+DECODERS = {"pyav": PyAVCapture, "ffmpeg": FFmpegCapture}
+
+
+def open_video(path, backend="opencv", max_height=None, threads=DECODE_THREADS):
+    """
+    Video için okuyucu aç. backend: "opencv", "pyav", "ffmpeg" veya "auto" (ilk kullanılabilen
+    alternatif). max_height verilirse kareler çözücüde küçültülür (OpenCV'de desteklenmez).
+    Alternatif arka uç açılamazsa cv2.VideoCapture döner.
+    """
+    if backend == "auto":
+        backend = next((b for b in available_backends() if b != "opencv"), "opencv")
+    decoder = DECODERS.get(backend)
+    if decoder is not None and os.path.isfile(path):
+        try:
+            cap = decoder(path, max_height=max_height, threads=threads)
+            if cap.isOpened():
+                return cap
+        except Exception as e:
+            print(f"{backend} kod çözücü açılamadı, OpenCV kullanılıyor: {e}")
+    return cv2.VideoCapture(path)
+
+
+def capture_backend(cap):
+    """Okuyucunun arka uç adı (durum satırı için)"""
+    return getattr(cap, "backend", None) or "opencv"
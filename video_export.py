@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Açıklamalı video dışa aktarma
+Tespit/takip ve çizimi bir video dosyası (veya kare aralığı) üzerinde kaynak FPS'e
+bağlı kalmadan olabildiğince hızlı çalıştırır. Kodlama (cv2.VideoWriter veya yerel
+ffmpeg'e boru) ayrı bir yazıcı thread'inde, sınırlı bir kuyruk üzerinden yapılır.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from annotations import render_detections, render_overlay, box_centers
+from detection_store import Detections
+from occupancy import MotionOverlay, read_track_buffer
+from plugin_hooks import PluginManager
+from video_decode import open_video
+from zone_analytics import ZoneAnalyzer
+
+EXPORT_QUEUE_SIZE = 32  # Yazıcı kuyruğundaki maksimum kare sayısı
+DEFAULT_FOURCC = "mp4v"
+
+
+class FrameAnnotator:
+    """
+    Başsız kare işleyici: tespit (motor veya tespit deposu) + çizim + bölge analitiği.
+    Oynatıcının durumuna dokunmaz; kendi bölge analizörünü kullanır.
+    """
+
+    def __init__(self, engine=None, store=None, conf=0.25, iou=0.45, track=False,
+                 display_mode="normal", zones=None, fps=30.0, detect=True, cascade=None,
+                 motion=None, motion_output=None, stream=None, plugins=None, miner=None):
+        self.engine = engine
+        self.cascade = cascade  # ModelCascade; verilirse motor yerine kaskad çalışır
+        self.store = store
+        self.conf = conf
+        self.iou = iou
+        self.track = track
+        self.display_mode = display_mode
+        self.detect = detect
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.zone_analyzer = ZoneAnalyzer(zones) if zones else None
+        self.motion = motion  # MotionOverlay (ısı haritası/izler) veya None
+        self.motion_output = motion_output  # Verilirse sonda birikim <motion_output>_heatmap/_trails olarak yazılır
+        self.stream = stream  # StreamServer; çizilen kareler yerel ağa yayınlanır
+        self.plugins = plugins  # PluginManager; kancalar çizimden önce bu thread'de çalışır
+        self.miner = miner  # CropMiner; belirsiz tespitlerin kareleri çizimden önce kuyruğa atılır
+
+    def detections(self, frame, frame_idx):
+        """Kare için Detections kaydı döndür (depo, kaskad veya motor)"""
+        if self.store is not None:
+            dets = self.store.frame(frame_idx)
+            if dets is not None:
+                return dets
+            return Detections.empty(self.store.names)
+        if self.detect and self.cascade is not None:
+            return self.cascade.infer(frame, self.conf, self.iou, track=self.track)
+        if self.detect and self.engine is not None and self.engine.model is not None:
+            results, scale_ratios = self.engine.infer(frame, self.conf, self.iou, track=self.track)
+            if self.track and self.engine.tracking_failed:
+                self.track = False
+            return Detections.from_results(results, scale_ratios, track=self.track)
+        return Detections.empty()
+
+    @property
+    def tracking(self):
+        """Takip ID'leri geçerli mi (depodan okunuyorsa depo takipli mi kaydedildi)"""
+        if self.store is not None:
+            return self.store.tracked
+        return self.track
+
+    def __call__(self, frame, frame_idx):
+        dets = self.detections(frame, frame_idx)
+        if self.plugins is not None:
+            dets = self.plugins.run(frame, dets, frame_idx, frame_idx / self.fps)
+        if self.miner is not None:
+            self.miner.submit(frame, dets, frame_idx, frame_idx / self.fps)
+        if self.motion is not None:
+            self.motion.update(dets, frame.shape, frame_idx, self.tracking)
+            self.motion.render(frame)
+        # Kod çözücünün tamponu üzerine yerinde çizilir; ayrı kopya gerekmez
+        render_detections(frame, dets.xyxy, dets.cls, dets.conf, dets.track_id, dets.names, self.display_mode,
+                          masks=dets.masks, keypoints=dets.keypoints)
+        if dets.overlay:
+            render_overlay(frame, dets.overlay)
+
+        if self.zone_analyzer is not None:
+            h, w = frame.shape[:2]
+            self.zone_analyzer.draw(frame)
+            self.zone_analyzer.update(box_centers(dets.xyxy, w, h), dets.track_id if self.tracking else None,
+                                      frame_idx / self.fps, frame_idx)
+            for i, line in enumerate(self.zone_analyzer.status_lines()):
+                cv2.putText(frame, line, (10, 30 + 24 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        if self.stream is not None:
+            self.stream.publish(frame, dets, frame_idx, frame_idx / self.fps)
+        return frame
+
+    def finish(self):
+        """Açık bölge ziyaretlerini kapat, ısı haritası/izleri ve bekleyen örnekleri kaydet (aralık sonu)"""
+        if self.zone_analyzer is not None:
+            self.zone_analyzer.close_all()
+        if self.plugins is not None:
+            for line in self.plugins.stats_lines():
+                print(f"Eklenti: {line}")
+            self.plugins.close()
+        if self.miner is not None:
+            self.miner.close()
+            print(f"Toplanan örnekler ({self.miner.directory}): {self.miner.summary()}")
+        if self.motion is not None and self.motion_output:
+            written = self.motion.save(self.motion_output)
+            if written:
+                print("Isı haritası/izler kaydedildi: " + ", ".join(written))
+
+
+class VideoEncoder:
+    """
+    Ayrı thread'de çalışan kodlayıcı. write() kareyi sınırlı kuyruğa koyar;
+    kuyruk doluysa üretici bekler (bellek sınırlı kalır).
+    """
+
+    def __init__(self, path, fps, size, fourcc=DEFAULT_FOURCC, use_ffmpeg=False, queue_size=EXPORT_QUEUE_SIZE):
+        self.path = path
+        self.fps = fps
+        self.size = size
+        self.error = None
+        self.frames_written = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        if use_ffmpeg:
+            self._proc = self._open_ffmpeg()
+            self._writer = None
+        else:
+            self._proc = None
+            self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+            if not self._writer.isOpened():
+                raise RuntimeError(f"Video yazıcı açılamadı: {path}")
+
+        self._thread = threading.Thread(target=self._run, name="VideoEncoder", daemon=True)
+        self._thread.start()
+
+    def _open_ffmpeg(self):
+        """Ham BGR karelerini yerel ffmpeg sürecine borula (libx264)"""
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg bulunamadı (PATH)")
+        w, h = self.size
+        cmd = [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{w}x{h}", "-r", f"{self.fps:.6f}", "-i", "-",
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", self.path,
+        ]
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame, timeout=None):
+        """Kareyi kodlama kuyruğuna ekle"""
+        if self.error is not None:
+            raise RuntimeError(f"Kodlayıcı hatası: {self.error}")
+        self._queue.put(frame, timeout=timeout)
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue  # Hata sonrası kuyruğu boşalt, üreticiyi bloklama
+            try:
+                if self._proc is not None:
+                    self._proc.stdin.write(np.ascontiguousarray(frame).tobytes())
+                else:
+                    self._writer.write(frame)
+                self.frames_written += 1
+            except Exception as e:
+                self.error = e
+                print(f"Kodlayıcı hatası: {e}")
+
+    def close(self):
+        """Kuyruğu boşalt ve dosyayı kapat"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        else:
+            self._writer.release()
+
+
+class AnnotatedVideoExporter(threading.Thread):
+    """
+    Dışa aktarma işi. Kaynak kendi VideoCapture'ı ile okunur (oynatıcıdan bağımsız),
+    kareler beklemeden işlenir ve kodlayıcıya aktarılır. İlerleme alanları
+    (done, total, fps, eta) başka thread'lerden okunabilir; cancel() ile iptal edilir.
+    """
+
+    def __init__(self, source, output, annotator, start_frame=0, end_frame=None,
+                 fourcc=DEFAULT_FOURCC, use_ffmpeg=False, prepare=None, decoder="opencv"):
+        super().__init__(name="AnnotatedVideoExporter", daemon=True)
+        self.source = source
+        self.output = output
+        self.annotator = annotator
+        self.start_frame = max(0, int(start_frame))
+        self.end_frame = end_frame
+        self.fourcc = fourcc
+        self.use_ffmpeg = use_ffmpeg
+        self.prepare = prepare  # İş başlamadan önce bu thread'de çağrılır (ör. model yükleme)
+        self.decoder = decoder  # Kaynak kod çözücü (video_decode; çıktı tam çözünürlükte)
+
+        self.done = 0
+        self.total = 0
+        self.started_at = None
+        self.finished = False
+        self.cancelled = False
+        self.error = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Dışa aktarmayı iptal et (yazılan kısım geçerli bir video olarak kapanır)"""
+        self._cancel.set()
+
+    @property
+    def fps(self):
+        if not self.started_at or self.done == 0:
+            return 0.0
+        return self.done / max(1e-6, time.time() - self.started_at)
+
+    @property
+    def eta(self):
+        """Tahmini kalan süre (sn), bilinmiyorsa None"""
+        fps = self.fps
+        if fps <= 0 or self.total <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / fps)
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total > 0 else 0.0
+
+    def run(self):
+        cap = None
+        encoder = None
+        try:
+            if self.prepare is not None:
+                self.prepare()
+
+            cap = open_video(self.source, self.decoder)
+            if not cap.isOpened():
+                raise RuntimeError(f"Video açılamadı: {self.source}")
+
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            end = frame_count if self.end_frame is None else min(int(self.end_frame), frame_count)
+            self.total = max(0, end - self.start_frame)
+            if self.start_frame > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+
+            size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            encoder = VideoEncoder(self.output, fps, size, fourcc=self.fourcc, use_ffmpeg=self.use_ffmpeg)
+
+            self.started_at = time.time()
+            frame_idx = self.start_frame
+            while frame_idx < end and not self._cancel.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                encoder.write(self.annotator(frame, frame_idx))
+                frame_idx += 1
+                self.done += 1
+        except Exception as e:
+            self.error = e
+            print(f"Dışa aktarma hatası: {e}")
+        finally:
+            # İptal/hata durumunda da eklentiler ve örnek toplayıcı kapanır, thread'leri sızmaz
+            try:
+                self.annotator.finish()
+            except Exception as e:
+                print(f"Dışa aktarma kapanış hatası: {e}")
+            if cap is not None:
+                cap.release()
+            if encoder is not None:
+                encoder.close()
+                if encoder.error is not None and self.error is None:
+                    self.error = encoder.error
+            self.cancelled = self._cancel.is_set()
+            self.finished = True
+
+
+def format_eta(seconds):
+    """Kalan süreyi S:DD:SS biçiminde döndür"""
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def run_export_cli(args, models_dir, zones=None):
+    """Komut satırından dışa aktarma: ilerlemeyi yazdırır, Ctrl+C ile iptal edilir"""
+    from detection_engine import DetectionEngine, default_tracker_config_path
+    from detection_store import DetectionStore
+
+    store = DetectionStore(args.detections) if args.detections else None
+    engine = None
+    if store is None:
+        engine = DetectionEngine(models_dir, force_cpu=args.cpu)
+
+    cap = cv2.VideoCapture(args.video)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    resolution = (cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.release()
+
+    def prepare():
+        # Model yüklendikten sonra bu makine için kayıtlı ayar profili varsa uygula
+        from autotune import find_profile
+        engine.load_model(args.model)
+        profile = find_profile(args.model, resolution)
+        if profile is not None:
+            engine.apply_profile(profile)
+        if args.cascade:
+            from cascade import ModelCascade
+            large = DetectionEngine(models_dir, device=engine.device, force_cpu=args.cpu)
+            large.load_model(args.cascade)
+            annotator.cascade = ModelCascade(engine, large)
+
+    motion = None
+    if args.heatmap or args.trails:
+        motion = MotionOverlay(args.heatmap, args.trails, read_track_buffer(default_tracker_config_path()))
+    plugins = PluginManager(args.plugin_budget)
+    if not plugins.load_dir(args.plugins):
+        plugins = None
+    miner = None
+    if args.mine is not None:
+        from crop_mining import CropMiner, default_mine_dir
+        miner = CropMiner(args.mine or default_mine_dir(args.video), band=args.mine_band, classes=args.mine_classes,
+                          rate=args.mine_rate, image_format=args.mine_format, source=args.video)
+    stream = None
+    if args.serve is not None:
+        from stream_server import StreamServer, parse_address
+        stream = StreamServer(*parse_address(args.serve))
+        print(f"Yayın sunucusu: {stream.url}")
+    annotator = FrameAnnotator(engine=engine, store=store, conf=args.conf, iou=args.iou, track=args.track,
+                               display_mode=args.mode, zones=zones, fps=fps, motion=motion, motion_output=args.export,
+                               stream=stream, plugins=plugins, miner=miner)
+    exporter = AnnotatedVideoExporter(
+        args.video, args.export, annotator, start_frame=args.start, end_frame=args.end,
+        use_ffmpeg=args.ffmpeg, prepare=prepare if engine else None, decoder=args.decoder)
+    exporter.start()
+
+    try:
+        while exporter.is_alive():
+            exporter.join(1.0)
+            if exporter.total:
+                print(f"\rDışa aktarılıyor: {exporter.done}/{exporter.total} ({exporter.progress*100:.1f}%) "
+                      f"- {exporter.fps:.1f} FPS - Kalan: {format_eta(exporter.eta)}   ", end="", flush=True)
+    except KeyboardInterrupt:
+        print("\nİptal ediliyor...")
+        exporter.cancel()
+        exporter.join()
+    print()
+    if stream is not None:
+        stream.stop()
+
+    if exporter.error is not None:
+        print(f"Dışa aktarma başarısız: {exporter.error}")
+        return 1
+    state = "iptal edildi" if exporter.cancelled else "tamamlandı"
+    print(f"Dışa aktarma {state}: {os.path.abspath(args.export)} ({exporter.done} kare)")
+    return 0
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CenkerVision - Bölge (zone) analitiği
+Çoklu poligon bölgeler için vektörel nokta-poligon testi, takip ID'si başına
+giriş/çıkış olayları ve video zamanına dayalı bekleme (dwell) süreleri.
+"""
+
+import os
+import csv
+import json
+from collections import deque
+
+import numpy as np
+import yaml
+
+# Varsayılan değerler
+ZONE_EXIT_GRACE = 0.5  # Çıkış olayı için bekleme süresi (sn) - kısa tespit kayıplarını yut
+ZONE_MAX_GAP = 2.0  # Bu süreden büyük zaman sıçramaları (seek) durumu sıfırlar (sn)
+ZONE_MAX_EVENTS = 1000000  # Bellekte tutulacak maksimum olay sayısı
+
+
+class Zone:
+    """Normalize (0-1) koordinatlarla tanımlı tek bir poligon bölge"""
+
+    __slots__ = ("name", "points", "color")
+
+    def __init__(self, name, points, color=(0, 0, 255)):
+        self.name = str(name)
+        self.points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if len(self.points) < 3:
+            raise ValueError(f"Bölge en az 3 köşe içermeli: {self.name}")
+        self.color = tuple(int(c) for c in color)
+
+    def to_dict(self):
+        return {"name": self.name, "points": self.points.tolist(), "color": list(self.color)}
+
+
+def load_zones(path):
+    """YAML/JSON bölge dosyasını oku ve Zone listesi döndür"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+        else:
+            data = yaml.safe_load(f)
+
+    entries = data.get("zones", []) if isinstance(data, dict) else (data or [])
+    return [Zone(e["name"], e["points"], e.get("color", (0, 0, 255))) for e in entries]
+
+
+def save_zones(path, zones):
+    """Zone listesini YAML dosyasına yaz"""
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"zones": [z.to_dict() for z in zones]}, f, allow_unicode=True, sort_keys=False)
+
+
+class PolygonSet:
+    """
+    Birden fazla poligonu tek bir dolgulu (padded) köşe dizisinde tutar.
+    Tüm noktalar x tüm bölgeler testi tek bir NumPy yayınlama (broadcast)
+    işlemiyle yapılır; Python döngüsü yoktur.
+    """
+
+    def __init__(self, polygons):
+        self.count = len(polygons)
+        if self.count == 0:
+            self._xi = self._yi = self._dx = self._dy = None
+            return
+
+        max_v = max(len(p) for p in polygons)
+        verts = np.empty((self.count, max_v, 2), dtype=np.float32)
+        for i, p in enumerate(polygons):
+            verts[i, :len(p)] = p
+            # Son köşeyi tekrarla: dejenere kenarlar (yi == yj) kesişim üretmez
+            verts[i, len(p):] = p[-1]
+
+        nxt = np.roll(verts, -1, axis=1)
+        self._xi = verts[..., 0]
+        self._yi = verts[..., 1]
+        self._yj = nxt[..., 1]
+        self._dx = nxt[..., 0] - verts[..., 0]
+        dy = nxt[..., 1] - verts[..., 1]
+        # Sıfıra bölmeyi önle; bu kenarlar zaten maske ile elenir
+        self._dy = np.where(dy == 0, 1.0, dy).astype(np.float32)
+
+        # Hızlı ön eleme için bölge sınır kutuları (Z, 4)
+        self.bounds = np.concatenate([verts.min(axis=1), verts.max(axis=1)], axis=1)
+
+    def contains(self, points):
+        """(N, 2) noktalar için (N, Z) bool içerme matrisi döndür (ışın atma / crossing number)"""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        n = len(points)
+        inside = np.zeros((n, self.count), dtype=bool)
+        if n == 0 or self.count == 0:
+            return inside
+
+        # Önce sınır kutularıyla ele, kenar testini sadece aday (nokta, bölge) çiftlerine uygula
+        x, y = points[:, 0, None], points[:, 1, None]
+        b = self.bounds
+        candidates = (x >= b[:, 0]) & (x <= b[:, 2]) & (y >= b[:, 1]) & (y <= b[:, 3])
+        rows, cols = np.nonzero(candidates)
+        if len(rows) == 0:
+            return inside
+
+        px = points[rows, 0, None]
+        py = points[rows, 1, None]
+        yi = self._yi[cols]
+        straddle = (yi > py) != (self._yj[cols] > py)
+        x_cross = self._xi[cols] + self._dx[cols] * (py - yi) / self._dy[cols]
+        crossings = straddle & (px < x_cross)
+        inside[rows, cols] = np.bitwise_xor.reduce(crossings, axis=1)
+        return inside
+
+
+class ZoneAnalyzer:
+    """
+    Çoklu bölge analiz motoru.
+    Her karede tüm kutu merkezleri tüm bölgelere karşı tek seferde test edilir;
+    takip ID'si başına giriş/çıkış olayları ve bekleme süreleri kare zaman
+    damgalarından (video zamanı) hesaplanır, duvar saatinden değil.
+    """
+
+    def __init__(self, zones=None, exit_grace=ZONE_EXIT_GRACE, max_gap=ZONE_MAX_GAP,
+                 max_events=ZONE_MAX_EVENTS):
+        self.exit_grace = exit_grace
+        self.max_gap = max_gap
+        self.events = deque(maxlen=max_events)
+        self.set_zones(zones or [])
+
+    def set_zones(self, zones):
+        """Bölgeleri değiştir ve tüm durumu sıfırla"""
+        self.zones = list(zones)
+        self.polygons = PolygonSet([z.points for z in self.zones])
+        self._pixel_cache = {}
+        self.reset()
+
+    def reset(self):
+        """Takip ve bölge durumlarını sıfırla (olay geçmişi korunur)"""
+        z = len(self.zones)
+        self._last_ts = None
+        # (track_id * Z + bölge) -> [giriş zamanı, son görülme, giriş karesi]
+        self._tracks = {}
+        self._zone_since = np.full(z, np.nan)  # Bölge dolu olmaya başladığı an
+        self._zone_last_seen = np.full(z, np.nan)
+        self.occupancy = np.zeros(z, dtype=np.int32)
+        self.stats = [{"visits": 0, "total_dwell": 0.0, "max_dwell": 0.0} for _ in range(z)]
+
+    def update(self, centers, track_ids, timestamp, frame_idx=None):
+        """
+        Bir karenin tespitleriyle durumu güncelle.
+        centers: (N, 2) normalize kutu merkezleri, track_ids: takip açıkken (N,) ID'ler
+        (boş karede boş dizi; -1 olanlar sayılmaz), takip kapalıyken None,
+        timestamp: kare zamanı (sn). Bölge başına anlık nesne sayısını döndürür.
+        """
+        nz = len(self.zones)
+        if nz == 0:
+            return self.occupancy
+
+        # Geri sarma veya büyük sıçrama: açık ziyaretleri kapat ve baştan başla
+        if self._last_ts is not None and (timestamp < self._last_ts or timestamp - self._last_ts > self.max_gap):
+            self.close_all(self._last_ts, frame_idx)
+            self._zone_since[:] = np.nan
+            self._zone_last_seen[:] = np.nan
+        self._last_ts = timestamp
+
+        inside = self.polygons.contains(centers)
+        self.occupancy = inside.sum(axis=0).astype(np.int32)
+
+        # Bölge düzeyinde doluluk (takip kapalıyken de çalışır)
+        occupied = self.occupancy > 0
+        self._zone_last_seen[occupied] = timestamp
+        started = occupied & np.isnan(self._zone_since)
+        self._zone_since[started] = timestamp
+        expired = ~occupied & ((timestamp - self._zone_last_seen) > self.exit_grace)
+        self._zone_since[expired] = np.nan
+
+        if track_ids is not None and len(track_ids) == len(inside):
+            ids = np.asarray(track_ids, dtype=np.int64)
+            # Boş karede de çağrılır; görünmeyen ziyaretler exit_grace sonunda kapanır
+            rows, cols = np.nonzero(inside & (ids >= 0)[:, None])
+            keys = ids[rows] * nz + cols
+            self._update_tracks(keys.tolist(), timestamp, frame_idx)
+        elif self._tracks:
+            # Takip kapatıldı: açık ziyaretleri sonlandır
+            self.close_all(timestamp, frame_idx)
+
+        return self.occupancy
+
+    def _update_tracks(self, keys, timestamp, frame_idx):
+        """Takip ID'si - bölge çiftleri için giriş/çıkış olaylarını üret"""
+        nz = len(self.zones)
+        tracks = self._tracks
+        for key in keys:
+            state = tracks.get(key)
+            if state is None:
+                tracks[key] = [timestamp, timestamp, frame_idx]
+                self._emit("enter", key % nz, key // nz, timestamp, frame_idx)
+            else:
+                state[1] = timestamp
+
+        # Sadece bu karede görünmeyen çiftleri incele
+        for key in tracks.keys() - set(keys):
+            state = tracks[key]
+            if timestamp - state[1] > self.exit_grace:
+                self._close(key, state, frame_idx)
+
+    def _close(self, key, state, frame_idx):
+        nz = len(self.zones)
+        zone_idx = key % nz
+        dwell = float(state[1] - state[0])
+        st = self.stats[zone_idx]
+        st["visits"] += 1
+        st["total_dwell"] += dwell
+        st["max_dwell"] = max(st["max_dwell"], dwell)
+        self._emit("exit", zone_idx, key // nz, state[1], frame_idx, dwell=dwell)
+        del self._tracks[key]
+
+    def close_all(self, timestamp=None, frame_idx=None):
+        """Açık tüm ziyaretleri çıkış olayıyla kapat (video sonu, seek vb.)"""
+        for key in list(self._tracks.keys()):
+            self._close(key, self._tracks[key], frame_idx)
+
+    def _emit(self, kind, zone_idx, track_id, timestamp, frame_idx, dwell=None):
+        event = {
+            "event": kind,
+            "zone": self.zones[zone_idx].name,
+            "track_id": int(track_id),
+            "t": round(float(timestamp), 3),
+            "frame": None if frame_idx is None else int(frame_idx),
+        }
+        if dwell is not None:
+            event["dwell"] = round(float(dwell), 3)
+        self.events.append(event)
+
+    def zone_dwell(self, zone_idx):
+        """Bölgenin kesintisiz dolu kaldığı süre (sn), boşsa None"""
+        since = self._zone_since[zone_idx]
+        if np.isnan(since) or self._last_ts is None:
+            return None
+        return self._last_ts - since
+
+    def track_dwell(self, zone_idx, track_id):
+        """Bir takip ID'sinin bölgedeki anlık bekleme süresi (sn), dışarıdaysa None"""
+        state = self._tracks.get(int(track_id) * len(self.zones) + zone_idx)
+        return None if state is None else state[1] - state[0]
+
+    def status_lines(self):
+        """Ekranda gösterilecek bölge başına özet satırları"""
+        lines = []
+        for i, zone in enumerate(self.zones):
+            dwell = self.zone_dwell(i)
+            if dwell is not None:
+                lines.append(f"{zone.name}: {dwell:.1f} sn ({self.occupancy[i]})")
+        return lines
+
+    def pixel_polygons(self, width, height):
+        """Bölgeleri piksel koordinatlarında (cv2.polylines için) döndür, boyut başına önbellekli"""
+        key = (width, height)
+        if key not in self._pixel_cache:
+            scale = np.array([width, height], dtype=np.float32)
+            self._pixel_cache[key] = [np.round(z.points * scale).astype(np.int32) for z in self.zones]
+        return self._pixel_cache[key]
+
+    def draw(self, frame):
+        """Bölge sınırlarını kare üzerine çiz (renk başına tek polylines çağrısı)"""
+        import cv2
+
+        h, w = frame.shape[:2]
+        polys = self.pixel_polygons(w, h)
+        by_color = {}
+        for zone, poly in zip(self.zones, polys):
+            by_color.setdefault(zone.color, []).append(poly)
+        for color, group in by_color.items():
+            cv2.polylines(frame, group, True, color, 2)
+        return frame
+
+    def drain_events(self):
+        """Birikmiş olayları döndür ve kuyruğu boşalt"""
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+    def summary(self):
+        """Bölge başına ziyaret sayısı ve bekleme istatistikleri"""
+        result = {}
+        for zone, st in zip(self.zones, self.stats):
+            visits = st["visits"]
+            result[zone.name] = {
+                "visits": visits,
+                "total_dwell": round(st["total_dwell"], 3),
+                "mean_dwell": round(st["total_dwell"] / visits, 3) if visits else 0.0,
+                "max_dwell": round(st["max_dwell"], 3),
+            }
+        return result
+
+    def export_events(self, path):
+        """Olayları .csv veya JSON Lines (.jsonl) olarak dışa aktar, yazılan olay sayısını döndür"""
+        events = list(self.events)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=["event", "zone", "track_id", "t", "frame", "dwell"])
+                writer.writeheader()
+                writer.writerows(events)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        return len(events)
+
+
+def default_zones_path():
+    """Uygulama dizinindeki varsayılan bölge dosyası yolu"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones.yaml")